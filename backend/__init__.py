@@ -4,8 +4,14 @@ from backend.routes.general import general_blueprint
 from backend.routes.prices import price_blueprint
 from backend.routes.watchlists import watchlist_blueprint
 from backend.routes.alerts import alerts_blueprint
-from backend.routes.telegrams import telegrams_blueprint
+from backend.routes.telegrams import telegrams_blueprint, handle_update
 from backend.scheduler.scheduler import start_scheduler
+from backend.scheduler.leader_election import run_when_leader
+from backend.services.finantial_data_service import FinancialDataService
+from backend.services.price_history_service import PriceHistoryService
+from backend.services.telegram_service import TelegramService
+from backend.services.notification_service import NotificationService
+from backend.services.adaptive_polling_service import AdaptivePollingService
 from dotenv import load_dotenv
 import logging
 import os
@@ -13,7 +19,13 @@ import time
 
 print("Loading backend package ...")
 
-def create_app():
+def create_app(run_scheduler=None):
+    """
+    Build the Flask app.
+
+    run_scheduler - Start the background jobs (scheduler, Telegram polling) in this process. Defaults to the
+    RUN_SCHEDULER setting (true); set it to false in the web tier when jobs run in `python -m backend.worker`.
+    """
     # Load .env for local development; no-op in production where Render injects env vars directly.
     load_dotenv()
 
@@ -33,6 +45,11 @@ def create_app():
         logging.warning("Cound not load environment variables with 'FLASK_' prefix")
 
     init_db(flask_app) # Initialize database with Flask app context
+    FinancialDataService.configure(flask_app) # Provider caches settings
+    PriceHistoryService.configure(flask_app) # Rolling statistics windows
+    TelegramService.configure(flask_app) # Outbound Telegram queue
+    NotificationService.configure(flask_app) # Notification outbox drain
+    AdaptivePollingService.configure(flask_app) # Proximity driven price polling
 
     # Hook up blueprints
     flask_app.register_blueprint(general_blueprint)
@@ -41,10 +58,22 @@ def create_app():
     flask_app.register_blueprint(alerts_blueprint)
     flask_app.register_blueprint(telegrams_blueprint)
 
+    if run_scheduler is None:
+        run_scheduler = flask_app.config.get("RUN_SCHEDULER", True)
+    if not run_scheduler:
+        logging.info("Background jobs disabled in this process")
+        return flask_app
+
     try:
-        start_scheduler(flask_app)
+        # With several gunicorn workers only the elected process runs the jobs
+        run_when_leader(flask_app, lambda: start_background_jobs(flask_app))
     except (KeyboardInterrupt, SystemExit, Exception) as exception: 
         logging.error(f"Scheduler shut down: {exception}")
     
     return flask_app
+
+
+def start_background_jobs(flask_app):
+    start_scheduler(flask_app)
+    TelegramService.start_ingestion(flask_app, handle_update) # getUpdates long polling when not using the webhook
     
@@ -8,6 +8,7 @@ from typing import Dict, List, Optional
 from ..models.alert import Alert
 from ..models.asset import Asset
 from ..persistance.db_manager import get_db_session
+from ..services.alert_service import AlertService
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +69,14 @@ def create_alert(ticker: str, alert_type: str, target_price: Optional[float]) ->
             ticker=ticker, alert_type=alert_type, price_threshold=target_price
         )
         session.add(new_alert)
-        return {"message": "Alert created successfully", "stock": str(asset)}
+        AlertService.mark_alerts_changed(session)
+        session.flush()
+        new_alert_id = new_alert.id
+        payload = {"message": "Alert created successfully", "stock": str(asset)}
+
+    # Index only once the transaction committed
+    AlertService.index_alert(new_alert_id, ticker, alert_type, target_price)
+    return payload
 
 
 def delete_alert(alert_id: int) -> dict:
@@ -88,7 +96,10 @@ def delete_alert(alert_id: int) -> dict:
             "alert_id": alert.id,
         }
         session.delete(alert)
-        return payload
+        AlertService.mark_alerts_changed(session)
+
+    AlertService.unindex_alert(payload["alert_id"])
+    return payload
 
 
 def update_alert(alert_id: int, alert_type: str, target_price: Optional[float]) -> dict:
@@ -110,12 +121,17 @@ def update_alert(alert_id: int, alert_type: str, target_price: Optional[float])
         alert.alert_type = alert_type
         alert.price_threshold = target_price
         session.add(alert)
+        AlertService.mark_alerts_changed(session)
 
-        return {
+        ticker = alert.ticker
+        payload = {
             "message": (
                 f"Alert {alert.alert_type} "
                 f"{alert.price_threshold if alert.price_threshold is not None else ''} "
                 f"for asset {alert.asset.ticker} updated successfully"
             ).strip(),
             "alert_id": alert.id,
-        }
\ No newline at end of file
+        }
+
+    AlertService.index_alert(payload["alert_id"], ticker, alert_type, target_price)
+    return payload
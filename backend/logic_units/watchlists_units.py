@@ -5,22 +5,31 @@ from __future__ import annotations
 import logging
 from typing import List, Optional
 
+from sqlalchemy.orm import selectinload
+
 from ..models.asset import Asset
 from ..models.watchlist import Watchlist
 from ..persistance.db_manager import get_db_session
+from ..services.alert_service import AlertService
 from ..services.finantial_data_service import FinancialDataService
+from ..services.price_history_service import PriceHistoryService
 
 logger = logging.getLogger(__name__)
 
 
 def fetch_watchlists(name_filter: Optional[str] = None) -> tuple[List[dict], Optional[str]]:
-	"""Return serialized watchlists with optional case-insensitive name filtering."""
+	"""Return serialized watchlists with optional case-insensitive name filtering.
+
+	Assets and their alerts are eager loaded with selectin loading, so the whole tree is
+	fetched in three queries regardless of the number of watchlists and assets.
+	"""
+	query = Watchlist.query.options(
+		selectinload(Watchlist.assets).selectinload(Asset.alerts)
+	)
 	if name_filter:
-		watchlists = (
-			Watchlist.query.filter(Watchlist.name.ilike(f"%{name_filter}%")).all()
-		)
+		watchlists = query.filter(Watchlist.name.ilike(f"%{name_filter}%")).all()
 	else:
-		watchlists = Watchlist.query.all()
+		watchlists = query.all()
 
 	watchlists_data: List[dict] = []
 	last_updated = None
@@ -86,8 +95,10 @@ def delete_watchlist(watchlist_id: int) -> dict:
 			raise LookupError(f"Watchlist with ID {watchlist_id} not found")
 
 		watchlist_summary = {"id": watchlist.id, "name": watchlist.name}
+		removed_tickers = []
 		for asset in list(watchlist.assets):
 			if len(asset.watchlists) == 1:
+				removed_tickers.append(asset.ticker)
 				session.delete(asset)
 				logger.info(
 					"Asset with ticker '%s' removed from database as it is no longer in any watchlist",
@@ -95,7 +106,13 @@ def delete_watchlist(watchlist_id: int) -> dict:
 				)
 
 		session.delete(watchlist)
-		return watchlist_summary
+		if removed_tickers:
+			AlertService.mark_alerts_changed(session)
+
+	# Alerts of removed assets were deleted in cascade
+	for ticker in removed_tickers:
+		AlertService.unindex_ticker(ticker)
+	return watchlist_summary
 
 
 def update_watchlist(watchlist_id: int, new_name: str) -> dict:
@@ -159,10 +176,16 @@ def remove_asset_from_watchlist(watchlist_id: int, ticker: str) -> dict:
 			raise LookupError(f'Asset with ticker "{ticker}" is not in "{watchlist.name}".')
 
 		watchlist.assets.remove(asset)
-		if len(asset.watchlists) == 0:
+		asset_removed = len(asset.watchlists) == 0
+		if asset_removed:
 			session.delete(asset)
+			AlertService.mark_alerts_changed(session)
 
-		return _serialize_watchlist_summary(watchlist)
+		summary = _serialize_watchlist_summary(watchlist)
+
+	if asset_removed:
+		AlertService.unindex_ticker(ticker)
+	return summary
 
 
 def refresh_watchlist_prices(watchlist_id: int) -> dict:
@@ -175,9 +198,13 @@ def refresh_watchlist_prices(watchlist_id: int) -> dict:
 
 		ticker_list = [asset.ticker for asset in watchlist.assets]
 		prices = FinancialDataService.latest_prices(ticker_list)
+		PriceHistoryService.ensure_rolling_windows(ticker_list)
 		for asset in watchlist.assets:
-			price_pair = prices.get(asset.ticker, asset.price)
-			asset.update_price_statistics(price_pair["original_price"])
+			if asset.ticker not in prices:
+				continue
+			price_pair = prices[asset.ticker]
+			window_statistics = PriceHistoryService.record_tick(asset.ticker, price_pair["original_price"])
+			asset.update_price_statistics(price_pair["original_price"], window_statistics)
 
 		return _serialize_watchlist_with_prices(watchlist)
 
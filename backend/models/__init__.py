@@ -4,6 +4,10 @@ print("Loading  models subpackage ...")
 from .asset import Asset
 from .alert import Alert
 from .watchlist import Watchlist
+from .price_bar import PriceBar
+from .app_state import AppState
+from .notification import Notification
+from .job_run import JobRun
 
-__all__ = ['asset', 'alert', 'watchlist']
+__all__ = ['asset', 'alert', 'watchlist', 'price_bar', 'app_state', 'notification', 'job_run']
 
@@ -3,6 +3,7 @@ from ..utils.time_utils import now_cts_time
 
 #supported types of alerts
 ALERT_TYPE_MONTH_LOW = "MonthMinimum"
+ALERT_TYPE_MONTH_HIGH = "MonthMaximum"
 ALERT_TYPE_PRICE_BELOW = "PriceBelow"
 ALERT_TYPE_PRICE_ABOVE = "PriceAbove"
 
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+from ..persistance.db_manager import db
+
+
+class AppState(db.Model):
+    """
+    Small key/value store for runtime state that must survive restarts (e.g. Telegram update offset).
+    """
+
+    __tablename__ = 'app_state'
+
+    key = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Text, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    @staticmethod
+    def get_value(session, key, default=None):
+        state = session.get(AppState, key)
+        return state.value if state is not None and state.value is not None else default
+
+    @staticmethod
+    def set_value(session, key, value):
+        """
+        Insert or update a key. The caller commits.
+        """
+        state = session.get(AppState, key)
+        if state is None:
+            state = AppState(key=key)
+            session.add(state)
+        state.value = None if value is None else str(value)
+        state.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        return state
+
+    def __str__(self):
+        return f"<AppState {self.key}={self.value}>"
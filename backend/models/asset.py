@@ -25,15 +25,21 @@ class Asset(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=now_cts_time)
     updated_at = db.Column(db.DateTime, nullable=False, default=now_cts_time, onupdate=now_cts_time)
 
-    def update_price_statistics(self, latest_price):
+    def update_price_statistics(self, latest_price, window_statistics=None):
         self.price = latest_price
         self.price_change = round(self.price - self.previous_price, 2)
         self.price_change_percent = round((self.price_change / self.previous_price) * 100, 2) if self.previous_price else 0.0
-        # # Update the min and max intraday
-        if self.price < self.min_month_price:
-            self.min_month_price = self.price
-        if self.price > self.max_month_price:
-            self.max_month_price = self.price
+        if window_statistics:
+            # Rolling window already includes latest_price and has expired bars out of the window
+            self.min_month_price = window_statistics["minimum"]
+            self.max_month_price = window_statistics["maximum"]
+            self.avg_month_price = window_statistics["average"]
+        else:
+            # # Update the min and max intraday
+            if self.price < self.min_month_price:
+                self.min_month_price = self.price
+            if self.price > self.max_month_price:
+                self.max_month_price = self.price
         self.updated_at = now_cts_time()
 
     def update_modification_date(self):
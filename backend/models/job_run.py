@@ -0,0 +1,27 @@
+from ..persistance.db_manager import db
+
+JOB_RUN_STATUS_SUCCESS = "success"
+JOB_RUN_STATUS_PARTIAL = "partial"  # finished with errors on some tickers
+JOB_RUN_STATUS_BUDGET_EXCEEDED = "budget_exceeded"  # stopped before processing every ticker
+JOB_RUN_STATUS_FAILED = "failed"
+
+
+class JobRun(db.Model):
+    """
+    One execution of a scheduler job, with what it processed and how long it took.
+    """
+
+    __tablename__ = 'job_run'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(64), nullable=False, index=True)
+    started_at = db.Column(db.DateTime, nullable=False)
+    duration_ms = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    tickers_processed = db.Column(db.Integer, nullable=False, default=0)
+    alerts_fired = db.Column(db.Integer, nullable=False, default=0)
+    errors = db.Column(db.Integer, nullable=False, default=0)
+    error_message = db.Column(db.Text, nullable=True)
+
+    def __str__(self):
+        return f"<JobRun {self.job_name} {self.started_at} {self.status} {self.duration_ms}ms>"
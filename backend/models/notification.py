@@ -0,0 +1,27 @@
+from ..persistance.db_manager import db
+
+NOTIFICATION_STATUS_PENDING = "pending"
+NOTIFICATION_STATUS_DELIVERED = "delivered"
+NOTIFICATION_STATUS_FAILED = "failed"
+
+
+class Notification(db.Model):
+    """
+    Outbox row of a message to deliver through Telegram.
+
+    Rows are inserted in the same transaction that triggers the alert and sent later by the notification drainer,
+    so sending never holds the database write lock and a failed send is retried instead of lost.
+    """
+
+    __tablename__ = 'notification'
+
+    id = db.Column(db.Integer, primary_key=True)
+    alert_id = db.Column(db.Integer, nullable=True)  # not a foreign key: history is kept when the alert is deleted
+    message = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default=NOTIFICATION_STATUS_PENDING, index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False)
+    delivered_at = db.Column(db.DateTime, nullable=True)
+
+    def __str__(self):
+        return f"<Notification {self.id} {self.status} alert {self.alert_id}>"
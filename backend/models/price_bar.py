@@ -0,0 +1,20 @@
+from ..persistance.db_manager import db
+
+
+class PriceBar(db.Model):
+    """
+    OHLC bar of an asset persisted locally, so statistics can be computed without re-downloading history.
+    """
+
+    __tablename__ = 'price_bar'
+
+    ticker = db.Column(db.String(10), primary_key=True)
+    interval = db.Column(db.String(5), primary_key=True)  # provider interval e.g. "1d"
+    timestamp = db.Column(db.DateTime, primary_key=True)  # bar open time, naive exchange local time (midnight of the trading date for daily bars)
+    open = db.Column(db.Float, nullable=True)
+    high = db.Column(db.Float, nullable=True)
+    low = db.Column(db.Float, nullable=True)
+    close = db.Column(db.Float, nullable=False)
+
+    def __str__(self):
+        return f"<PriceBar {self.ticker} {self.interval} {self.timestamp} O:{self.open} H:{self.high} L:{self.low} C:{self.close}>"
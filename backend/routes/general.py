@@ -1,5 +1,11 @@
-from flask import Blueprint
+from flask import Blueprint, jsonify
+from ..services.finantial_data_service import FinancialDataService
+from ..services.telegram_service import TelegramService
+from ..services.notification_service import NotificationService
+from ..services.adaptive_polling_service import AdaptivePollingService
+from ..scheduler.leader_election import runs_background_jobs
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +22,25 @@ def help():
     available_endpoints = {
         "/": "Home page",
         "/help": "This help page",
-        "/api/prices/latest?tickers=...": "Get latest prices for specified tickers (comma-separated)"
+        "/api/prices/latest?tickers=...": "Get latest prices for specified tickers (comma-separated)",
+        "/api/metrics": "Runtime counters of caches and background workers of the process serving the request"
     }
 
     
-    return '<H1>About this API Service</H1>' + ''.join([f'<p><b>{endpoint}</b>: {description}</p>' for endpoint, description in available_endpoints.items()])
\ No newline at end of file
+    return '<H1>About this API Service</H1>' + ''.join([f'<p><b>{endpoint}</b>: {description}</p>' for endpoint, description in available_endpoints.items()])
+
+@general_blueprint.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Counters are kept in process memory: each gunicorn worker reports its own, and scheduler related
+    counters (notifications, adaptive polling) are only filled in the process running the background jobs.
+    """
+    logger.info("/metrics route called")
+    return jsonify({
+        "process": {"pid": os.getpid(), "runs_background_jobs": runs_background_jobs()},
+        "providers": FinancialDataService.cache_stats(),
+        "telegram_outbound": TelegramService.stats(),
+        "telegram_inbound": TelegramService.inbound_stats(),
+        "notifications": NotificationService.stats(),
+        "adaptive_polling": AdaptivePollingService.stats(),
+    })
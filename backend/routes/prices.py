@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from ..services.finantial_data_service import FinancialDataService
+from ..services.price_history_service import PriceHistoryService
 import yfinance as yf
 import logging
 
@@ -141,4 +142,25 @@ def get_ticker_info():
             return jsonify({"error": "Information not found for the given ticker"}), 404
     except Exception as e:
         logger.error(f"Error fetching information for ticker '{ticker}': {e}")
-        return jsonify({"error": "Failed to fetch ticker information"}), 500
\ No newline at end of file
+        return jsonify({"error": "Failed to fetch ticker information"}), 500
+
+@price_blueprint.route('/rolling', methods=['GET'])
+def get_rolling_statistics():
+    """
+    Endpoint to get rolling window statistics (minimum, maximum, average) computed from stored bars and live prices
+    
+    tickers should be provided as a comma-separated string in the query parameters, e.g.:
+    /api/prices/rolling?tickers=AAPL,VWO
+    Windows are configured with ROLLING_WINDOWS (default 30d) e.g. 30d,90d,52w
+    """
+    logger.info("/api/prices/rolling route called")
+    
+    tickers = request.args.get('tickers', '')
+    ticker_list = [ticker.strip() for ticker in tickers.split(',') if ticker.strip()]
+    
+    if not ticker_list:
+        return jsonify({"error": "No tickers provided"}), 400
+    
+    # Windows live in process memory; a process not running the scheduler seeds them from the stored bars
+    PriceHistoryService.ensure_rolling_windows(ticker_list)
+    return jsonify({ticker: PriceHistoryService.rolling_statistics(ticker) for ticker in ticker_list})
@@ -26,7 +26,7 @@ def _help_command(args):
         "/watchlist_remove {watchlist_id} {asset_ticker} - Removes an asset from a watchlist.\n"
         "/watchlist_delete {watchlist_id} - Deletes a watchlist.\n"
         "/alerts {asset_ticker} - Returns all user's alerts. Optionally, can filter alerts by asset ticker.\n"
-        "/alert_set {asset_ticker} {alert_type} {target_price} - Sets a new alert for an asset. Alert type can be 'MonthMinimum', 'PriceAbove' or 'PriceBelow'.\n"
+        "/alert_set {asset_ticker} {alert_type} {target_price} - Sets a new alert for an asset. Alert type can be 'MonthMinimum', 'MonthMaximum', 'PriceAbove' or 'PriceBelow'.\n"
         "/alert_unset {alert_id} - Removes an alert by its ID.\n"
         "/alert_update {alert_id} {alert_type} {new_target_price} - Updates the target price of an existing alert.\n"
     )
@@ -124,11 +124,16 @@ def _prices_command(args):
         prices = FinancialDataService.latest_prices(tickers)
         output = ""
         for ticker in tickers:
+            if ticker not in prices:
+                output += f"{ticker} sin datos\n"
+                continue
             output += f"{ticker} {prices[ticker]['original_price']}"
-            if not ".MX" in ticker:
+            if ".MX" in ticker:
+                output += "MXN\n"
+            elif prices[ticker]['converted_price'] is not None:
                 output += f", precio justo {prices[ticker]['converted_price']} MXN\n"
             else:
-                output += "MXN\n"
+                output += "\n"
             
         TelegramService.send_message(current_app, output)
     except Exception as e:
@@ -361,17 +366,33 @@ def _process_command(command):
         TelegramService.send_message(current_app, f"Unknown command: {cmd}")
 
 
+def handle_update(update):
+    """
+    Run the bot command contained in a Telegram update, or answer with a hint when there is none.
+    Requires an application context.
+    """
+    message_obj = update.get("message", None)
+    if message_obj and "entities" in message_obj and message_obj["entities"][0]["type"] == "bot_command":
+        _process_command(message_obj["text"])
+    else:
+        TelegramService.send_message(current_app, "I didn't get that. Please use /help to see available commands.")
+
+
 @telegrams_blueprint.route('/', methods=["POST"])
 def send_telegram_message():
-    data = request.get_json()
-    try:
-        message_obj = data.get("message", None)
-        if message_obj and "entities" in message_obj and message_obj["entities"][0]["type"] == "bot_command":
-            text = message_obj["text"]
-            _process_command(text)
-        else:
-            TelegramService.send_message(current_app, "I didn't get that. Please use /help to see available commands.")
-        return jsonify(data), 200
-    except Exception as e:
-        logger.error(f"Error sending message: {e}")
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not ("update_id" in data or "message" in data):
+        logger.error(f"Invalid Telegram update: {data}")
         return jsonify({"error": "Failed to parse message. json with 'text' property is required"}), 400
+
+    update_id = data.get("update_id")
+    if update_id is not None and TelegramService.is_duplicate_update(update_id):
+        logger.info(f"Ignoring redelivered Telegram update {update_id}")
+        return jsonify(data), 200
+
+    # Acknowledge right away: Telegram retries webhooks that answer slowly.
+    if not TelegramService.enqueue_update(current_app._get_current_object(), handle_update, data):
+        if update_id is not None:
+            TelegramService.forget_update(update_id)
+        return jsonify({"error": "Too many pending updates, try again later"}), 503
+    return jsonify(data), 200
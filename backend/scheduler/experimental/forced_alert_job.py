@@ -20,10 +20,12 @@ def updated_price_send_alert(app):
                 
                 for asset in assets:
                     latest_price = prices.get(asset.ticker)
+                    if latest_price is None:
+                        continue
                     asset.update_price_statistics(latest_price.get('original_price'))
                     price_change_message += f"{asset.ticker}: ${(asset.price):.2f},  change {(asset.price_change):.2f}, {(asset.price_change_percent):.2f}% \n"
                 
-                if TelegramService.send_message(app, price_change_message):
+                if TelegramService.send_message(app, price_change_message).result():
                     logger.info("Forced alert job: Telegram message sent successfully")
                 else:
                     logger.error("Forced alert job: Failed to send Telegram message")
@@ -12,7 +12,7 @@ def send_test_telegram_message(app, message):
     """
     logger = logging.getLogger(__name__)
     logger.info(f" Telegram Message Job - executed at {datetime.now()}")
-    success = TelegramService.send_message(app, message)
+    success = TelegramService.send_message(app, message).result()
     if success:
         logger.info("Test message sent successfully")
     else:
@@ -1,35 +1,88 @@
+from datetime import datetime, timedelta, timezone
+import json
 import logging
 
+from ..models.app_state import AppState
 from ..models.asset import Asset
 from ..persistance.db_manager import get_db_session
 from ..persistance.db_utils import is_db_empty
-from ..services.finantial_data_service import FinancialDataService
+from ..services.price_history_service import PriceHistoryService
+from .job_tracking import job_budget_seconds, track_job_run
 
 logger = logging.getLogger(__name__)
 
+STATS_REFRESH_STATE_KEY = "stats_refreshed_at"
 
-def update_monthly_stats(app):
+
+def update_monthly_stats(app, only_stale=False):
 	"""
-	Fetch historical prices for watchlist assets and update price statistics.
+	Backfill the local price_bar store with the bars missing since the last run,
+	re-seed the rolling statistics windows and update asset price statistics computed from the stored bars.
+	Each run is recorded in the job_run table; once the job budget is spent the remaining steps are left for the next run.
+
+	only_stale - Only refresh tickers whose statistics are older than STATS_FRESHNESS_HOURS (default 12) or were never
+	refreshed, e.g. on boot. Rolling windows are still seeded for every ticker from the local store.
 	"""
+	job_name = "historical_fetch_on_boot" if only_stale else "historical_fetch"
 	with app.app_context():
-		try:
-			with get_db_session() as session:
-				if is_db_empty():
-					logger.info("Database is empty, skipping historical price update.")
-					return
-
-				assets = session.query(Asset).all()
-				tickers = [asset.ticker for asset in assets]
-				statistics = FinancialDataService.statistics_in_period(tickers, period="1mo", interval="1d")
-				for asset in assets:
-					if asset.ticker in statistics:
-						asset.previous_price = statistics[asset.ticker]["previous_price"]
-						asset.min_month_price = statistics[asset.ticker]["minimum"]
-						asset.max_month_price = statistics[asset.ticker]["maximum"]
-						asset.avg_month_price = statistics[asset.ticker]["average"]
-						asset.update_modification_date()
-						
-		except Exception as exc:
-			logger.error(f"Failed to fetch historical prices: {exc}")
-			return
\ No newline at end of file
+		with track_job_run(app, job_name, job_budget_seconds(app, job_name)) as tracker:
+			try:
+				with get_db_session() as session:
+					if is_db_empty():
+						logger.info("Database is empty, skipping historical price update.")
+						tracker.skip()
+						return
+
+					assets = session.query(Asset).all()
+					tickers = [asset.ticker for asset in assets]
+					refreshed_at = _stats_refresh_times(session)
+					stale_tickers = _stale_tickers(app, tickers, refreshed_at) if only_stale else tickers
+					if not stale_tickers:
+						logger.info("Price statistics are fresh, seeding rolling windows from the local price store only.")
+						PriceHistoryService.seed_rolling_windows(tickers, interval="1d")
+						return
+
+					# Keep enough bars to fill the longest rolling window (e.g. 52w)
+					lookback_days = max(int(app.config.get("PRICE_BAR_LOOKBACK_DAYS", 31)), PriceHistoryService.history_days_required())
+					PriceHistoryService.backfill(stale_tickers, interval="1d", lookback_days=lookback_days)
+					if tracker.budget.expired():
+						logger.warning(f"{job_name} budget of {tracker.budget.seconds}s spent after backfill, statistics left for the next run")
+						return
+					PriceHistoryService.seed_rolling_windows(tickers, interval="1d")
+					statistics = PriceHistoryService.statistics_in_window(stale_tickers, interval="1d", days=PriceHistoryService.month_window_days())
+					now = datetime.now(timezone.utc).isoformat()
+					for asset in assets:
+						if asset.ticker in statistics:
+							asset.previous_price = statistics[asset.ticker]["previous_price"]
+							asset.min_month_price = statistics[asset.ticker]["minimum"]
+							asset.max_month_price = statistics[asset.ticker]["maximum"]
+							asset.avg_month_price = statistics[asset.ticker]["average"]
+							asset.update_modification_date()
+							refreshed_at[asset.ticker] = now
+							tracker.tickers_processed += 1
+					AppState.set_value(session, STATS_REFRESH_STATE_KEY, json.dumps(refreshed_at))
+							
+			except Exception as exc:
+				logger.error(f"Failed to fetch historical prices: {exc}")
+				tracker.tickers_processed = 0
+				tracker.add_error(str(exc))
+				return
+
+
+def _stats_refresh_times(session):
+	"""
+	Last successful statistics refresh of each ticker, as a dictionary ticker -> ISO 8601 UTC time.
+	"""
+	stored = AppState.get_value(session, STATS_REFRESH_STATE_KEY)
+	return json.loads(stored) if stored else {}
+
+
+def _stale_tickers(app, tickers, refreshed_at):
+	"""
+	Tickers never refreshed or refreshed longer than STATS_FRESHNESS_HOURS ago.
+	"""
+	fresh_after = datetime.now(timezone.utc) - timedelta(hours=float(app.config.get("STATS_FRESHNESS_HOURS", 12)))
+	stale = [ticker for ticker in tickers if ticker not in refreshed_at or datetime.fromisoformat(refreshed_at[ticker]) < fresh_after]
+	if len(stale) < len(tickers):
+		logger.info(f"Skipping history fetch of {len(tickers) - len(stale)} of {len(tickers)} tickers with fresh statistics")
+	return stale
@@ -0,0 +1,129 @@
+from contextlib import contextmanager
+from datetime import timedelta
+import json
+import logging
+import time
+
+from ..models.job_run import JobRun, JOB_RUN_STATUS_SUCCESS, JOB_RUN_STATUS_PARTIAL, JOB_RUN_STATUS_BUDGET_EXCEEDED, JOB_RUN_STATUS_FAILED
+from ..persistance.db_manager import get_db_session
+from ..utils.time_utils import now_cts_time
+
+logger = logging.getLogger(__name__)
+
+
+class JobBudget:
+    """
+    Deadline of one job run. Jobs check it between units of work (e.g. ticker chunks) and stop cleanly once
+    it is spent, leaving the remaining work for the next run.
+    """
+
+    def __init__(self, seconds=None, clock=time.monotonic):
+        self.seconds = seconds
+        self._clock = clock
+        self._started = clock()
+        self.exceeded = False
+
+    def elapsed(self):
+        return self._clock() - self._started
+
+    def expired(self):
+        """
+        return - True once the budget is spent; the run is then reported as budget_exceeded
+        """
+        if self.seconds is not None and self.elapsed() >= self.seconds:
+            self.exceeded = True
+        return self.exceeded
+
+
+class JobRunTracker:
+    """
+    Counters of one job run, written to the job_run table when the run ends.
+    """
+
+    def __init__(self, job_name, budget):
+        self.job_name = job_name
+        self.budget = budget
+        self.tickers_processed = 0
+        self.alerts_fired = 0
+        self.errors = []
+        self.skipped = False
+
+    def add_error(self, message):
+        self.errors.append(message)
+
+    def skip(self):
+        """
+        Mark the run as having had nothing to do, so it is not recorded.
+        """
+        self.skipped = True
+
+    def status(self):
+        if self.errors and not self.tickers_processed:
+            return JOB_RUN_STATUS_FAILED
+        if self.budget.exceeded:
+            return JOB_RUN_STATUS_BUDGET_EXCEEDED
+        if self.errors:
+            return JOB_RUN_STATUS_PARTIAL
+        return JOB_RUN_STATUS_SUCCESS
+
+
+def job_budget_seconds(app, job_name, interval_seconds=None):
+    """
+    Time budget of a job: JOB_BUDGETS (JSON object job name -> seconds) when listed, otherwise JOB_BUDGET_SECONDS
+    (default 300), never longer than the job interval when given.
+    """
+    budgets = app.config.get("JOB_BUDGETS") or {}
+    if isinstance(budgets, str):
+        budgets = json.loads(budgets)
+    if job_name in budgets:
+        return float(budgets[job_name])
+    seconds = float(app.config.get("JOB_BUDGET_SECONDS", 300))
+    return min(seconds, interval_seconds) if interval_seconds else seconds
+
+
+@contextmanager
+def track_job_run(app, job_name, budget_seconds=None):
+    """
+    Time a job run and record it in the job_run table, together with the counters set on the yielded tracker.
+
+    Usage:
+        with track_job_run(app, "last_prices_fetch", 60) as tracker:
+            if tracker.budget.expired(): ...
+            tracker.tickers_processed += 10
+    """
+    tracker = JobRunTracker(job_name, JobBudget(budget_seconds))
+    started_at = now_cts_time()
+    try:
+        yield tracker
+    except Exception as exc:
+        tracker.add_error(str(exc))
+        raise
+    finally:
+        if not tracker.skipped:
+            _save_job_run(app, tracker, started_at)
+
+
+def _save_job_run(app, tracker, started_at):
+    duration_ms = round(tracker.budget.elapsed() * 1000, 1)
+    status = tracker.status()
+    logger.info(
+        f"Job {tracker.job_name} {status} in {duration_ms}ms: {tracker.tickers_processed} tickers, "
+        f"{tracker.alerts_fired} alerts, {len(tracker.errors)} errors"
+    )
+    try:
+        with app.app_context():
+            with get_db_session() as session:
+                session.add(JobRun(
+                    job_name=tracker.job_name,
+                    started_at=started_at,
+                    duration_ms=duration_ms,
+                    status=status,
+                    tickers_processed=tracker.tickers_processed,
+                    alerts_fired=tracker.alerts_fired,
+                    errors=len(tracker.errors),
+                    error_message="\n".join(tracker.errors)[:2000] or None,
+                ))
+                retention_days = int(app.config.get("JOB_RUN_RETENTION_DAYS", 14))
+                session.query(JobRun).filter(JobRun.started_at < started_at - timedelta(days=retention_days)).delete(synchronize_session=False)
+    except Exception as exc:
+        logger.error(f"Failed to record run of job {tracker.job_name}: {exc}")
@@ -0,0 +1,118 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_leader_lock = None
+_standby = None
+_running = False
+
+
+class LeaderLock:
+    """
+    Exclusive, non blocking lock on a file shared by every process of a host (e.g. gunicorn workers).
+
+    The holder is the leader. The operating system releases the lock when the leader process dies,
+    so a standby process can take over. Only processes on the same host (same file system) are coordinated.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def try_acquire(self):
+        """
+        return - True when this process holds the lock
+        """
+        if self._file is not None:
+            return True
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+def runs_background_jobs():
+    """
+    return - True when this process started the background jobs
+    """
+    return _running
+
+
+def _start(start):
+    global _running
+    start()
+    _running = True
+
+
+def run_when_leader(app, start):
+    """
+    Call start() in the one process elected to run background jobs (scheduler, Telegram polling).
+
+    The first process to lock SCHEDULER_LOCK_FILE starts right away. Every other process keeps serving HTTP
+    and retries every SCHEDULER_LOCK_RETRY_SECONDS in a standby thread, taking over when the leader dies.
+    Without fcntl (Windows) every process is its own leader.
+
+    return - True when start() was called now, False when waiting as standby or skipped
+    """
+    global _leader_lock, _standby
+
+    # The debug reloader runs the app twice; only the child process runs jobs
+    if app.debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        return False
+
+    if fcntl is None:
+        logger.warning("File locks are not supported on this platform, running background jobs in every process")
+        _start(start)
+        return True
+
+    if _leader_lock is None:
+        path = app.config.get("SCHEDULER_LOCK_FILE") or os.path.join(tempfile.gettempdir(), "stock-price-alert-scheduler.lock")
+        _leader_lock = LeaderLock(path)
+
+    if _leader_lock.try_acquire():
+        logger.info(f"Process {os.getpid()} elected leader, starting background jobs")
+        _start(start)
+        return True
+
+    if _standby is None or not _standby.is_alive():
+        retry_seconds = float(app.config.get("SCHEDULER_LOCK_RETRY_SECONDS", 10))
+        _standby = threading.Thread(target=_wait_for_leadership, args=(start, retry_seconds), name="scheduler-standby", daemon=True)
+        _standby.start()
+    logger.info(f"Process {os.getpid()} is standby, background jobs run in the leader process")
+    return False
+
+
+def _wait_for_leadership(start, retry_seconds):
+    while True:
+        time.sleep(retry_seconds)
+        if _leader_lock.try_acquire():
+            logger.info(f"Process {os.getpid()} took over as leader, starting background jobs")
+            try:
+                _start(start)
+            except Exception as exc:
+                logger.error(f"Failed to start background jobs: {exc}")
+            return
@@ -0,0 +1,23 @@
+import logging
+
+from ..services.notification_service import NotificationService
+from .job_tracking import job_budget_seconds, track_job_run
+
+logger = logging.getLogger(__name__)
+
+
+def drain_notifications(app):
+	"""
+	Send notifications left pending in the outbox, e.g. when Telegram was unreachable during the price cycle.
+	Only runs that delivered something or failed are recorded in the job_run table.
+	"""
+	with track_job_run(app, "notification_drain", job_budget_seconds(app, "notification_drain")) as tracker:
+		try:
+			delivered = NotificationService.drain(app)
+			if delivered:
+				logger.info(f"Delivered {delivered} pending notifications")
+			else:
+				tracker.skip()
+		except Exception as exc:
+			logger.error(f"Failed to drain notifications: {exc}")
+			tracker.add_error(str(exc))
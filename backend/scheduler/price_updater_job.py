@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta, timezone
 import logging
 
 from ..models.asset import Asset
@@ -5,30 +6,125 @@ from ..persistance.db_manager import get_db_session
 from ..persistance.db_utils import is_db_empty
 from ..services.finantial_data_service import FinancialDataService
 from ..services.alert_service import AlertService
+from ..services.price_history_service import PriceHistoryService
+from ..services.notification_service import NotificationService
+from ..services.adaptive_polling_service import AdaptivePollingService
+from ..utils.market_calendar import is_market_open
+from ..utils.polling_tiers import assign_tier, tier_intervals, tier_overrides
+from .job_tracking import job_budget_seconds, track_job_run
 
 logger = logging.getLogger(__name__)
 
 
-def update_prices_and_alerts(app):
+def update_prices_and_alerts(app, tier=None):
 	"""
 	Fetch latest prices for all assets attached to watchlists, persist updates,
-	then check all alerts.
+	then check the alerts crossed by each price move.
+	When a polling tier is given (see POLLING_TIERS) only the assets of that tier are updated.
+	With ADAPTIVE_POLLING_ENABLED only the assets due for a poll are updated, then each one is planned
+	again from the distance of its new price to its nearest alert trigger.
+	Triggered alerts are written to the notification outbox with the price update and sent once the transaction is committed.
+	With MARKET_HOURS_ENABLED (default) assets whose exchange is closed are skipped, except for one poll after the close.
+	Each run is recorded in the job_run table; once the job budget is spent the remaining tickers are left for the next run.
+	Tickers the provider fails to price are skipped and recorded as errors of the run without blocking the others.
 	"""
+	adaptive = AdaptivePollingService.enabled()
+	job_name = f"last_prices_fetch_{tier}" if tier is not None else ("adaptive_prices_fetch" if adaptive else "last_prices_fetch")
 	with app.app_context():
-		try:
-			with get_db_session() as session:
-				if is_db_empty():
-					logger.info("Database is empty, skipping price update.")
-					return
-
-				assets = session.query(Asset).all()
-				tickers = [asset.ticker for asset in assets]
-				prices = FinancialDataService.latest_prices(tickers)
-				for asset in assets:
-					latest_price = prices.get(asset.ticker)
-					asset.update_price_statistics(latest_price.get('original_price'))
-				AlertService.check_all_alerts(app)
-			
-		except Exception as exc:
-			logger.error(f"Failed to fetch latest prices: {exc}")
-			return
+		with track_job_run(app, job_name) as tracker:
+			_update_prices(app, tier, adaptive, job_name, tracker)
+
+		if tracker.alerts_fired:
+			try:
+				NotificationService.drain(app)
+			except Exception as exc:
+				logger.error(f"Failed to send notifications: {exc}")
+
+
+def _update_prices(app, tier, adaptive, job_name, tracker):
+	"""
+	Body of update_prices_and_alerts, counting processed tickers and fired alerts on the job run tracker.
+	"""
+	try:
+		with get_db_session() as session:
+			if is_db_empty():
+				logger.info("Database is empty, skipping price update.")
+				tracker.skip()
+				return
+
+			# Least recently updated first: tickers left over when a run hits its budget lead the next run
+			assets = session.query(Asset).order_by(Asset.updated_at, Asset.ticker).all()
+			interval_minutes = float(app.config.get("LAST_PRICES_FETCH_INTERVAL", 15))
+			tiers = tier_intervals(app)
+			overrides = tier_overrides(app)
+			if tier is not None:
+				assets = [asset for asset in assets if assign_tier(asset.ticker, asset.displayed_name, tiers, overrides) == tier]
+				interval_minutes = tiers[tier]
+			tracker.budget.seconds = job_budget_seconds(app, job_name, interval_minutes * 60)
+			if adaptive:
+				assets = AdaptivePollingService.due_assets(assets)
+				interval_minutes = AdaptivePollingService.max_interval_seconds() / 60
+			if app.config.get("MARKET_HOURS_ENABLED", True) and assets:
+				assets = _assets_in_session(assets, interval_minutes)
+				if not assets:
+					logger.info("All markets are closed, skipping price update.")
+			if not assets:
+				tracker.skip()
+				return
+
+			PriceHistoryService.ensure_rolling_windows([asset.ticker for asset in assets])
+			moves = []
+			failed_assets = []
+			chunk_size = FinancialDataService.quote_batch_size()
+			for start in range(0, len(assets), chunk_size):
+				if tracker.budget.expired():
+					logger.warning(f"{job_name} budget of {tracker.budget.seconds}s spent, {len(assets) - start} tickers left for the next run")
+					break
+				chunk = assets[start:start + chunk_size]
+				errors = {}
+				# The quote cache serves web requests; a poll always asks the provider, or a polling interval shorter
+				# than QUOTE_CACHE_TTL would get the previous poll's price back
+				prices = FinancialDataService.latest_prices([asset.ticker for asset in chunk], errors=errors, max_age=0)
+				for ticker, error in errors.items():
+					tracker.add_error(f"{ticker}: {error}")
+				for asset in chunk:
+					if asset.ticker not in prices:
+						failed_assets.append(asset)  # failed ticker (e.g. delisted) keeps its last price, the others are still updated
+						continue
+					latest_price = prices[asset.ticker]['original_price']
+					moves.append((asset, asset.price))
+					window_statistics = PriceHistoryService.record_tick(asset.ticker, latest_price)
+					asset.update_price_statistics(latest_price, window_statistics)
+			tracker.tickers_processed = len(moves)
+
+			# alerts may have been changed through another process (web worker) since the last cycle
+			AlertService.refresh_alert_index()
+			if app.config.get("ALERT_EVALUATION_MODE", "index") == "sweep":
+				tracker.alerts_fired = AlertService.check_all_alerts_vectorized(app, moves)
+			else:
+				tracker.alerts_fired = AlertService.check_moved_assets(app, moves)
+			if adaptive:
+				# polling tiers, when configured, bound the interval of their assets
+				max_seconds_of = (lambda asset: tiers[assign_tier(asset.ticker, asset.displayed_name, tiers, overrides)] * 60) if tiers else None
+				AdaptivePollingService.reschedule([asset for asset, _ in moves], max_seconds_of)
+				AdaptivePollingService.back_off(failed_assets, max_seconds_of)
+		
+	except Exception as exc:
+		logger.error(f"Failed to fetch latest prices: {exc}")
+		# the transaction was rolled back: nothing of this run was saved
+		tracker.tickers_processed = 0
+		tracker.alerts_fired = 0
+		tracker.add_error(str(exc))
+
+
+def _assets_in_session(assets, interval_minutes):
+	"""
+	Keep the assets whose market is open, or closed less than one polling interval ago so the closing price is captured.
+	Assets never priced yet (price 0) are always kept.
+	"""
+	grace = timedelta(minutes=interval_minutes)
+	now = datetime.now(timezone.utc)
+	open_assets = [asset for asset in assets if not asset.price or is_market_open(asset.ticker, now, grace)]
+	if len(open_assets) < len(assets):
+		logger.info(f"Skipping {len(assets) - len(open_assets)} of {len(assets)} assets with closed markets")
+	return open_assets
@@ -5,8 +5,11 @@ import os
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from ..utils.time_utils import GMT_MINUS_6, now_cts_time
+from ..utils.polling_tiers import tier_intervals
+from ..services.adaptive_polling_service import AdaptivePollingService
 from .price_updater_job import update_prices_and_alerts
 from .history_fetcher_job import update_monthly_stats
+from .notification_drain_job import drain_notifications
 from .experimental.telegram_messages_job import send_test_telegram_message
 from .experimental.simulated_price_updater_job import simulate_fecthing_prices
 from .experimental.simulated_history_fetcher_job import simulate_fecthing_history
@@ -31,8 +34,15 @@ def start_scheduler(app):
         return None
 
     last_prices_minutes = int(app.config.get("LAST_PRICES_FETCH_INTERVAL", 15))
-
-    scheduler = BackgroundScheduler()
+    notification_drain_seconds = int(app.config.get("NOTIFICATION_DRAIN_INTERVAL", 60))
+
+    # Overlap policy of every job: never two runs of the same job at once, runs missed while the previous one
+    # was still going (or the process was busy) are merged into a single run, and dropped when later than the grace time
+    scheduler = BackgroundScheduler(job_defaults={
+        "max_instances": 1,
+        "coalesce": True,
+        "misfire_grace_time": int(app.config.get("JOB_MISFIRE_GRACE_SECONDS", 60)),
+    })
     
     ### Test orchestration queue - uncomment for testing experimenta job executions
 
@@ -97,14 +107,37 @@ def start_scheduler(app):
 
     ### Development orchestrationt queue - uncomment for real data fetching
     
-    scheduler.add_job(
-        func=update_prices_and_alerts,
-        trigger="interval",
-        minutes=last_prices_minutes,
-        args=[app],
-        id="last_prices_fetch",
-        replace_existing=True,
-    )
+    tiers = tier_intervals(app)
+    if AdaptivePollingService.enabled():
+        # checks often, but each asset is only fetched when its proximity based poll time is due
+        scheduler.add_job(
+            func=update_prices_and_alerts,
+            trigger="interval",
+            seconds=AdaptivePollingService.check_interval_seconds(),
+            args=[app],
+            id="adaptive_prices_fetch",
+            replace_existing=True,
+        )
+    elif tiers:
+        # one job per polling tier, each fetching only the assets of its tier
+        for tier, minutes in tiers.items():
+            scheduler.add_job(
+                func=update_prices_and_alerts,
+                trigger="interval",
+                seconds=int(minutes * 60),
+                args=[app, tier],
+                id=f"last_prices_fetch_{tier}",
+                replace_existing=True,
+            )
+    else:
+        scheduler.add_job(
+            func=update_prices_and_alerts,
+            trigger="interval",
+            minutes=last_prices_minutes,
+            args=[app],
+            id="last_prices_fetch",
+            replace_existing=True,
+        )
 
     #runs when markets close in Mexico 
     scheduler.add_job(
@@ -123,14 +156,37 @@ def start_scheduler(app):
         trigger="date",
         run_date=now_cts_time(),
         args=[app],
+        kwargs={"only_stale": True},  # a restart or deploy does not download history refreshed recently
         id="historical_fetch_on_boot",
         replace_existing=True,
     )
 
+    # retries notifications the price job could not deliver
+    scheduler.add_job(
+        func=drain_notifications,
+        trigger="interval",
+        seconds=notification_drain_seconds,
+        args=[app],
+        id="notification_drain",
+        replace_existing=True,
+    )
+
     scheduler.start()
     _scheduler = scheduler
     logger.info(
         "Scheduler started: last_prices every %s minutes, historical_fetch now on boot and daily at 15:30 CTS",
-        last_prices_minutes,
+        tiers or last_prices_minutes,
     )
-    return scheduler
\ No newline at end of file
+    return scheduler
+
+
+def stop_scheduler(wait=True):
+    """
+    Shut the scheduler down, letting running jobs finish when wait is True.
+    """
+    global _scheduler
+
+    if _scheduler and _scheduler.running:
+        _scheduler.shutdown(wait=wait)
+        logger.info("Scheduler stopped")
+    _scheduler = None
@@ -0,0 +1,93 @@
+import logging
+
+from .alert_service import AlertService
+from .polling_schedule import PollingSchedule
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptivePollingService:
+    """
+    Proximity driven polling: assets close to an alert trigger are polled often, far ones rarely.
+    """
+
+    _enabled = False
+    _schedule = PollingSchedule()
+
+    @staticmethod
+    def configure(app):
+        """
+        Apply adaptive polling settings from the Flask configuration.
+
+        ADAPTIVE_POLLING_ENABLED - Replace the fixed price polling intervals by proximity driven ones (default false)
+        ADAPTIVE_POLL_MIN_SECONDS - Interval of assets near a trigger, also how often due assets are checked (default 30).
+        Polls bypass the quote cache, so it may be below QUOTE_CACHE_TTL
+        ADAPTIVE_POLL_MAX_SECONDS - Interval of assets far from any trigger or without alerts (default 900)
+        ADAPTIVE_POLL_NEAR_PERCENT - Distance to a trigger, in percent of the price, polled at the min interval (default 1)
+        ADAPTIVE_POLL_FAR_PERCENT - Distance from which assets are polled at the max interval (default 10)
+        """
+        AdaptivePollingService._enabled = bool(app.config.get("ADAPTIVE_POLLING_ENABLED", False))
+        AdaptivePollingService._schedule.configure(
+            min_seconds=app.config.get("ADAPTIVE_POLL_MIN_SECONDS", 30),
+            max_seconds=app.config.get("ADAPTIVE_POLL_MAX_SECONDS", 900),
+            near_percent=app.config.get("ADAPTIVE_POLL_NEAR_PERCENT", 1.0),
+            far_percent=app.config.get("ADAPTIVE_POLL_FAR_PERCENT", 10.0),
+        )
+
+    @staticmethod
+    def enabled():
+        return AdaptivePollingService._enabled
+
+    @staticmethod
+    def check_interval_seconds():
+        """
+        How often the scheduler looks for due assets
+        """
+        return AdaptivePollingService._schedule.min_seconds
+
+    @staticmethod
+    def max_interval_seconds():
+        return AdaptivePollingService._schedule.max_seconds
+
+    @staticmethod
+    def due_assets(assets):
+        """
+        return - The assets whose next poll time is reached
+        """
+        return [asset for asset in assets if AdaptivePollingService._schedule.is_due(asset.ticker)]
+
+    @staticmethod
+    def reschedule(assets, max_seconds_of=None):
+        """
+        Plan the next poll of each asset from the distance of its new price to the nearest alert trigger.
+
+        assets - Assets holding their latest price and statistics
+        max_seconds_of - Optional function asset -> upper bound of its interval in seconds (e.g. its polling tier)
+        """
+        for asset in assets:
+            distance = AlertService.trigger_distance(asset)
+            max_seconds = max_seconds_of(asset) if max_seconds_of else None
+            interval = AdaptivePollingService._schedule.plan(asset.ticker, distance, max_seconds)
+            logger.debug(f"{asset.ticker} next poll in {interval:.0f}s (trigger distance {distance})")
+
+    @staticmethod
+    def back_off(assets, max_seconds_of=None):
+        """
+        Plan the next poll of assets the provider failed to price (e.g. delisted) at their longest interval,
+        so failures are not retried at the polling rate of assets near a trigger.
+
+        max_seconds_of - Optional function asset -> upper bound of its interval in seconds (e.g. its polling tier)
+        """
+        for asset in assets:
+            max_seconds = max_seconds_of(asset) if max_seconds_of else None
+            interval = AdaptivePollingService._schedule.plan(asset.ticker, None, max_seconds)
+            logger.info(f"{asset.ticker} could not be priced, next poll in {interval:.0f}s")
+
+    @staticmethod
+    def stats():
+        """
+        Get the distribution of planned intervals, e.g. for the /api/metrics endpoint
+        """
+        stats = AdaptivePollingService._schedule.stats()
+        stats["enabled"] = AdaptivePollingService._enabled
+        return stats
@@ -0,0 +1,168 @@
+from bisect import bisect_left, bisect_right
+import threading
+
+from ..models.alert import ALERT_TYPE_PRICE_BELOW, ALERT_TYPE_PRICE_ABOVE
+
+
+class _SortedThresholds:
+    """Thresholds of one ticker and alert type, kept sorted with their alert ids in a parallel list."""
+
+    def __init__(self):
+        self.thresholds = []
+        self.ids = []
+
+    def add(self, threshold, alert_id):
+        position = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(position, threshold)
+        self.ids.insert(position, alert_id)
+
+    def remove(self, threshold, alert_id):
+        start = bisect_left(self.thresholds, threshold)
+        end = bisect_right(self.thresholds, threshold)
+        for position in range(start, end):
+            if self.ids[position] == alert_id:
+                del self.thresholds[position]
+                del self.ids[position]
+                return
+
+    def ids_between(self, start, end):
+        return self.ids[start:end]
+
+
+class AlertIndex:
+    """
+    In-memory index of alerts per ticker.
+
+    PriceBelow and PriceAbove thresholds are kept in sorted arrays, so the alerts crossed by a price move
+    are found with two bisections over the moved interval. Alerts evaluated against asset statistics
+    (e.g. MonthMinimum) are kept per ticker and only checked for tickers whose price moved.
+    Alerts added or changed after the first load are also kept as new until take_new_alerts(), so an alert whose
+    condition already holds when it is created is evaluated once instead of waiting for the price to cross it.
+    """
+
+    def __init__(self):
+        self._below = {}  # ticker -> _SortedThresholds
+        self._above = {}  # ticker -> _SortedThresholds
+        self._statistic_alerts = {}  # ticker -> {alert_id: alert_type}
+        self._by_id = {}  # alert_id -> (ticker, alert_type, threshold)
+        self._new_ids = set()  # added or changed since the last take_new_alerts()
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def rebuild(self, rows):
+        """
+        Replace the index content.
+
+        rows - Iterable of (alert_id, ticker, alert_type, price_threshold)
+        """
+        with self._lock:
+            # The first load has nothing to compare with: existing alerts are only evaluated when crossed
+            previous = dict(self._by_id) if self.loaded else None
+            self._below.clear()
+            self._above.clear()
+            self._statistic_alerts.clear()
+            self._by_id.clear()
+            for alert_id, ticker, alert_type, threshold in rows:
+                self._add(alert_id, ticker, alert_type, threshold)
+            if previous is not None:
+                self._new_ids.update(alert_id for alert_id, entry in self._by_id.items() if previous.get(alert_id) != entry)
+            self._new_ids.intersection_update(self._by_id)
+            self.loaded = True
+
+    def add(self, alert_id, ticker, alert_type, threshold):
+        with self._lock:
+            if self._by_id.get(alert_id) == (ticker, alert_type, threshold):
+                return
+            self._remove(alert_id)
+            self._add(alert_id, ticker, alert_type, threshold)
+            if alert_id in self._by_id:
+                self._new_ids.add(alert_id)
+
+    def take_new_alerts(self):
+        """
+        return - Ids of the alerts added or changed since the last call, which are then forgotten
+        """
+        with self._lock:
+            new_ids = list(self._new_ids)
+            self._new_ids.clear()
+            return new_ids
+
+    def remove(self, alert_id):
+        with self._lock:
+            self._remove(alert_id)
+
+    def remove_ticker(self, ticker):
+        with self._lock:
+            for alert_id in [alert_id for alert_id, entry in self._by_id.items() if entry[0] == ticker]:
+                self._remove(alert_id)
+
+    def crossed(self, ticker, old_price, new_price):
+        """
+        Ids of the PriceBelow/PriceAbove alerts of a ticker crossed by a move from old_price to new_price.
+
+        PriceBelow alerts with threshold in [new_price, old_price) and PriceAbove alerts with threshold in
+        (old_price, new_price]. When old_price is unknown (None), every alert whose condition holds at new_price counts.
+        """
+        with self._lock:
+            crossed_ids = []
+            below = self._below.get(ticker)
+            if below is not None:
+                start = bisect_left(below.thresholds, new_price)
+                end = len(below.thresholds) if old_price is None else bisect_left(below.thresholds, old_price)
+                crossed_ids.extend(below.ids_between(start, end))
+            above = self._above.get(ticker)
+            if above is not None:
+                start = 0 if old_price is None else bisect_right(above.thresholds, old_price)
+                end = bisect_right(above.thresholds, new_price)
+                crossed_ids.extend(above.ids_between(start, end))
+            return crossed_ids
+
+    def nearest_threshold(self, ticker, price):
+        """
+        PriceBelow/PriceAbove threshold of a ticker closest to price, None when the ticker has none.
+        """
+        with self._lock:
+            nearest = None
+            for sides in (self._below, self._above):
+                thresholds = sides.get(ticker)
+                if thresholds is None:
+                    continue
+                position = bisect_left(thresholds.thresholds, price)
+                for neighbour in thresholds.thresholds[max(0, position - 1):position + 1]:
+                    if nearest is None or abs(neighbour - price) < abs(nearest - price):
+                        nearest = neighbour
+            return nearest
+
+    def statistic_alerts(self, ticker):
+        """
+        return - A dictionary alert_id -> alert_type of alerts evaluated against asset statistics
+        """
+        with self._lock:
+            return dict(self._statistic_alerts.get(ticker, {}))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._by_id)
+
+    def _add(self, alert_id, ticker, alert_type, threshold):
+        if alert_type in (ALERT_TYPE_PRICE_BELOW, ALERT_TYPE_PRICE_ABOVE):
+            if threshold is None:
+                return
+            sides = self._below if alert_type == ALERT_TYPE_PRICE_BELOW else self._above
+            sides.setdefault(ticker, _SortedThresholds()).add(threshold, alert_id)
+        else:
+            self._statistic_alerts.setdefault(ticker, {})[alert_id] = alert_type
+        self._by_id[alert_id] = (ticker, alert_type, threshold)
+
+    def _remove(self, alert_id):
+        self._new_ids.discard(alert_id)
+        entry = self._by_id.pop(alert_id, None)
+        if entry is None:
+            return
+        ticker, alert_type, threshold = entry
+        if alert_type == ALERT_TYPE_PRICE_BELOW:
+            self._below[ticker].remove(threshold, alert_id)
+        elif alert_type == ALERT_TYPE_PRICE_ABOVE:
+            self._above[ticker].remove(threshold, alert_id)
+        else:
+            self._statistic_alerts[ticker].pop(alert_id, None)
@@ -1,10 +1,26 @@
-from ..models.alert import Alert, ALERT_TYPE_MONTH_LOW, ALERT_TYPE_PRICE_BELOW, ALERT_TYPE_PRICE_ABOVE
-from ..persistance.db_manager import get_db_session
-from .telegram_service import TelegramService
+from ..models.alert import Alert, ALERT_TYPE_MONTH_LOW, ALERT_TYPE_MONTH_HIGH, ALERT_TYPE_PRICE_BELOW, ALERT_TYPE_PRICE_ABOVE
+from ..models.app_state import AppState
+from ..models.asset import Asset
+from ..persistance.db_manager import db, get_db_session
+from .alert_index import AlertIndex
+from .notification_service import NotificationService
 import logging
+import uuid
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Changed on every alert create/update/delete, so each process can tell whether its alert index is outdated
+ALERTS_VERSION_STATE_KEY = "alerts_version"
+
+# Numeric codes of alert types for the vectorized evaluation
+_ALERT_TYPE_CODES = {
+    ALERT_TYPE_MONTH_LOW: 0,
+    ALERT_TYPE_MONTH_HIGH: 1,
+    ALERT_TYPE_PRICE_BELOW: 2,
+    ALERT_TYPE_PRICE_ABOVE: 3,
+}
+
 ### Quick testing in flask shell
 # from backend.services.alert_service import AlertService
 # AlertService.check_all_alerts()
@@ -16,40 +32,57 @@ class AlertService:
     
     """
 
+    # Per ticker thresholds of every alert, kept in sync by alerts_units create/update/delete.
+    _alert_index = AlertIndex()
+    _index_version = None  # alerts version the index was built at
+
     @staticmethod
     def check_alert(app, alert):
 
         """
         Check if a specific alert condition is met and log the result.
         Contains all supported alerts in system.
+        Triggered alerts add a row to the notification outbox in the caller's transaction;
+        NotificationService.drain sends it afterwards.
+
+        return - True when the alert triggered
         """
 
         def trigger_alert(alert, message):
             alert.update_trigger_time()
             logger.info(message)
-            TelegramService.send_message(app, message)
+            NotificationService.enqueue(message, alert.id)
+            return True
 
         def month_minimum(alert):
             asset = alert.asset
             if asset.price <= asset.min_month_price:
-                trigger_alert(alert, f"Month low alert triggered for {asset.ticker}: current price {asset.price} is at or below the monthly low of {asset.min_month_price}")
+                return trigger_alert(alert, f"Month low alert triggered for {asset.ticker}: current price {asset.price} is at or below the monthly low of {asset.min_month_price}")
     
+        def month_maximum(alert):
+            asset = alert.asset
+            if asset.price >= asset.max_month_price:
+                return trigger_alert(alert, f"Month high alert triggered for {asset.ticker}: current price {asset.price} is at or above the monthly high of {asset.max_month_price}")
+
         def price_below(alert):
             asset = alert.asset
             if asset.price <= alert.price_threshold:
-                trigger_alert(alert, f"Price below alert triggered for {asset.ticker}: current price {asset.price} is at or below the threshold of {alert.price_threshold}")
+                return trigger_alert(alert, f"Price below alert triggered for {asset.ticker}: current price {asset.price} is at or below the threshold of {alert.price_threshold}")
 
         def price_above(alert):
             asset = alert.asset
             if asset.price >= alert.price_threshold:
-                trigger_alert(alert, f"Price above alert triggered for {asset.ticker}: current price {asset.price} is at or above the threshold of {alert.price_threshold}")
+                return trigger_alert(alert, f"Price above alert triggered for {asset.ticker}: current price {asset.price} is at or above the threshold of {alert.price_threshold}")
 
         if alert.alert_type == ALERT_TYPE_MONTH_LOW:
-            month_minimum(alert)
+            return bool(month_minimum(alert))
+        elif alert.alert_type == ALERT_TYPE_MONTH_HIGH:
+            return bool(month_maximum(alert))
         elif alert.alert_type == ALERT_TYPE_PRICE_BELOW:
-            price_below(alert)
+            return bool(price_below(alert))
         elif alert.alert_type == ALERT_TYPE_PRICE_ABOVE:
-            price_above(alert)
+            return bool(price_above(alert))
+        return False
 
     
     @staticmethod
@@ -57,3 +90,193 @@ class AlertService:
         alerts = Alert.query.all()
         for alert in alerts:
             AlertService.check_alert(app, alert)
+
+    @staticmethod
+    def check_all_alerts_vectorized(app, moves=None):
+        """
+        Full sweep alternative to check_all_alerts.
+
+        Alerts are loaded as columns (ticker, type, threshold) and joined against the asset price vector,
+        so the trigger conditions of every alert are computed in a single NumPy pass; ORM objects are only
+        loaded for the alerts that triggered.
+
+        moves - Optional list of (asset, old_price) pairs of a price update. Only the alerts of these assets are swept,
+        with the same triggers as check_moved_assets: PriceBelow/PriceAbove when the move crossed the threshold,
+        statistic alerts while the price is at the statistic, and alerts created or changed since the previous cycle once.
+        Without moves every alert whose condition holds triggers.
+        return - Number of alerts triggered
+        """
+        if moves is None:
+            asset_rows = db.session.query(Asset.ticker, Asset.price, Asset.min_month_price, Asset.max_month_price).all()
+            alert_rows = db.session.query(Alert.id, Alert.ticker, Alert.alert_type, Alert.price_threshold).all()
+            previous_prices = None
+            new_ids = []
+        else:
+            asset_rows = [(asset.ticker, asset.price, asset.min_month_price, asset.max_month_price) for asset, _ in moves]
+            tickers = [asset.ticker for asset, _ in moves]
+            alert_rows = db.session.query(Alert.id, Alert.ticker, Alert.alert_type, Alert.price_threshold).filter(Alert.ticker.in_(tickers)).all() if tickers else []
+            # Seeded assets start at 0.0: treat it as an unknown previous price
+            previous_prices = np.array([old_price if old_price else np.nan for _, old_price in moves], dtype=float)
+            AlertService._ensure_index_loaded()
+            new_ids = AlertService._alert_index.take_new_alerts()
+
+        triggered_ids = []
+        if asset_rows and alert_rows:
+            asset_tickers, prices, minimums, maximums = zip(*asset_rows)
+            alert_ids, alert_tickers, alert_types, thresholds = zip(*alert_rows)
+            mask = evaluate_alert_rules(
+                np.array(asset_tickers), np.array(prices, dtype=float),
+                np.array(minimums, dtype=float), np.array(maximums, dtype=float),
+                np.array(alert_tickers), np.array(alert_types), np.array(thresholds, dtype=float),
+                previous_prices,
+            )
+            triggered_ids = np.array(alert_ids)[mask].tolist()
+        triggered_ids = set(triggered_ids) | set(new_ids)
+        if not triggered_ids:
+            return 0
+
+        alerts = Alert.query.filter(Alert.id.in_(triggered_ids)).all()
+        return sum(AlertService.check_alert(app, alert) for alert in alerts)
+
+    @staticmethod
+    def check_moved_assets(app, moves):
+        """
+        Evaluate only the alerts that a price update can have triggered.
+
+        moves - List of (asset, old_price) pairs, asset already holding its new price and statistics
+        PriceBelow/PriceAbove alerts are looked up in the threshold index by the interval each price moved over,
+        statistic alerts (MonthMinimum, MonthMaximum) only for assets whose new price reached the statistic.
+        Alerts created or changed since the previous cycle are evaluated once against the current price, whether
+        or not their asset moved, so a condition that already holds when the alert is set still notifies.
+        Cost grows with the number of triggered alerts, not with the number of alerts in the system.
+
+        return - Number of alerts triggered
+        """
+        AlertService._ensure_index_loaded()
+
+        candidate_ids = AlertService._alert_index.take_new_alerts()
+        for asset, old_price in moves:
+            # Seeded assets start at 0.0: treat it as an unknown previous price
+            previous = old_price if old_price else None
+            candidate_ids.extend(AlertService._alert_index.crossed(asset.ticker, previous, asset.price))
+            for alert_id, alert_type in AlertService._alert_index.statistic_alerts(asset.ticker).items():
+                if alert_type == ALERT_TYPE_MONTH_LOW and asset.price <= asset.min_month_price:
+                    candidate_ids.append(alert_id)
+                elif alert_type == ALERT_TYPE_MONTH_HIGH and asset.price >= asset.max_month_price:
+                    candidate_ids.append(alert_id)
+
+        if not candidate_ids:
+            return 0
+
+        alerts = Alert.query.filter(Alert.id.in_(set(candidate_ids))).all()
+        return sum(AlertService.check_alert(app, alert) for alert in alerts)
+
+    @staticmethod
+    def trigger_distance(asset):
+        """
+        Relative distance of an asset price to its closest alert trigger: the nearest PriceBelow/PriceAbove threshold,
+        and the month low/high when the asset has MonthMinimum/MonthMaximum alerts.
+
+        return - Distance in percent of the current price, None when the asset has no alerts or no price yet
+        """
+        if not asset.price:
+            return None
+        AlertService._ensure_index_loaded()
+
+        triggers = []
+        threshold = AlertService._alert_index.nearest_threshold(asset.ticker, asset.price)
+        if threshold is not None:
+            triggers.append(threshold)
+        for alert_type in set(AlertService._alert_index.statistic_alerts(asset.ticker).values()):
+            if alert_type == ALERT_TYPE_MONTH_LOW and asset.min_month_price:
+                triggers.append(asset.min_month_price)
+            elif alert_type == ALERT_TYPE_MONTH_HIGH and asset.max_month_price:
+                triggers.append(asset.max_month_price)
+        if not triggers:
+            return None
+        return min(abs(asset.price - trigger) for trigger in triggers) / asset.price * 100
+
+    @staticmethod
+    def index_alert(alert_id, ticker, alert_type, price_threshold):
+        if AlertService._alert_index.loaded:
+            AlertService._alert_index.add(alert_id, ticker, alert_type, price_threshold)
+
+    @staticmethod
+    def unindex_alert(alert_id):
+        AlertService._alert_index.remove(alert_id)
+
+    @staticmethod
+    def unindex_ticker(ticker):
+        AlertService._alert_index.remove_ticker(ticker)
+
+    @staticmethod
+    def mark_alerts_changed(session):
+        """
+        Record that alerts changed, in the caller's transaction. Processes holding an alert index
+        (e.g. the worker running the price jobs) rebuild it on their next refresh_alert_index().
+        """
+        AppState.set_value(session, ALERTS_VERSION_STATE_KEY, uuid.uuid4().hex)
+
+    @staticmethod
+    def refresh_alert_index():
+        """
+        Rebuild the alert index only when alerts changed since it was built, possibly in another process.
+
+        return - True when the index was rebuilt
+        """
+        version = AppState.get_value(db.session, ALERTS_VERSION_STATE_KEY)
+        if AlertService._alert_index.loaded and version == AlertService._index_version:
+            return False
+        AlertService.rebuild_alert_index()
+        return True
+
+    @staticmethod
+    def rebuild_alert_index():
+        """
+        Load every alert threshold into the index with a single column projection query.
+        """
+        # Read the version first: a change committed during the rebuild triggers another one
+        version = AppState.get_value(db.session, ALERTS_VERSION_STATE_KEY)
+        rows = db.session.query(Alert.id, Alert.ticker, Alert.alert_type, Alert.price_threshold).all()
+        AlertService._alert_index.rebuild(rows)
+        AlertService._index_version = version
+        logger.info(f"Alert index rebuilt with {len(rows)} alerts")
+
+    @staticmethod
+    def _ensure_index_loaded():
+        if not AlertService._alert_index.loaded:
+            AlertService.rebuild_alert_index()
+
+
+def evaluate_alert_rules(asset_tickers, prices, minimums, maximums, alert_tickers, alert_types, thresholds, previous_prices=None):
+    """
+    Compute which alerts trigger, for every alert at once.
+
+    asset_tickers, prices, minimums, maximums - Arrays describing assets, one position per asset
+    alert_tickers, alert_types, thresholds - Arrays describing alerts, one position per alert (NaN threshold when not used)
+    previous_prices - Optional array of asset prices before the update (NaN when unknown). PriceBelow/PriceAbove alerts
+    then only trigger when their condition holds at the new price but did not at the previous one.
+    return - Boolean mask over alerts, True where the alert condition holds
+    """
+    # Join alerts to assets by ticker with a binary search over the sorted asset tickers
+    order = np.argsort(asset_tickers)
+    sorted_tickers = asset_tickers[order]
+    positions = np.clip(np.searchsorted(sorted_tickers, alert_tickers), 0, len(sorted_tickers) - 1)
+    has_asset = sorted_tickers[positions] == alert_tickers
+    asset_positions = order[positions]
+
+    price = prices[asset_positions]
+    codes = np.full(len(alert_types), -1)
+    for alert_type, code in _ALERT_TYPE_CODES.items():
+        codes[alert_types == alert_type] = code
+
+    # Comparisons against NaN are False, so alerts without threshold or statistics never trigger
+    month_low = (codes == _ALERT_TYPE_CODES[ALERT_TYPE_MONTH_LOW]) & (price <= minimums[asset_positions])
+    month_high = (codes == _ALERT_TYPE_CODES[ALERT_TYPE_MONTH_HIGH]) & (price >= maximums[asset_positions])
+    below = (codes == _ALERT_TYPE_CODES[ALERT_TYPE_PRICE_BELOW]) & (price <= thresholds)
+    above = (codes == _ALERT_TYPE_CODES[ALERT_TYPE_PRICE_ABOVE]) & (price >= thresholds)
+    if previous_prices is not None:
+        previous = previous_prices[asset_positions]
+        below &= ~(previous <= thresholds)
+        above &= ~(previous >= thresholds)
+    return has_asset & (month_low | month_high | below | above)
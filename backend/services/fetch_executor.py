@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _ChunkCall:
+    def __init__(self, chunk, start_deadline):
+        self.chunk = chunk
+        self.start_deadline = start_deadline  # monotonic time by which the call must have left the queue
+        self.started_at = None
+        self.future = None
+
+
+class FetchExecutor:
+    """
+    Runs provider requests for chunks of tickers on a shared, bounded thread pool.
+
+    At most max_concurrency requests are in flight per process (default 1, for providers that cannot serve
+    overlapping calls). A chunk that raises or runs longer than
+    call_timeout seconds only fails its own tickers: the caller gets the results of every other chunk
+    plus an error message per failed ticker, so one delisted symbol or stalled request no longer fails
+    the whole fetch. A timed out request is abandoned, its thread is freed once the provider call returns.
+    A chunk still queued behind other requests (e.g. an abandoned one) past its start deadline is cancelled
+    and fails the same way, so no caller waits on the pool without a deadline.
+    """
+
+    def __init__(self, max_concurrency=1, call_timeout=30):
+        self.max_concurrency = max_concurrency
+        self.call_timeout = call_timeout
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+        self._calls = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    def configure(self, max_concurrency=None, call_timeout=None):
+        with self._lock:
+            if max_concurrency is not None and int(max_concurrency) != self.max_concurrency:
+                self.max_concurrency = max(1, int(max_concurrency))
+                if self._pool is not None and self._pid == os.getpid():
+                    self._pool.shutdown(wait=False)
+                self._pool = None  # rebuilt with the new size on next use
+            if call_timeout is not None:
+                self.call_timeout = float(call_timeout)
+
+    def map_chunks(self, func, chunks):
+        """
+        Call func(chunk) for every chunk of tickers, concurrently.
+
+        func - Callable taking a list of tickers and returning a dictionary ticker -> result
+        chunks - List of ticker lists
+        return - (results, errors): merged dictionary ticker -> result of the chunks that succeeded,
+        and dictionary ticker -> error message for the tickers of the chunks that failed or timed out
+        """
+        # Chunk i may wait for the chunks of this call ahead of it, plus one request already holding the threads
+        submitted_at = time.monotonic()
+        chunks = [chunk for chunk in chunks if chunk]
+        calls = [_ChunkCall(chunk, submitted_at + (position // self.max_concurrency + 1) * self.call_timeout)
+                 for position, chunk in enumerate(chunks)]
+        if not calls:
+            return {}, {}
+        pool = self._get_pool()
+        for call in calls:
+            call.future = pool.submit(self._run, func, call)
+
+        results, errors = {}, {}
+        pending = {call.future: call for call in calls}
+        while pending:
+            done, _ = wait(pending, timeout=self._next_deadline(pending.values()), return_when=FIRST_COMPLETED)
+            for future in done:
+                call = pending.pop(future)
+                try:
+                    results.update(future.result())
+                except Exception as exc:
+                    logger.error(f"Fetch failed for tickers {call.chunk}: {exc}")
+                    self._count("_failed")
+                    errors.update({ticker: str(exc) for ticker in call.chunk})
+            now = time.monotonic()
+            for future, call in list(pending.items()):
+                if call.started_at is not None and now - call.started_at >= self.call_timeout:
+                    pending.pop(future)
+                    logger.error(f"Fetch timed out after {self.call_timeout}s for tickers {call.chunk}")
+                    self._count("_timed_out")
+                    errors.update({ticker: f"timed out after {self.call_timeout}s" for ticker in call.chunk})
+                elif call.started_at is None and now >= call.start_deadline and future.cancel():
+                    pending.pop(future)
+                    logger.error(f"Fetch for tickers {call.chunk} not started before its deadline, provider busy")
+                    self._count("_timed_out")
+                    errors.update({ticker: "timed out waiting for a busy provider" for ticker in call.chunk})
+        return results, errors
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "calls": self._calls,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+            }
+
+    def _run(self, func, call):
+        call.started_at = time.monotonic()
+        self._count("_calls")
+        return func(call.chunk)
+
+    def _next_deadline(self, calls):
+        """
+        Seconds until the earliest running call times out or queued call reaches its start deadline.
+        """
+        deadlines = [call.started_at + self.call_timeout if call.started_at is not None else call.start_deadline for call in calls]
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _get_pool(self):
+        with self._lock:
+            # A forked process (e.g. gunicorn worker) does not inherit the parent's threads
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="provider-fetch")
+                self._pid = os.getpid()
+            return self._pool
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
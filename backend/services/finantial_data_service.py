@@ -1,30 +1,184 @@
 import statistics
+import threading
+import warnings
 
+import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
 import logging
 
+from .fetch_executor import FetchExecutor
+from .fx_rate_cache import FxRateCache
+from .quote_cache import QuoteCache
+from .request_coalescer import RequestCoalescer
+
 logger = logging.getLogger(__name__)
 
 class FinancialDataService:
 
+    # Shared by every caller in the process: routes, Telegram commands and scheduler jobs.
+    # Identical provider requests issued concurrently by several threads are merged into one.
+    _coalescer = RequestCoalescer()
+    _quote_cache = QuoteCache()
+    _fx_rate_cache = FxRateCache(coalescer=_coalescer)
+    # Quote chunks run one at a time on the executor, which only isolates failures and enforces the call timeout
+    _fetch_executor = FetchExecutor(max_concurrency=1)
+    # yf.download keeps its results in module globals (yfinance.shared), so two downloads must never overlap
+    _download_lock = threading.Lock()
+    _download_threads = 4
+    _quote_batch_size = 50
+
+    @staticmethod
+    def configure(app):
+        """
+        Apply provider related settings from the Flask configuration.
+
+        QUOTE_CACHE_TTL - Seconds a cached quote is considered fresh (default 60)
+        QUOTE_CACHE_MAX_SIZE - Maximum number of tickers kept in the quote cache (default 512)
+        FX_RATE_CACHE_TTL - Seconds a cached exchange rate is considered fresh (default 300)
+        FX_RATE_CACHE_PAIR_TTLS - Optional per pair TTL overrides e.g. {"USD/MXN": 120}
+        FX_RATE_RETRY_AFTER - Seconds a pair is not requested again after a failed refresh (default 30)
+        QUOTE_BATCH_CHUNK_SIZE - Maximum number of tickers requested in a single bulk quote download (default 50)
+        FETCH_MAX_CONCURRENCY - Maximum number of ticker requests in flight within one bulk download (default 4)
+        FETCH_CALL_TIMEOUT - Seconds before a quote download is abandoned and its tickers reported as failed,
+        also the longest a download waits for the provider to be free (default 30)
+        """
+        FinancialDataService._quote_batch_size = max(1, int(app.config.get("QUOTE_BATCH_CHUNK_SIZE", 50)))
+        FinancialDataService._download_threads = max(1, int(app.config.get("FETCH_MAX_CONCURRENCY", 4)))
+        FinancialDataService._fetch_executor.configure(call_timeout=app.config.get("FETCH_CALL_TIMEOUT", 30))
+        FinancialDataService._quote_cache.configure(
+            ttl_seconds=app.config.get("QUOTE_CACHE_TTL", 60),
+            max_size=app.config.get("QUOTE_CACHE_MAX_SIZE", 512),
+        )
+        FinancialDataService._fx_rate_cache.configure(
+            ttl_seconds=app.config.get("FX_RATE_CACHE_TTL", 300),
+            pair_ttls=app.config.get("FX_RATE_CACHE_PAIR_TTLS", {}),
+            retry_after_seconds=app.config.get("FX_RATE_RETRY_AFTER", 30),
+        )
+
+    @staticmethod
+    def cache_stats():
+        """
+        Get hit/miss counters of the provider caches, e.g. for the /api/metrics endpoint
+        """
+        return {
+            "quote_cache": FinancialDataService._quote_cache.stats(),
+            "fx_rate_cache": FinancialDataService._fx_rate_cache.stats(),
+            "coalesced_requests": FinancialDataService._coalescer.stats(),
+            "fetch_executor": FinancialDataService._fetch_executor.stats(),
+        }
+
+    @staticmethod
+    def quote_batch_size():
+        """
+        Maximum number of tickers requested in a single bulk quote download (QUOTE_BATCH_CHUNK_SIZE)
+        """
+        return FinancialDataService._quote_batch_size
+
     @staticmethod
-    def latest_prices(tickers=[], conversion="USD/MXN"):
+    def latest_prices(tickers=[], conversion="USD/MXN", errors=None, max_age=None):
         """
         Get the latest prices for a list of tickers
         
         tickers should be provided as a list of strings e.g. ["AAPL", "GOOGL", "MSFT"]
+        Quotes are served from the shared quote cache when fresh; only missing tickers are requested to the provider.
+        errors - Optional dictionary filled with ticker -> error message for the tickers that could not be priced
+        max_age - Optional maximum age in seconds of the cached quotes served; 0 requests every ticker to the provider
+                  and refreshes the cache with the answer
+        return - Prices of the tickers that could be priced; a failed ticker (e.g. delisted) is left out instead of failing the others.
+                 "converted_price" is None when no exchange rate is known for the conversion pair.
         """
         ticker_list = [ticker.strip() for ticker in tickers]
         
         try:
-            indexed_prices = yf.Tickers(ticker_list)
-            conversion_rate = FinancialDataService.exchange_rate(conversion)
-            prices = {ticker: {"original_price": indexed_prices.tickers[ticker].info['regularMarketPrice'], "converted_price": round(indexed_prices.tickers[ticker].info['regularMarketPrice'] * conversion_rate['rate'], 2)} for ticker in ticker_list}
+            quotes, missing = FinancialDataService._quote_cache.get_many(ticker_list, max_age)
+            if missing:
+                fetched, failed = FinancialDataService._coalescer.run(
+                    ("quotes", tuple(sorted(missing))),
+                    lambda: FinancialDataService._fetch_quotes(missing),
+                )
+                FinancialDataService._quote_cache.put_many(fetched)
+                quotes.update(fetched)
+                if failed:
+                    logger.warning(f"No price for tickers {sorted(failed)}")
+                    if errors is not None:
+                        errors.update(failed)
+            rate = FinancialDataService._conversion_rate(conversion)
+            prices = {ticker: {"original_price": quotes[ticker], "converted_price": round(quotes[ticker] * rate, 2) if rate is not None else None} for ticker in ticker_list if ticker in quotes}
             return prices
         except Exception as e:
             logger.error(f"Error fetching prices for tickers {ticker_list}: {e}")
             raise e
+
+    @staticmethod
+    def _conversion_rate(pair):
+        """
+        return - The rate of a currency pair, or None when it is unknown; an exchange rate outage must not fail pricing
+        """
+        try:
+            return FinancialDataService.exchange_rate(pair).get("rate")
+        except Exception as e:
+            logger.warning(f"No exchange rate for {pair}, serving unconverted prices: {e}")
+            return None
+
+    @staticmethod
+    def _fetch_quotes(ticker_list):
+        """
+        Request last prices to the provider, bypassing the quote cache
+
+        Prices are taken from the latest daily bar of a bulk download, in chunks of QUOTE_BATCH_CHUNK_SIZE tickers,
+        instead of one quote-summary (.info) request per ticker. A chunk failing or exceeding FETCH_CALL_TIMEOUT
+        only fails its own tickers.
+
+        return - (quotes, errors): dictionary ticker -> last price, and dictionary ticker -> error message
+        for the tickers without price
+        """
+        chunk_size = FinancialDataService._quote_batch_size
+        chunks = [ticker_list[start:start + chunk_size] for start in range(0, len(ticker_list), chunk_size)]
+        quotes, errors = FinancialDataService._fetch_executor.map_chunks(FinancialDataService._fetch_chunk_quotes, chunks)
+
+        for ticker in ticker_list:
+            if ticker not in quotes and ticker not in errors:
+                errors[ticker] = "No price data returned"
+        return quotes, errors
+
+    @staticmethod
+    def _fetch_chunk_quotes(chunk):
+        timeout = FinancialDataService._fetch_executor.call_timeout
+        bars = FinancialDataService._download(chunk, period="5d", interval="1d", auto_adjust=False, progress=False, timeout=timeout)
+        return FinancialDataService._last_prices_from_bars(bars, chunk)
+
+    @staticmethod
+    def _download(ticker_list, **kwargs):
+        """
+        yf.download serialized process wide: yfinance resets and fills the module global yfinance.shared dictionaries
+        on every call, so overlapping downloads would overwrite each other's results.
+        The tickers of one download are still requested in parallel, by FETCH_MAX_CONCURRENCY threads.
+        Waiting for the lock is bounded by FETCH_CALL_TIMEOUT: a download abandoned after its timeout may hold it
+        until the provider answers, and must not block every later caller with it.
+        """
+        timeout = FinancialDataService._fetch_executor.call_timeout
+        if not FinancialDataService._download_lock.acquire(timeout=timeout):
+            raise TimeoutError(f"Provider busy: another download still running after {timeout}s")
+        try:
+            return yf.download(ticker_list, threads=FinancialDataService._download_threads, **kwargs)
+        finally:
+            FinancialDataService._download_lock.release()
+
+    @staticmethod
+    def _last_prices_from_bars(bars, ticker_list):
+        """
+        Extract the last known close of each ticker from a bulk download with (field, ticker) columns
+        """
+        if bars is None or bars.empty or "Close" not in bars.columns.get_level_values(0):
+            return {}
+        last_closes = bars["Close"].ffill().iloc[-1]
+        prices = {}
+        for ticker in ticker_list:
+            price = last_closes.get(ticker.upper())
+            if price is not None and price == price:  # skip NaN
+                prices[ticker] = float(price)
+        return prices
         
     @staticmethod
     def exchange_rate(pair="USD/MXN"):
@@ -32,23 +186,30 @@ class FinancialDataService:
         Get the latest exchange rate for a currency pair
         
         pair - Valid exchange rate symbol. Should be provided as a string in the format "BASE/QUOTE" e.g. "USD/EUR"
-        return - A dictionary containing the exchange rate information, or an empty dictionary if no data found
+        return - A dictionary containing the exchange rate information, or an empty dictionary if no data found.
+                 "stale" is True when the provider failed and the last known rate is served instead.
         """
         if '/' not in pair:
             raise ValueError("Invalid currency pair format. Use 'BASE/QUOTE' format.")
         
         try:
-            exchange_rate = yf.Lookup(pair).currency
-            if not exchange_rate.empty:
-                shortName = exchange_rate["shortName"].values[0]
-                rate = exchange_rate["regularMarketPrice"].values[0]
-                return {"exchange_rate": shortName, "rate": rate}
-            else:
-                return {}  # Return empty dictionary if no data found
+            return FinancialDataService._fx_rate_cache.get(pair, lambda: FinancialDataService._fetch_exchange_rate(pair))
         except Exception as e:
-            logger.error(f"Fetched object: {exchange_rate}")
             logger.error(f"Error fetching exchange rate for pair {pair}: {e}")
             raise e
+
+    @staticmethod
+    def _fetch_exchange_rate(pair):
+        """
+        Request an exchange rate to the provider, bypassing the rate cache
+        """
+        exchange_rate = yf.Lookup(pair).currency
+        if not exchange_rate.empty:
+            shortName = exchange_rate["shortName"].values[0]
+            rate = exchange_rate["regularMarketPrice"].values[0]
+            return {"exchange_rate": shortName, "rate": rate}
+        else:
+            return {}  # Return empty dictionary if no data found
         
     @staticmethod
     def historical_tickers_prices(ticker_list, period="1d", interval="15m"):
@@ -62,19 +223,53 @@ class FinancialDataService:
         return - A Grouped dataframe containing date and closing price
         """
         try:    
-            historical_prices = yf.download(ticker_list, period=period, interval=interval)
-            clean_prices = historical_prices.drop(columns=["Volume"], level=0)
-            clean_prices = clean_prices.stack(level=1)
-            clean_prices = clean_prices.reset_index()
-            clean_prices = clean_prices.rename(columns={"level_1": "Ticker"})
-            clean_prices["Date"] = clean_prices["Date"].dt.strftime('%d-%m-%Y')
-            # clean_prices
-            grouped = clean_prices.groupby("Ticker")
-            return grouped
+            historical_prices = FinancialDataService._download_history(ticker_list, period, interval)
+            return FinancialDataService._group_prices_by_ticker(historical_prices)
         except Exception as e:
             logger.error(f"Error fetching historical prices for tickers {ticker_list}: {e}")
             raise e
 
+    @staticmethod
+    def _download_history(ticker_list, period, interval):
+        return FinancialDataService._coalescer.run(
+            ("history", tuple(sorted(ticker_list)), period, interval),
+            lambda: FinancialDataService._download(ticker_list, period=period, interval=interval),
+        )
+
+    @staticmethod
+    def _group_prices_by_ticker(historical_prices):
+        """
+        Reshape a provider dataframe with (field, ticker) columns into one group of dated rows per ticker
+        """
+        clean_prices = historical_prices.drop(columns=["Volume"], level=0)
+        clean_prices = clean_prices.stack(level=1)
+        clean_prices = clean_prices.reset_index()
+        clean_prices = clean_prices.rename(columns={"level_1": "Ticker"})
+        clean_prices["Date"] = clean_prices["Date"].dt.strftime('%d-%m-%Y')
+        # clean_prices
+        grouped = clean_prices.groupby("Ticker")
+        return grouped
+
+
+    @staticmethod
+    def historical_bars(ticker_list, start, interval="1d"):
+        """
+        Get raw OHLC bars for a list of tickers starting at a given date
+        
+        tickers - List of stock ticker symbols as strings e.g. ["AAPL", "GOOGL"]
+        start - First date (inclusive) to fetch, as date or "YYYY-MM-DD" string
+        interval - Data interval (e.g. "1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d", "5d", "1wk", "1mo")
+        
+        return - The provider dataframe indexed by date with (field, ticker) columns
+        """
+        try:
+            return FinancialDataService._coalescer.run(
+                ("bars", tuple(sorted(ticker_list)), str(start), interval),
+                lambda: FinancialDataService._download(ticker_list, start=start, interval=interval, progress=False),
+            )
+        except Exception as e:
+            logger.error(f"Error fetching bars since {start} for tickers {ticker_list}: {e}")
+            raise e
 
     @staticmethod
     def statistics_in_period(ticker_list, period="1mo", interval="1d"):
@@ -87,15 +282,52 @@ class FinancialDataService:
         
         return - A dictionary with tickers and their respective statistics
         """
-        prices_in_period = FinancialDataService.historical_tickers_prices(ticker_list, period, interval) 
+        try:
+            historical_prices = FinancialDataService._download_history(ticker_list, period, interval)
+        except Exception as e:
+            logger.error(f"Error fetching historical prices for tickers {ticker_list}: {e}")
+            raise e
+        return FinancialDataService._statistics_from_bars(historical_prices)
+
+    @staticmethod
+    def _statistics_from_bars(historical_prices):
+        """
+        Compute per ticker statistics straight from the (field, ticker) column blocks of a provider dataframe.
+
+        Each field block is a (time x ticker) matrix, so every statistic is a single NumPy reduction along the
+        time axis instead of reshaping rows and looping over groups.
+        """
+        if historical_prices is None or historical_prices.empty:
+            return {}
+
+        closes = historical_prices["Close"]
+        tickers = list(closes.columns)
+        close = closes.to_numpy(dtype=float)
+        low = historical_prices["Low"].reindex(columns=tickers).to_numpy(dtype=float)
+        high = historical_prices["High"].reindex(columns=tickers).to_numpy(dtype=float)
+
+        valid = ~np.isnan(close)
+        has_data = valid.any(axis=0)
+        # Row of the last non-NaN close of every column
+        last_rows = close.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+        last_close = close[last_rows, np.arange(close.shape[1])]
+
+        with warnings.catch_warnings():
+            # All-NaN columns (no data for a ticker) and single bar std are expected, they produce NaN
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            minimum = np.nanmin(low, axis=0)
+            maximum = np.nanmax(high, axis=0)
+            average = np.nanmean(close, axis=0)
+            volatility = np.nanstd(close, axis=0, ddof=1)
+
         statistics = {}
-        for ticker, group in prices_in_period:
-            statistics[ticker] = {
-                    "previous_price": round(group["Close"].iloc[-1], 2),
-                    "minimum": round(group["Low"].min(), 2),
-                    "maximum": round(group["High"].max(), 2),
-                    "average": round(group["Close"].mean(), 2),
-                    "volatility": round(group["Close"].std(), 2)
+        for position in np.flatnonzero(has_data):
+            statistics[tickers[position]] = {
+                    "previous_price": round(float(last_close[position]), 2),
+                    "minimum": round(float(minimum[position]), 2),
+                    "maximum": round(float(maximum[position]), 2),
+                    "average": round(float(average[position]), 2),
+                    "volatility": round(float(volatility[position]), 2)
                 }
         
         return statistics
@@ -113,45 +345,55 @@ class FinancialDataService:
         return - A dictionary containing min_price_in_period, max_price_in_period and avg_price_in_period
         """
         try:
-            ticker_data = yf.Ticker(ticker)
-            recent_history = ticker_data.history(period=period, interval=interval)
-            return { "ticker": ticker_data.ticker,
-               ## Asset General info
-               "displayed_name": ticker_data.info['shortName'],
-               "sector": ticker_data.info['sector'] if 'sector' in ticker_data.info else None,
-               "industry": ticker_data.info['industry'] if 'industry' in ticker_data.info else None,
-               "currency": ticker_data.info['currency'] if 'currency' in ticker_data.info else "",
-                ## Volume statistics
-                'volume': ticker_data.info['volume'] if 'volume' in ticker_data.info else None,
-                'averageVolume': ticker_data.info['averageVolume'] if 'averageVolume' in ticker_data.info else None,
-                'averageVolume10days': ticker_data.info['averageVolume10days'] if 'averageVolume10days' in ticker_data.info else None,
-                'averageDailyVolume10Day': ticker_data.info['averageDailyVolume10Day'] if 'averageDailyVolume10Day' in ticker_data.info else None,
-                'bid': ticker_data.info['bid'] if 'bid' in ticker_data.info else None,
-                'bidSize': ticker_data.info['bidSize'] if 'bidSize' in ticker_data.info else None,
-                'ask': ticker_data.info['ask'] if 'ask' in ticker_data.info else None,
-                'askSize': ticker_data.info['askSize'] if 'askSize' in ticker_data.info else None,
-                ## Price statistics 
-               "previous_price": ticker_data.info['previousClose'],
-                "current_price": ticker_data.info['regularMarketPrice'],
-                "min_price_in_period": round(recent_history["Low"].min(), 2),
-                "max_price_in_period": round(recent_history["High"].max(), 2),
-                "avg_price_in_period": round(recent_history["Close"].mean(), 2),
-                "50DayAverage": ticker_data.info['fiftyDayAverage'] if 'fiftyDayAverage' in ticker_data.info else None,
-                "200DayAverage": ticker_data.info['twoHundredDayAverage'] if 'twoHundredDayAverage' in ticker_data.info else None,
-                "price_change": round(ticker_data.info['regularMarketPrice'] - ticker_data.info['previousClose'], 2),
-                "price_change_percent": round((ticker_data.info['regularMarketPrice'] - ticker_data.info['previousClose']) / ticker_data.info['previousClose'] * 100, 3),
-                "52wkLow": ticker_data.info['fiftyTwoWeekLow'] if 'fiftyTwoWeekLow' in ticker_data.info else None,
-                "52wkHigh": ticker_data.info['fiftyTwoWeekHigh'] if 'fiftyTwoWeekHigh' in ticker_data.info else None,
-                "allTimeHigh": ticker_data.info['allTimeHigh'] if 'allTimeHigh' in ticker_data.info else None,
-                "allTimeLow": ticker_data.info['allTimeLow'] if 'allTimeLow' in ticker_data.info else None,
-                "targetHighPrice": ticker_data.info['targetHighPrice'] if 'targetHighPrice' in ticker_data.info else None,
-                "targetLowPrice": ticker_data.info['targetLowPrice'] if 'targetLowPrice' in ticker_data.info else None,
-                "targetMeanPrice": ticker_data.info['targetMeanPrice'] if 'targetMeanPrice  ' in ticker_data.info else None,
-                "targetMedianPrice": ticker_data.info['targetMedianPrice'] if 'targetMedianPrice' in ticker_data.info else None
-              }
+            return FinancialDataService._coalescer.run(
+                ("info", ticker, period, interval),
+                lambda: FinancialDataService._fetch_ticker_info(ticker, period, interval),
+            )
         except Exception as e:
             logger.error(f"Error fetching statistics for ticker {ticker}: {e}")
             raise e
+
+    @staticmethod
+    def _fetch_ticker_info(ticker, period, interval):
+        """
+        Request ticker information and recent history to the provider
+        """
+        ticker_data = yf.Ticker(ticker)
+        recent_history = ticker_data.history(period=period, interval=interval)
+        return { "ticker": ticker_data.ticker,
+           ## Asset General info
+           "displayed_name": ticker_data.info['shortName'],
+           "sector": ticker_data.info['sector'] if 'sector' in ticker_data.info else None,
+           "industry": ticker_data.info['industry'] if 'industry' in ticker_data.info else None,
+           "currency": ticker_data.info['currency'] if 'currency' in ticker_data.info else "",
+            ## Volume statistics
+            'volume': ticker_data.info['volume'] if 'volume' in ticker_data.info else None,
+            'averageVolume': ticker_data.info['averageVolume'] if 'averageVolume' in ticker_data.info else None,
+            'averageVolume10days': ticker_data.info['averageVolume10days'] if 'averageVolume10days' in ticker_data.info else None,
+            'averageDailyVolume10Day': ticker_data.info['averageDailyVolume10Day'] if 'averageDailyVolume10Day' in ticker_data.info else None,
+            'bid': ticker_data.info['bid'] if 'bid' in ticker_data.info else None,
+            'bidSize': ticker_data.info['bidSize'] if 'bidSize' in ticker_data.info else None,
+            'ask': ticker_data.info['ask'] if 'ask' in ticker_data.info else None,
+            'askSize': ticker_data.info['askSize'] if 'askSize' in ticker_data.info else None,
+            ## Price statistics 
+           "previous_price": ticker_data.info['previousClose'],
+            "current_price": ticker_data.info['regularMarketPrice'],
+            "min_price_in_period": round(recent_history["Low"].min(), 2),
+            "max_price_in_period": round(recent_history["High"].max(), 2),
+            "avg_price_in_period": round(recent_history["Close"].mean(), 2),
+            "50DayAverage": ticker_data.info['fiftyDayAverage'] if 'fiftyDayAverage' in ticker_data.info else None,
+            "200DayAverage": ticker_data.info['twoHundredDayAverage'] if 'twoHundredDayAverage' in ticker_data.info else None,
+            "price_change": round(ticker_data.info['regularMarketPrice'] - ticker_data.info['previousClose'], 2),
+            "price_change_percent": round((ticker_data.info['regularMarketPrice'] - ticker_data.info['previousClose']) / ticker_data.info['previousClose'] * 100, 3),
+            "52wkLow": ticker_data.info['fiftyTwoWeekLow'] if 'fiftyTwoWeekLow' in ticker_data.info else None,
+            "52wkHigh": ticker_data.info['fiftyTwoWeekHigh'] if 'fiftyTwoWeekHigh' in ticker_data.info else None,
+            "allTimeHigh": ticker_data.info['allTimeHigh'] if 'allTimeHigh' in ticker_data.info else None,
+            "allTimeLow": ticker_data.info['allTimeLow'] if 'allTimeLow' in ticker_data.info else None,
+            "targetHighPrice": ticker_data.info['targetHighPrice'] if 'targetHighPrice' in ticker_data.info else None,
+            "targetLowPrice": ticker_data.info['targetLowPrice'] if 'targetLowPrice' in ticker_data.info else None,
+            "targetMeanPrice": ticker_data.info['targetMeanPrice'] if 'targetMeanPrice  ' in ticker_data.info else None,
+            "targetMedianPrice": ticker_data.info['targetMedianPrice'] if 'targetMedianPrice' in ticker_data.info else None
+          }
         
     @staticmethod
     def search_tickers(query, maximum_results=10):
@@ -163,7 +405,10 @@ class FinancialDataService:
         return - A list of dictionaries containing ticker symbol and short name
         """
         try:
-            search_results = yf.Search(query=query, max_results=maximum_results).quotes
+            search_results = FinancialDataService._coalescer.run(
+                ("search", query, maximum_results),
+                lambda: yf.Search(query=query, max_results=maximum_results).quotes,
+            )
             refined_results = []
             for result in search_results:
                 refined_results.append({
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+
+from .request_coalescer import RequestCoalescer
+
+logger = logging.getLogger(__name__)
+
+
+class FxRateCache:
+    """
+    Cache of exchange rates keyed by currency pair.
+
+    - Each pair expires after its own TTL (`pair_ttls`), or after `ttl_seconds` by default.
+    - Callers that miss at the same moment share a single in-flight fetch.
+    - When a refresh fails, the last known rate is served flagged with "stale": True.
+    - After a failed refresh the pair is not fetched again for `retry_after_seconds`: callers get the stale rate,
+      or the same error when no rate is known, without waiting on the failing provider.
+    """
+
+    def __init__(self, ttl_seconds=300, pair_ttls=None, clock=time.monotonic, coalescer=None, retry_after_seconds=30):
+        self._ttl_seconds = float(ttl_seconds)
+        self._pair_ttls = dict(pair_ttls or {})
+        self._retry_after_seconds = float(retry_after_seconds)
+        self._clock = clock
+        self._coalescer = coalescer or RequestCoalescer()
+        self._rates = {}  # pair -> (stored_at, rate payload)
+        self._failures = {}  # pair -> (failed_at, error) of the last failed refresh
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale_served = 0
+
+    def configure(self, ttl_seconds=None, pair_ttls=None, retry_after_seconds=None):
+        with self._lock:
+            if ttl_seconds is not None:
+                self._ttl_seconds = float(ttl_seconds)
+            if retry_after_seconds is not None:
+                self._retry_after_seconds = float(retry_after_seconds)
+            if pair_ttls is not None:
+                self._pair_ttls = dict(pair_ttls)
+
+    def get(self, pair, fetch):
+        """
+        Return the rate payload for a pair, calling `fetch()` only when the cached one expired.
+
+        pair - Currency pair as "BASE/QUOTE" string
+        fetch - Callable returning the provider payload, e.g. {"exchange_rate": "USD/MXN", "rate": 17.1}
+        return - The payload with an extra "stale" flag
+        """
+        with self._lock:
+            entry = self._rates.get(pair)
+            if entry is not None and self._clock() - entry[0] < self._ttl_for(pair):
+                self._hits += 1
+                return {**entry[1], "stale": False}
+            self._misses += 1
+            failure = self._failures.get(pair)
+            if failure is not None and self._clock() - failure[0] < self._retry_after_seconds:
+                if entry is None:
+                    raise failure[1]
+                self._stale_served += 1
+                return {**entry[1], "stale": True}
+
+        return self._coalescer.run(("fx_rate", pair), lambda: self._refresh(pair, fetch))
+
+    def invalidate(self, pair=None):
+        with self._lock:
+            if pair is None:
+                self._rates.clear()
+                self._failures.clear()
+            else:
+                self._rates.pop(pair, None)
+                self._failures.pop(pair, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale_served": self._stale_served,
+                "pairs": sorted(self._rates.keys()),
+                "ttl_seconds": self._ttl_seconds,
+                "failing_pairs": sorted(self._failures.keys()),
+            }
+
+    def _refresh(self, pair, fetch):
+        try:
+            payload = fetch()
+        except Exception as e:
+            with self._lock:
+                self._failures[pair] = (self._clock(), e)
+            last_known = self._last_known(pair)
+            if last_known is None:
+                raise
+            logger.warning(f"Serving stale exchange rate for {pair} after refresh failure: {e}")
+            return last_known
+
+        if not payload:
+            # Provider returned no data; keep whatever we knew before, if anything.
+            return self._last_known(pair) or {}
+
+        with self._lock:
+            self._rates[pair] = (self._clock(), payload)
+            self._failures.pop(pair, None)
+        return {**payload, "stale": False}
+
+    def _last_known(self, pair):
+        with self._lock:
+            entry = self._rates.get(pair)
+            if entry is None:
+                return None
+            self._stale_served += 1
+            return {**entry[1], "stale": True}
+
+    def _ttl_for(self, pair):
+        return float(self._pair_ttls.get(pair, self._ttl_seconds))
@@ -0,0 +1,203 @@
+from datetime import timedelta
+from concurrent.futures import wait
+import logging
+import threading
+import time
+
+from ..models.notification import Notification, NOTIFICATION_STATUS_PENDING, NOTIFICATION_STATUS_DELIVERED, NOTIFICATION_STATUS_FAILED
+from ..persistance.db_manager import db, get_db_session
+from ..utils.time_utils import now_cts_time
+from .telegram_service import TelegramService, TELEGRAM_MESSAGE_LIMIT, split_message
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationService:
+    """
+    Transactional outbox for Telegram notifications.
+
+    Alert evaluation only inserts rows (enqueue) inside its own transaction; drain() later sends the pending
+    rows in batches and marks them delivered, so sending throughput does not depend on evaluation.
+    A send still queued when the drain stops waiting is neither failed nor resent: its rows are skipped by later drains
+    until Telegram answers, then recorded like any other outcome.
+    """
+
+    _batch_size = 100
+    _max_attempts = 5
+    _send_timeout = 60
+    _retention_days = 7
+    _digest_enabled = True
+    # Only one drain per process at a time, so the periodic job and the price job never send a row twice
+    _drain_lock = threading.Lock()
+    _stats_lock = threading.Lock()
+    _stats = {"drains": 0, "delivered": 0, "failed_attempts": 0, "abandoned": 0, "late_outcomes": 0}
+    _in_flight = set()  # ids of notifications whose send outlived the drain that started it
+
+    @staticmethod
+    def configure(app):
+        """
+        Apply outbox settings from the Flask configuration.
+
+        NOTIFICATION_BATCH_SIZE - Pending rows sent per drain (default 100)
+        NOTIFICATION_MAX_ATTEMPTS - Failed sends before a row is marked failed (default 5)
+        NOTIFICATION_SEND_TIMEOUT - Seconds a drain waits for Telegram to accept its messages; slower sends are
+        recorded when they complete (default 60)
+        NOTIFICATION_RETENTION_DAYS - Days delivered rows are kept (default 7)
+        ALERT_DIGEST_ENABLED - Pack every pending row in as few messages as possible (default true)
+        """
+        NotificationService._batch_size = int(app.config.get("NOTIFICATION_BATCH_SIZE", 100))
+        NotificationService._max_attempts = int(app.config.get("NOTIFICATION_MAX_ATTEMPTS", 5))
+        NotificationService._send_timeout = float(app.config.get("NOTIFICATION_SEND_TIMEOUT", 60))
+        NotificationService._retention_days = int(app.config.get("NOTIFICATION_RETENTION_DAYS", 7))
+        NotificationService._digest_enabled = bool(app.config.get("ALERT_DIGEST_ENABLED", True))
+
+    @staticmethod
+    def enqueue(message, alert_id=None):
+        """
+        Add a pending notification to the current session. The caller commits it with its own transaction.
+        """
+        notification = Notification(alert_id=alert_id, message=message, status=NOTIFICATION_STATUS_PENDING,
+                                    attempts=0, created_at=now_cts_time())
+        db.session.add(notification)
+        return notification
+
+    @staticmethod
+    def drain(app):
+        """
+        Send pending notifications, oldest first, and record the outcome of each one.
+
+        return - Number of notifications delivered (0 when another drain is already running)
+        """
+        if not NotificationService._drain_lock.acquire(blocking=False):
+            return 0
+        try:
+            with app.app_context():
+                with NotificationService._stats_lock:
+                    in_flight = list(NotificationService._in_flight)
+                with get_db_session() as session:
+                    query = session.query(Notification.id, Notification.message).filter(Notification.status == NOTIFICATION_STATUS_PENDING)
+                    if in_flight:
+                        query = query.filter(~Notification.id.in_(in_flight))
+                    rows = query.order_by(Notification.id).limit(NotificationService._batch_size).all()
+                if not rows:
+                    return 0
+
+                # A long notification is split over several messages sharing the same ids
+                handles_of = {}  # notification ids -> handles of their messages
+                for ids, text in render_notifications(rows, NotificationService._digest_enabled):
+                    handles_of.setdefault(tuple(ids), []).append(TelegramService.send_message(app, text))
+
+                outcomes = {}  # notification id -> delivered
+                deadline = time.monotonic() + NotificationService._send_timeout
+                for ids, handles in handles_of.items():
+                    _, not_done = wait(handles, timeout=max(0.0, deadline - time.monotonic()))
+                    if not_done:
+                        NotificationService._record_when_sent(app, ids, handles)
+                        continue
+                    delivered = all(handle.result() for handle in handles)
+                    outcomes.update({notification_id: delivered for notification_id in ids})
+
+                return NotificationService._record(outcomes)
+        finally:
+            NotificationService._drain_lock.release()
+
+    @staticmethod
+    def stats():
+        """
+        Get drain counters, e.g. for the /api/metrics endpoint
+        """
+        with NotificationService._stats_lock:
+            stats = dict(NotificationService._stats)
+            stats["in_flight"] = len(NotificationService._in_flight)
+            return stats
+
+    @staticmethod
+    def _record_when_sent(app, ids, handles):
+        """
+        Keep notifications out of later drains until all their messages completed, then record the outcome.
+        Resending them now would duplicate a message Telegram may still accept.
+        """
+        logger.warning(f"Notifications {list(ids)} still sending after {NotificationService._send_timeout}s, recording them once sent")
+        with NotificationService._stats_lock:
+            NotificationService._in_flight.update(ids)
+        remaining = [len(handles)]
+        remaining_lock = threading.Lock()
+
+        def on_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            delivered = all(handle.result() for handle in handles)
+            try:
+                with app.app_context():
+                    NotificationService._record({notification_id: delivered for notification_id in ids})
+            except Exception as exc:
+                logger.error(f"Failed to record notifications {list(ids)}: {exc}")
+            finally:
+                with NotificationService._stats_lock:
+                    NotificationService._in_flight.difference_update(ids)
+                    NotificationService._stats["late_outcomes"] += len(ids)
+
+        for handle in handles:
+            handle.add_done_callback(on_done)
+
+    @staticmethod
+    def _record(outcomes):
+        if not outcomes:
+            return 0
+        delivered_ids = [notification_id for notification_id, delivered in outcomes.items() if delivered]
+        failed_ids = [notification_id for notification_id, delivered in outcomes.items() if not delivered]
+        now = now_cts_time()
+        abandoned = 0
+        with get_db_session() as session:
+            if delivered_ids:
+                session.query(Notification).filter(Notification.id.in_(delivered_ids)).update(
+                    {"status": NOTIFICATION_STATUS_DELIVERED, "delivered_at": now, "attempts": Notification.attempts + 1},
+                    synchronize_session=False,
+                )
+            if failed_ids:
+                session.query(Notification).filter(Notification.id.in_(failed_ids)).update(
+                    {"attempts": Notification.attempts + 1}, synchronize_session=False,
+                )
+                abandoned = session.query(Notification).filter(
+                    Notification.id.in_(failed_ids), Notification.attempts >= NotificationService._max_attempts,
+                ).update({"status": NOTIFICATION_STATUS_FAILED}, synchronize_session=False)
+            session.query(Notification).filter(
+                Notification.status == NOTIFICATION_STATUS_DELIVERED,
+                Notification.delivered_at < now - timedelta(days=NotificationService._retention_days),
+            ).delete(synchronize_session=False)
+
+        if failed_ids:
+            logger.warning(f"{len(failed_ids)} notifications could not be delivered, {abandoned} given up")
+        with NotificationService._stats_lock:
+            NotificationService._stats["drains"] += 1
+            NotificationService._stats["delivered"] += len(delivered_ids)
+            NotificationService._stats["failed_attempts"] += len(failed_ids)
+            NotificationService._stats["abandoned"] += abandoned
+        return len(delivered_ids)
+
+
+def render_notifications(rows, digest=True, limit=TELEGRAM_MESSAGE_LIMIT):
+    """
+    Turn pending notifications into Telegram message texts.
+
+    rows - List of (notification_id, message)
+    digest - Pack the notifications in as few messages as possible, headed by a count; otherwise one message each
+    return - List of (notification ids, text); a notification longer than `limit` is split across several texts
+    """
+    if not digest:
+        return [([notification_id], chunk) for notification_id, message in rows for chunk in split_message([message], limit)]
+
+    batches = []
+    ids, lines = [], [f"{len(rows)} alert(s) triggered:"]
+    length = len(lines[0])
+    for notification_id, message in rows:
+        if ids and length + 1 + len(message) > limit:
+            batches.append((ids, lines))
+            ids, lines, length = [], [], -1
+        ids.append(notification_id)
+        lines.append(message)
+        length += 1 + len(message)
+    batches.append((ids, lines))
+    return [(ids, chunk) for ids, lines in batches for chunk in split_message(lines, limit)]
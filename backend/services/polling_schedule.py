@@ -0,0 +1,80 @@
+import threading
+import time
+
+
+class PollingSchedule:
+    """
+    Next poll time of each ticker, derived from how close its price is to an alert trigger.
+
+    Tickers within `near_percent` of a trigger are polled every `min_seconds`, tickers at `far_percent` or further
+    (or without alerts) every `max_seconds`; the interval grows linearly in between.
+    """
+
+    def __init__(self, min_seconds=30, max_seconds=900, near_percent=1.0, far_percent=10.0, clock=time.monotonic):
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.near_percent = near_percent
+        self.far_percent = far_percent
+        self._clock = clock
+        self._next_poll = {}  # ticker -> (clock time, planned interval)
+        self._lock = threading.Lock()
+
+    def configure(self, min_seconds=None, max_seconds=None, near_percent=None, far_percent=None):
+        with self._lock:
+            if min_seconds is not None:
+                self.min_seconds = float(min_seconds)
+            if max_seconds is not None:
+                self.max_seconds = max(self.min_seconds, float(max_seconds))
+            if near_percent is not None:
+                self.near_percent = float(near_percent)
+            if far_percent is not None:
+                self.far_percent = max(self.near_percent, float(far_percent))
+
+    def interval_for(self, distance_percent, max_seconds=None):
+        """
+        Seconds until the next poll of a ticker at distance_percent from its nearest trigger (None: no trigger).
+        max_seconds optionally lowers the upper bound, e.g. to the ticker's polling tier interval.
+        """
+        upper = self.max_seconds if max_seconds is None else max(self.min_seconds, min(self.max_seconds, max_seconds))
+        if distance_percent is None or distance_percent >= self.far_percent:
+            return upper
+        if distance_percent <= self.near_percent:
+            return self.min_seconds
+        ratio = (distance_percent - self.near_percent) / (self.far_percent - self.near_percent)
+        return self.min_seconds + ratio * (upper - self.min_seconds)
+
+    def plan(self, ticker, distance_percent, max_seconds=None):
+        """
+        Set the next poll of a ticker.
+
+        return - Seconds until that poll
+        """
+        interval = self.interval_for(distance_percent, max_seconds)
+        with self._lock:
+            self._next_poll[ticker] = (self._clock() + interval, interval)
+        return interval
+
+    def is_due(self, ticker):
+        """
+        True when the ticker was never planned or its next poll time is reached. Polls are checked every min_seconds,
+        so a poll falling within the next half check is considered due now.
+        """
+        with self._lock:
+            planned = self._next_poll.get(ticker)
+            return planned is None or planned[0] <= self._clock() + self.min_seconds / 2
+
+    def forget(self, ticker):
+        with self._lock:
+            self._next_poll.pop(ticker, None)
+
+    def stats(self):
+        with self._lock:
+            intervals = [interval for _, interval in self._next_poll.values()]
+            now = self._clock()
+            return {
+                "tracked": len(intervals),
+                "at_min_interval": sum(1 for interval in intervals if interval <= self.min_seconds),
+                "at_max_interval": sum(1 for interval in intervals if interval >= self.max_seconds),
+                "avg_interval_seconds": round(sum(intervals) / len(intervals), 1) if intervals else 0.0,
+                "next_poll_in_seconds": round(max(0.0, min(at for at, _ in self._next_poll.values()) - now), 1) if intervals else None,
+            }
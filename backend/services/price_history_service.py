@@ -0,0 +1,259 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+import logging
+
+from sqlalchemy import and_, func
+
+from ..models.price_bar import PriceBar
+from ..persistance.db_manager import db
+from .finantial_data_service import FinancialDataService
+from .rolling_statistics import RollingStatisticsEngine, parse_window
+from ..utils.market_calendar import trading_date
+
+logger = logging.getLogger(__name__)
+
+### Quick testing in flask shell
+# from backend.services.price_history_service import PriceHistoryService
+# PriceHistoryService.backfill(["AAPL", "VWO"])
+# PriceHistoryService.statistics_in_window(["AAPL", "VWO"])
+# PriceHistoryService.seed_rolling_windows(["AAPL", "VWO"])
+# PriceHistoryService.rolling_statistics("AAPL")
+
+class PriceHistoryService:
+
+    """
+    Local store of OHLC bars (price_bar table) kept up to date with incremental backfills.
+
+    Methods work on the current db.session and never commit; callers run them inside get_db_session().
+    Rolling min/max/mean windows per ticker are kept in memory, seeded from the store and extended with live ticks.
+    """
+
+    _rolling_engine = RollingStatisticsEngine()
+    _month_window = "30d"
+
+    @staticmethod
+    def configure(app):
+        """
+        Apply rolling statistics settings from the Flask configuration.
+
+        ROLLING_WINDOWS - Comma separated window labels in days or weeks e.g. "30d,90d,52w" (default "30d").
+        The price_bar store keeps, and a first backfill downloads, enough daily bars for the longest one
+        MONTH_STATS_WINDOW - Window feeding min/max/avg month prices of assets (default "30d")
+        """
+        labels = [label.strip() for label in str(app.config.get("ROLLING_WINDOWS", "30d")).split(",") if label.strip()]
+        month_window = str(app.config.get("MONTH_STATS_WINDOW", "30d")).strip()
+        if month_window not in labels:
+            labels.append(month_window)
+        PriceHistoryService._rolling_engine.configure({label: parse_window(label) for label in labels})
+        PriceHistoryService._month_window = month_window
+
+    @staticmethod
+    def history_days_required():
+        """
+        return - Days of bars the local store must keep to fill the longest rolling window
+        """
+        return PriceHistoryService._rolling_engine.longest_window.days + 1
+
+    @staticmethod
+    def month_window_days():
+        """
+        return - Length in days of the window feeding min/max/avg month prices
+        """
+        return parse_window(PriceHistoryService._month_window).days
+
+    @staticmethod
+    def seed_rolling_windows(tickers, interval="1d"):
+        """
+        Rebuild the rolling windows of the given tickers from the local store, in a single query.
+        """
+        window_start = _utc_now() - PriceHistoryService._rolling_engine.longest_window
+        rows = (
+            db.session.query(PriceBar.ticker, PriceBar.timestamp, PriceBar.low, PriceBar.high, PriceBar.close)
+            .filter(PriceBar.ticker.in_(tickers), PriceBar.interval == interval, PriceBar.timestamp >= window_start)
+            .order_by(PriceBar.ticker, PriceBar.timestamp)
+            .all()
+        )
+        bars_by_ticker = defaultdict(list)
+        for ticker, timestamp, low, high, close in rows:
+            bars_by_ticker[ticker].append((timestamp, low if low is not None else close, high if high is not None else close, close))
+        for ticker, bars in bars_by_ticker.items():
+            PriceHistoryService._rolling_engine.seed(ticker, bars)
+        return len(bars_by_ticker)
+
+    @staticmethod
+    def ensure_rolling_windows(tickers, interval="1d"):
+        """
+        Seed the rolling windows of the tickers this process has not seeded yet, e.g. in a web process
+        that does not run the scheduler jobs.
+
+        return - Number of tickers seeded
+        """
+        unseeded = [ticker for ticker in tickers if not PriceHistoryService._rolling_engine.is_seeded(ticker)]
+        if not unseeded:
+            return 0
+        return PriceHistoryService.seed_rolling_windows(unseeded, interval)
+
+    @staticmethod
+    def record_tick(ticker, price):
+        """
+        Fold a live price into the rolling windows of a ticker.
+
+        return - Month window statistics (minimum, maximum, average) or None if the ticker has not been seeded yet
+        """
+        if not PriceHistoryService._rolling_engine.push_tick(ticker, price, trading_date(ticker)):
+            return None
+        return PriceHistoryService._rolling_engine.snapshot(ticker).get(PriceHistoryService._month_window)
+
+    @staticmethod
+    def rolling_statistics(ticker):
+        """
+        return - A dictionary window label -> statistics for a seeded ticker, empty otherwise
+        """
+        return PriceHistoryService._rolling_engine.snapshot(ticker)
+
+    @staticmethod
+    def backfill(tickers, interval="1d", lookback_days=31):
+        """
+        Download only the bars missing from the local store and persist them.
+
+        For every ticker, the provider is asked for bars starting at the last stored one (which is re-fetched,
+        as it may have been stored while still in progress). Tickers without bars get `lookback_days` of history.
+        Bars older than `lookback_days` are pruned.
+
+        return - Number of bars written
+        """
+        if not tickers:
+            return 0
+
+        now = _utc_now()
+        last_stored = PriceHistoryService.last_bar_times(tickers, interval)
+        default_start = (now - timedelta(days=lookback_days)).date()
+
+        # Tickers sharing the same start date are fetched in a single bulk download.
+        tickers_by_start = defaultdict(list)
+        for ticker in tickers:
+            start = last_stored[ticker].date() if ticker in last_stored else default_start
+            tickers_by_start[start].append(ticker)
+
+        written = 0
+        for start, group in tickers_by_start.items():
+            frame = FinancialDataService.historical_bars(group, start=start, interval=interval)
+            bars = _bars_from_frame(frame, group, interval)
+            if not bars:
+                continue
+            # Replace stored bars overlapping the fetched range, only for tickers the provider returned data for.
+            db.session.query(PriceBar).filter(
+                PriceBar.ticker.in_({bar.ticker for bar in bars}),
+                PriceBar.interval == interval,
+                PriceBar.timestamp >= datetime.combine(start, datetime.min.time()),
+            ).delete(synchronize_session=False)
+            db.session.add_all(bars)
+            written += len(bars)
+
+        db.session.query(PriceBar).filter(
+            PriceBar.interval == interval,
+            PriceBar.timestamp < now - timedelta(days=lookback_days),
+        ).delete(synchronize_session=False)
+
+        logger.info(f"Backfilled {written} {interval} bars for {len(tickers)} tickers in {len(tickers_by_start)} requests")
+        return written
+
+    @staticmethod
+    def last_bar_times(tickers, interval="1d"):
+        """
+        return - A dictionary ticker -> timestamp of the most recent stored bar
+        """
+        rows = (
+            db.session.query(PriceBar.ticker, func.max(PriceBar.timestamp))
+            .filter(PriceBar.ticker.in_(tickers), PriceBar.interval == interval)
+            .group_by(PriceBar.ticker)
+            .all()
+        )
+        return {ticker: timestamp for ticker, timestamp in rows}
+
+    @staticmethod
+    def statistics_in_window(tickers, interval="1d", days=30):
+        """
+        Compute price statistics from the local store, without provider requests.
+
+        return - A dictionary with tickers and their respective statistics, same keys as
+                 FinancialDataService.statistics_in_period: previous_price, minimum, maximum, average
+        """
+        window_start = _utc_now() - timedelta(days=days)
+        in_window = and_(
+            PriceBar.ticker.in_(tickers),
+            PriceBar.interval == interval,
+            PriceBar.timestamp >= window_start,
+        )
+
+        aggregates = (
+            db.session.query(PriceBar.ticker, func.min(PriceBar.low), func.max(PriceBar.high), func.avg(PriceBar.close))
+            .filter(in_window)
+            .group_by(PriceBar.ticker)
+            .all()
+        )
+        latest = (
+            db.session.query(PriceBar.ticker.label("ticker"), func.max(PriceBar.timestamp).label("timestamp"))
+            .filter(in_window)
+            .group_by(PriceBar.ticker)
+            .subquery()
+        )
+        last_closes = dict(
+            db.session.query(PriceBar.ticker, PriceBar.close)
+            .join(latest, and_(PriceBar.ticker == latest.c.ticker, PriceBar.timestamp == latest.c.timestamp))
+            .filter(PriceBar.interval == interval)
+            .all()
+        )
+
+        statistics = {}
+        for ticker, minimum, maximum, average in aggregates:
+            statistics[ticker] = {
+                "previous_price": round(last_closes[ticker], 2),
+                "minimum": round(minimum, 2),
+                "maximum": round(maximum, 2),
+                "average": round(average, 2),
+            }
+        return statistics
+
+
+def _utc_now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _bars_from_frame(frame, tickers, interval):
+    """
+    Convert a provider dataframe with (field, ticker) columns into PriceBar rows, skipping empty bars.
+    Timestamps keep the exchange local time of the provider index, so a daily bar is stored at midnight of its trading date.
+    """
+    if frame is None or frame.empty:
+        return []
+
+    index = frame.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    timestamps = index.to_pydatetime()
+
+    bars = []
+    for ticker in tickers:
+        column = ticker.upper()
+        if ("Close", column) not in frame.columns:
+            logger.warning(f"No bars returned for ticker {ticker}")
+            continue
+        opens = frame[("Open", column)].to_numpy()
+        highs = frame[("High", column)].to_numpy()
+        lows = frame[("Low", column)].to_numpy()
+        closes = frame[("Close", column)].to_numpy()
+        for position, timestamp in enumerate(timestamps):
+            close = closes[position]
+            if close != close:  # NaN: market closed for this ticker on that date
+                continue
+            bars.append(PriceBar(
+                ticker=ticker,
+                interval=interval,
+                timestamp=timestamp,
+                open=float(opens[position]),
+                high=float(highs[position]),
+                low=float(lows[position]),
+                close=float(close),
+            ))
+    return bars
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+class QuoteCache:
+    """
+    Process-wide cache of last quotes keyed by ticker.
+
+    Entries expire after `ttl_seconds` and the cache never holds more than `max_size`
+    tickers; when full, the least recently used ticker is evicted first.
+    All operations are thread safe, so the cache can be shared between gunicorn threads
+    and the scheduler thread.
+    """
+
+    def __init__(self, ttl_seconds=60, max_size=512, clock=time.monotonic):
+        self._ttl_seconds = float(ttl_seconds)
+        self._max_size = int(max_size)
+        self._clock = clock
+        self._entries = OrderedDict()  # ticker -> (stored_at, price)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def configure(self, ttl_seconds=None, max_size=None):
+        with self._lock:
+            if ttl_seconds is not None:
+                self._ttl_seconds = float(ttl_seconds)
+            if max_size is not None:
+                self._max_size = int(max_size)
+                self._evict_overflow()
+
+    def get_many(self, tickers, max_age=None):
+        """
+        Look up several tickers at once.
+
+        max_age - Optional maximum age in seconds of the entries served, below the TTL e.g. for a caller polling
+                  more often than the TTL; 0 serves none. Entries too old for it but within the TTL are kept.
+        return - A tuple (found, missing): a dictionary ticker -> price for fresh entries,
+                 and the list of tickers that must be fetched from the provider
+        """
+        found = {}
+        missing = []
+        now = self._clock()
+        with self._lock:
+            max_age = self._ttl_seconds if max_age is None else min(float(max_age), self._ttl_seconds)
+            for ticker in tickers:
+                entry = self._entries.get(ticker)
+                if entry is not None and now - entry[0] < max_age:
+                    self._entries.move_to_end(ticker)
+                    found[ticker] = entry[1]
+                    self._hits += 1
+                else:
+                    if entry is not None and now - entry[0] >= self._ttl_seconds:
+                        del self._entries[ticker]
+                    if ticker not in missing:
+                        missing.append(ticker)
+                    self._misses += 1
+        return found, missing
+
+    def put_many(self, prices):
+        now = self._clock()
+        with self._lock:
+            for ticker, price in prices.items():
+                self._entries[ticker] = (now, price)
+                self._entries.move_to_end(ticker)
+            self._evict_overflow()
+
+    def invalidate(self, tickers=None):
+        with self._lock:
+            if tickers is None:
+                self._entries.clear()
+            else:
+                for ticker in tickers:
+                    self._entries.pop(ticker, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "ttl_seconds": self._ttl_seconds,
+            }
+
+    def _evict_overflow(self):
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
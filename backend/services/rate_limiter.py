@@ -0,0 +1,82 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` operations per second with bursts up to `capacity`.
+
+    Thread safe. `clock` and `sleep` can be replaced in tests.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Take one token if available.
+
+        return - 0.0 when a token was taken, otherwise the seconds to wait until one is available
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """
+        Block until a token is available.
+
+        return - Seconds spent waiting (0.0 when not throttled)
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if wait == 0.0:
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+class TelegramRateLimiter:
+    """
+    Bot API limits: a global bucket shared by every chat plus one bucket per chat.
+
+    Telegram documents about 30 messages per second overall and 1 message per second per chat
+    (20 per minute in groups); both rates are configurable.
+    """
+
+    def __init__(self, global_rate=30, per_chat_rate=1, per_chat_burst=3, sleep=time.sleep):
+        self.global_rate = global_rate
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self._sleep = sleep
+        self._global = TokenBucket(global_rate, sleep=sleep)
+        self._chats = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, chat_id):
+        """
+        Block until a message to chat_id may be sent.
+
+        return - Seconds spent waiting
+        """
+        with self._lock:
+            bucket = self._chats.get(chat_id)
+            if bucket is None:
+                bucket = TokenBucket(self.per_chat_rate, capacity=self.per_chat_burst, sleep=self._sleep)
+                self._chats[chat_id] = bucket
+        return bucket.acquire() + self._global.acquire()
@@ -0,0 +1,72 @@
+import threading
+
+
+class _InFlightCall:
+    """A call in progress that identical concurrent callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class RequestCoalescer:
+    """
+    Single-flight execution of identical concurrent calls.
+
+    While a call for a given key is running, any other caller asking for the same key waits
+    for that result (or exception) instead of issuing its own provider request.
+    Nothing is cached once the call finishes; caching is the job of QuoteCache and FxRateCache.
+    """
+
+    def __init__(self):
+        self._in_flight = {}  # key -> _InFlightCall
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._executed = 0
+        self._merged = 0
+
+    def run(self, key, func):
+        """
+        Execute `func()` unless an identical call (same key) is already in flight.
+
+        key - Any hashable value identifying the request e.g. ("history", ("AAPL",), "1mo", "1d")
+        func - Callable without arguments performing the actual request
+        return - The value returned by the call that actually ran
+        """
+        with self._lock:
+            self._calls += 1
+            call = self._in_flight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._in_flight[key] = call
+                self._executed += 1
+            else:
+                self._merged += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executed": self._executed,
+                "merged": self._merged,
+                "in_flight": len(self._in_flight),
+            }
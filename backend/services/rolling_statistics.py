@@ -0,0 +1,163 @@
+from collections import deque
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def parse_window(window):
+    """
+    Convert a window label into a timedelta.
+
+    window - Number followed by a unit: "d" (days) or "w" (weeks) e.g. "30d", "90d", "52w"
+    """
+    label = window.strip().lower()
+    units = {"d": 1, "w": 7}
+    if len(label) < 2 or label[-1] not in units or not label[:-1].isdigit():
+        raise ValueError(f"Invalid rolling window '{window}'. Use a number of days or weeks e.g. 30d, 52w")
+    return timedelta(days=int(label[:-1]) * units[label[-1]])
+
+
+class RollingWindow:
+    """
+    Minimum, maximum and mean over a trailing time window of bars.
+
+    Bars are pushed in time order. Minimum and maximum are kept in monotonic deques and the mean
+    from a running sum, so pushing a bar and expiring old ones is O(1) amortized.
+    Pushing again with the timestamp of the last bar updates that bar in place, which is how
+    intraday ticks extend the current daily bar.
+    """
+
+    @property
+    def last_timestamp(self):
+        return self._bars[-1][0] if self._bars else None
+
+    def __init__(self, length):
+        self.length = length
+        self._bars = deque()  # [timestamp, close], oldest first
+        self._lows = deque()  # (timestamp, low), increasing lows
+        self._highs = deque()  # (timestamp, high), decreasing highs
+        self._sum = 0.0
+
+    def push(self, timestamp, low, high, close):
+        if self._bars and timestamp < self._bars[-1][0]:
+            logger.debug(f"Ignoring out of order bar at {timestamp}")
+            return
+
+        if self._bars and timestamp == self._bars[-1][0]:
+            last = self._bars[-1]
+            self._sum += close - last[1]
+            last[1] = close
+            if self._lows and self._lows[-1][0] == timestamp:
+                low = min(low, self._lows[-1][1])
+            if self._highs and self._highs[-1][0] == timestamp:
+                high = max(high, self._highs[-1][1])
+        else:
+            self._bars.append([timestamp, close])
+            self._sum += close
+
+        while self._lows and self._lows[-1][1] >= low:
+            self._lows.pop()
+        self._lows.append((timestamp, low))
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((timestamp, high))
+
+    def expire(self, now):
+        cutoff = now - self.length
+        while self._bars and self._bars[0][0] < cutoff:
+            self._sum -= self._bars.popleft()[1]
+        while self._lows and self._lows[0][0] < cutoff:
+            self._lows.popleft()
+        while self._highs and self._highs[0][0] < cutoff:
+            self._highs.popleft()
+
+    def snapshot(self):
+        if not self._bars:
+            return None
+        return {
+            "minimum": round(self._lows[0][1], 2),
+            "maximum": round(self._highs[0][1], 2),
+            "average": round(self._sum / len(self._bars), 2),
+            "last": round(self._bars[-1][1], 2),
+            "bars": len(self._bars),
+        }
+
+
+class RollingStatisticsEngine:
+    """
+    Rolling windows per ticker, seeded from stored daily bars and extended with live ticks.
+    Bars are keyed by their trading date (midnight), so a tick and the stored bar of the same day are one bar.
+
+    windows - Mapping of window label to length e.g. {"30d": timedelta(days=30)}
+    """
+
+    def __init__(self, windows=None, clock=None):
+        self._windows = dict(windows or {"30d": timedelta(days=30)})
+        self._clock = clock or (lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+        self._by_ticker = {}  # ticker -> {label: RollingWindow}
+        self._lock = threading.Lock()
+
+    def configure(self, windows):
+        with self._lock:
+            self._windows = dict(windows)
+            self._by_ticker.clear()
+
+    @property
+    def longest_window(self):
+        return max(self._windows.values())
+
+    def seed(self, ticker, bars):
+        """
+        Rebuild the windows of a ticker from daily bars ordered by time.
+
+        bars - Iterable of (timestamp, low, high, close); timestamps are reduced to their date
+        """
+        windows = {label: RollingWindow(length) for label, length in self._windows.items()}
+        for timestamp, low, high, close in bars:
+            day = datetime(timestamp.year, timestamp.month, timestamp.day)
+            for window in windows.values():
+                window.push(day, low, high, close)
+        with self._lock:
+            self._by_ticker[ticker] = windows
+
+    def is_seeded(self, ticker):
+        with self._lock:
+            return ticker in self._by_ticker
+
+    def push_tick(self, ticker, price, day=None):
+        """
+        Fold a live price into the daily bar of its trading date, for every window of a seeded ticker.
+
+        day - Trading date of the price (default the clock's date). A price never opens a bar older than the
+              last one: dated before it (e.g. the provider already stored today's bar), it updates that bar.
+        return - False when the ticker has not been seeded yet
+        """
+        day = day or self._clock()
+        bar_timestamp = datetime(day.year, day.month, day.day)
+        with self._lock:
+            windows = self._by_ticker.get(ticker)
+            if windows is None:
+                return False
+            for window in windows.values():
+                last_timestamp = window.last_timestamp
+                window.push(max(bar_timestamp, last_timestamp) if last_timestamp else bar_timestamp, price, price, price)
+            return True
+
+    def snapshot(self, ticker):
+        """
+        return - A dictionary window label -> statistics, or an empty dictionary if the ticker is not seeded
+        """
+        now = self._clock()
+        with self._lock:
+            windows = self._by_ticker.get(ticker, {})
+            statistics = {}
+            for label, window in windows.items():
+                window.expire(now)
+                statistics[label] = window.snapshot()
+            return statistics
+
+    def forget(self, ticker):
+        with self._lock:
+            self._by_ticker.pop(ticker, None)
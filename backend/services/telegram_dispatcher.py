@@ -0,0 +1,194 @@
+from concurrent.futures import Future
+import logging
+import os
+import queue
+import threading
+import time
+
+import requests
+
+from .rate_limiter import TelegramRateLimiter
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _OutboundMessage:
+    def __init__(self, bot_token, chat_id, text):
+        self.bot_token = bot_token
+        self.chat_id = chat_id
+        self.text = text
+        self.enqueued_at = time.monotonic()
+        self.handle = Future()
+
+
+class TelegramDispatcher:
+    """
+    Outbound Telegram message queue drained by a background worker thread.
+
+    The worker reuses a single keep-alive HTTP session, so callers (alert evaluation, webhook handlers)
+    never wait on the Telegram API: submit() returns a handle (concurrent.futures.Future) right away,
+    resolved with True/False once the message was sent or failed.
+
+    Sends are paced by a TelegramRateLimiter. A 429 response is retried after the `retry_after` Telegram
+    asks for; 5xx and network errors are retried with exponential backoff, up to `max_retries` times.
+    """
+
+    def __init__(self, max_queue_size=1000, api_base_url="https://api.telegram.org", timeout=10,
+                 rate_limiter=None, max_retries=3, retry_backoff=1.0, sleep=time.sleep):
+        self.api_base_url = api_base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._sleep = sleep
+        self._rate_limiter = rate_limiter or TelegramRateLimiter(sleep=sleep)
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+        self._session = None
+        self._sent = 0
+        self._failed = 0
+        self._dropped = 0
+        self._throttled = 0
+        self._retried = 0
+        self._send_latency_total = 0.0
+        self._send_latency_max = 0.0
+        self._delivery_latency_total = 0.0
+
+    def configure(self, max_queue_size=None, api_base_url=None, timeout=None, rate_limiter=None,
+                  max_retries=None, retry_backoff=None):
+        with self._lock:
+            if rate_limiter is not None:
+                self._rate_limiter = rate_limiter
+            if max_retries is not None:
+                self.max_retries = int(max_retries)
+            if retry_backoff is not None:
+                self.retry_backoff = float(retry_backoff)
+            if max_queue_size is not None and self._worker is None:
+                self._queue = queue.Queue(maxsize=int(max_queue_size))
+            if api_base_url is not None:
+                self.api_base_url = api_base_url.rstrip("/")
+            if timeout is not None:
+                self.timeout = float(timeout)
+
+    def submit(self, bot_token, chat_id, text):
+        """
+        Queue a message for delivery.
+
+        return - A Future resolved with True when Telegram accepted the message, False otherwise
+        """
+        message = _OutboundMessage(bot_token, chat_id, text)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.error("Telegram outbound queue is full, message dropped")
+            message.handle.set_result(False)
+        return message.handle
+
+    def stats(self):
+        with self._lock:
+            completed = self._sent + self._failed
+            return {
+                "queue_depth": self._queue.qsize(),
+                "sent": self._sent,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "throttled": self._throttled,
+                "retried": self._retried,
+                "avg_send_latency_ms": round(self._send_latency_total / completed * 1000, 2) if completed else 0.0,
+                "max_send_latency_ms": round(self._send_latency_max * 1000, 2),
+                "avg_delivery_latency_ms": round(self._delivery_latency_total / completed * 1000, 2) if completed else 0.0,
+            }
+
+    def stop(self, timeout=5):
+        """
+        Let the worker deliver what is already queued, then stop it.
+        """
+        with self._lock:
+            worker = self._worker
+        if worker is None or not worker.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        worker.join(timeout)
+
+    def _ensure_worker(self):
+        with self._lock:
+            # A forked process (e.g. gunicorn worker) does not inherit the parent's thread
+            if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+                return
+            self._session = requests.Session()
+            self._worker = threading.Thread(target=self._drain, name="telegram-dispatcher", daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _drain(self):
+        while True:
+            message = self._queue.get()
+            if message is _STOP:
+                return
+            if self._rate_limiter.acquire(message.chat_id) > 0:
+                with self._lock:
+                    self._throttled += 1
+            started = time.monotonic()
+            delivered = self._deliver(message)
+            finished = time.monotonic()
+            with self._lock:
+                if delivered:
+                    self._sent += 1
+                else:
+                    self._failed += 1
+                self._send_latency_total += finished - started
+                self._send_latency_max = max(self._send_latency_max, finished - started)
+                self._delivery_latency_total += finished - message.enqueued_at
+            message.handle.set_result(delivered)
+
+    def _deliver(self, message):
+        url = f"{self.api_base_url}/bot{message.bot_token}/sendMessage"
+        payload = {
+            "chat_id": message.chat_id,
+            "text": message.text,
+        }
+        for attempt in range(self.max_retries + 1):
+            retry_in = None
+            try:
+                response = self._session.post(url, json=payload, timeout=self.timeout)
+                if response.status_code == 200:
+                    logger.info("Message sent to Telegram successfully")
+                    return True
+                elif response.status_code == 429:
+                    retry_in = _retry_after(response) or self.retry_backoff * 2 ** attempt
+                    logger.warning(f"Telegram rate limit hit, retrying in {retry_in}s")
+                elif response.status_code >= 500:
+                    retry_in = self.retry_backoff * 2 ** attempt
+                    logger.warning(f"Telegram API error {response.status_code}, retrying in {retry_in}s")
+                else:
+                    logger.error(f"Failed to send message to Telegram: {response.text}")
+                    return False
+            except requests.RequestException as exc:
+                retry_in = self.retry_backoff * 2 ** attempt
+                logger.warning(f"Failed to send message to Telegram: {exc}, retrying in {retry_in}s")
+
+            if attempt == self.max_retries:
+                break
+            with self._lock:
+                self._retried += 1
+            self._sleep(retry_in)
+
+        logger.error(f"Failed to send message to Telegram after {self.max_retries + 1} attempts")
+        return False
+
+
+def _retry_after(response):
+    """Seconds Telegram asks to wait in a 429 response body, e.g. {"parameters": {"retry_after": 5}}."""
+    try:
+        return float(response.json().get("parameters", {}).get("retry_after"))
+    except (ValueError, TypeError, AttributeError):
+        return None
@@ -0,0 +1,159 @@
+import logging
+import os
+import threading
+import time
+
+import requests
+
+from ..models.app_state import AppState
+from ..persistance.db_manager import get_db_session
+
+logger = logging.getLogger(__name__)
+
+OFFSET_STATE_KEY = "telegram_update_offset"
+
+
+class TelegramPoller:
+    """
+    Pulls bot updates with getUpdates long polling, as an alternative to the /telegram/ webhook.
+
+    Each batch (up to `batch_size` updates) is passed to the handler one update at a time, then the next
+    offset is persisted in AppState, so a restart resumes after the last processed batch instead of
+    replaying it. The handler is injected by the caller (the telegrams route module) so this service
+    does not depend on the routes.
+    """
+
+    def __init__(self, api_base_url="https://api.telegram.org", poll_timeout=30, batch_size=100,
+                 retry_delay=5.0, sleep=time.sleep):
+        self.api_base_url = api_base_url
+        self.poll_timeout = poll_timeout
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self._sleep = sleep
+        self._session = requests.Session()
+        self._stop = threading.Event()
+        self._thread = None
+        self._offset = None
+        self._webhook_deleted = False
+        self._batches = 0
+        self._updates = 0
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def configure(self, api_base_url=None, poll_timeout=None, batch_size=None, retry_delay=None):
+        if api_base_url is not None:
+            self.api_base_url = api_base_url.rstrip("/")
+        if poll_timeout is not None:
+            self.poll_timeout = int(poll_timeout)
+        if batch_size is not None:
+            self.batch_size = min(100, max(1, int(batch_size)))
+        if retry_delay is not None:
+            self.retry_delay = float(retry_delay)
+
+    def start(self, app, handler):
+        """
+        Poll in a background thread until stop() is called.
+
+        handler - Function receiving each update, called inside an application context
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(app, handler), name="telegram-poller", daemon=True)
+            self._thread.start()
+        logger.info("Telegram long polling started")
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout if timeout is not None else self.poll_timeout + 5)
+
+    def poll_once(self, app, handler):
+        """
+        Fetch one batch of updates and process it, persisting the next offset after each update
+        so a crash in the middle of a batch does not replay the commands already applied.
+
+        return - Number of updates processed
+        """
+        bot_token = app.config.get("TELEGRAM_BOT_TOKEN")
+        if not bot_token:
+            raise ValueError("Telegram bot token not configured")
+
+        if not self._webhook_deleted:
+            # getUpdates is refused while a webhook is set
+            self._call(bot_token, "deleteWebhook", {"drop_pending_updates": False}, timeout=10)
+            self._webhook_deleted = True
+
+        if self._offset is None:
+            with app.app_context():
+                with get_db_session() as session:
+                    stored = AppState.get_value(session, OFFSET_STATE_KEY)
+            self._offset = int(stored) if stored is not None else None
+
+        payload = {"timeout": self.poll_timeout, "limit": self.batch_size, "allowed_updates": ["message"]}
+        if self._offset is not None:
+            payload["offset"] = self._offset
+        updates = self._call(bot_token, "getUpdates", payload, timeout=self.poll_timeout + 10)
+        if not updates:
+            return 0
+
+        for update in updates:
+            try:
+                with app.app_context():
+                    handler(update)
+            except Exception as exc:
+                logger.error(f"Error processing Telegram update {update.get('update_id')}: {exc}")
+            self._offset = max(self._offset or 0, update["update_id"] + 1)
+            with app.app_context():
+                with get_db_session() as session:
+                    AppState.set_value(session, OFFSET_STATE_KEY, self._offset)
+
+        with self._lock:
+            self._batches += 1
+            self._updates += len(updates)
+        return len(updates)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "offset": self._offset,
+                "batches": self._batches,
+                "updates": self._updates,
+                "avg_batch_size": round(self._updates / self._batches, 2) if self._batches else 0.0,
+                "errors": self._errors,
+            }
+
+    def _run(self, app, handler):
+        while not self._stop.is_set():
+            try:
+                self.poll_once(app, handler)
+            except Exception as exc:
+                with self._lock:
+                    self._errors += 1
+                logger.error(f"Telegram polling failed: {exc}, retrying in {self.retry_delay}s")
+                self._sleep(self.retry_delay)
+
+    def _call(self, bot_token, method, payload, timeout):
+        url = f"{self.api_base_url}/bot{bot_token}/{method}"
+        response = self._session.post(url, json=payload, timeout=timeout)
+        if response.status_code == 409:
+            # Another webhook was set meanwhile: delete it again before the next poll
+            self._webhook_deleted = False
+        if response.status_code != 200:
+            raise RuntimeError(f"Telegram {method} failed with status {response.status_code}: {response.text}")
+        result = response.json().get("result")
+        return result if isinstance(result, list) else []
+
+
+def polling_enabled(app):
+    """
+    True when bot updates are pulled with getUpdates (TELEGRAM_INGESTION_MODE=polling) in this process.
+    """
+    if app.config.get("TELEGRAM_INGESTION_MODE", "webhook") != "polling":
+        return False
+    # The debug reloader runs the app twice; only the child process polls
+    return not (app.debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true")
@@ -1,13 +1,84 @@
-import requests
+from concurrent.futures import Future
+import atexit
 import logging
 
+from .rate_limiter import TelegramRateLimiter
+from .telegram_dispatcher import TelegramDispatcher
+from .telegram_poller import TelegramPoller, polling_enabled
+from .update_deduplicator import UpdateDeduplicator
+from .webhook_worker_pool import WebhookWorkerPool
+
 logger = logging.getLogger(__name__)
 
+# Bot API limit for the text of a single message
+TELEGRAM_MESSAGE_LIMIT = 4096
+
 class TelegramService:
+
+    # Outbound messages are queued and delivered by a background worker over a keep-alive session.
+    _dispatcher = TelegramDispatcher()
+    # Incoming webhook updates are acknowledged right away and processed by a bounded worker pool.
+    _webhook_pool = WebhookWorkerPool()
+    # update_ids received recently, so redelivered webhook updates are acknowledged without running again.
+    _update_deduplicator = UpdateDeduplicator()
+    # getUpdates long polling, used instead of the webhook when TELEGRAM_INGESTION_MODE=polling.
+    _poller = TelegramPoller()
+
+    @staticmethod
+    def configure(app):
+        """
+        Apply Telegram delivery settings from the Flask configuration.
+
+        TELEGRAM_QUEUE_MAX_SIZE - Maximum number of messages waiting for delivery (default 1000)
+        TELEGRAM_API_BASE_URL - Bot API base url (default https://api.telegram.org)
+        TELEGRAM_SEND_TIMEOUT - Seconds to wait for each Bot API request (default 10)
+        TELEGRAM_GLOBAL_RATE - Messages per second across all chats (default 30)
+        TELEGRAM_PER_CHAT_RATE - Messages per second to a single chat (default 1)
+        TELEGRAM_PER_CHAT_BURST - Messages a single chat can receive back to back (default 3)
+        TELEGRAM_MAX_RETRIES - Retries after a 429, 5xx or network error (default 3)
+        TELEGRAM_RETRY_BACKOFF - Base seconds of the exponential backoff when no retry_after is given (default 1)
+        TELEGRAM_WEBHOOK_QUEUE_SIZE - Maximum number of webhook updates waiting to be processed (default 100)
+        TELEGRAM_WEBHOOK_WORKERS - Threads processing webhook updates (default 1, which keeps the commands of a chat in order)
+        TELEGRAM_DEDUP_TTL - Seconds an update_id is remembered (default 3600)
+        TELEGRAM_DEDUP_MAX_SIZE - Maximum number of update_ids remembered in memory (default 10000)
+        TELEGRAM_DEDUP_SQLITE_PATH - Optional SQLite file storing update_ids instead of memory, shared by all processes
+        TELEGRAM_POLL_TIMEOUT - Seconds each getUpdates long poll waits for new updates (default 30)
+        TELEGRAM_POLL_BATCH_SIZE - Maximum updates fetched per getUpdates call, up to 100 (default 100)
+        """
+        TelegramService._dispatcher.configure(
+            max_queue_size=app.config.get("TELEGRAM_QUEUE_MAX_SIZE", 1000),
+            api_base_url=app.config.get("TELEGRAM_API_BASE_URL", "https://api.telegram.org"),
+            timeout=app.config.get("TELEGRAM_SEND_TIMEOUT", 10),
+            rate_limiter=TelegramRateLimiter(
+                global_rate=float(app.config.get("TELEGRAM_GLOBAL_RATE", 30)),
+                per_chat_rate=float(app.config.get("TELEGRAM_PER_CHAT_RATE", 1)),
+                per_chat_burst=float(app.config.get("TELEGRAM_PER_CHAT_BURST", 3)),
+            ),
+            max_retries=app.config.get("TELEGRAM_MAX_RETRIES", 3),
+            retry_backoff=app.config.get("TELEGRAM_RETRY_BACKOFF", 1.0),
+        )
+        TelegramService._webhook_pool.configure(
+            max_queue_size=app.config.get("TELEGRAM_WEBHOOK_QUEUE_SIZE", 100),
+            workers=app.config.get("TELEGRAM_WEBHOOK_WORKERS", 1),
+        )
+        TelegramService._update_deduplicator.configure(
+            ttl_seconds=app.config.get("TELEGRAM_DEDUP_TTL", 3600),
+            max_size=app.config.get("TELEGRAM_DEDUP_MAX_SIZE", 10000),
+            sqlite_path=app.config.get("TELEGRAM_DEDUP_SQLITE_PATH"),
+        )
+        TelegramService._poller.configure(
+            api_base_url=app.config.get("TELEGRAM_API_BASE_URL", "https://api.telegram.org"),
+            poll_timeout=app.config.get("TELEGRAM_POLL_TIMEOUT", 30),
+            batch_size=app.config.get("TELEGRAM_POLL_BATCH_SIZE", 100),
+        )
+
     @staticmethod
     def send_message(app, message):
         """
         Sends messages to the configured Telegram bot and chat.
+
+        Returns immediately with a handle (concurrent.futures.Future); handle.result() is True once
+        Telegram accepted the message and False if it could not be delivered.
         """
         with app.app_context():
             bot_token = app.config.get("TELEGRAM_BOT_TOKEN")
@@ -15,22 +86,106 @@ class TelegramService:
 
             if not bot_token or not chat_id:
                 logger.error("Telegram bot token or chat ID not configured")
-                return False
-
-            url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-            payload = {
-                "chat_id": chat_id,
-                "text": message,
-            }
-
-            try:
-                response = requests.post(url, json=payload, timeout=10)
-                if response.status_code == 200:
-                    logger.info("Message sent to Telegram successfully")
-                    return True
-                else:
-                    logger.error(f"Failed to send message to Telegram: {response.text}")
-                    return False
-            except requests.RequestException as exc:
-                logger.error(f"Failed to send message to Telegram: {exc}")
-                return False
\ No newline at end of file
+                handle = Future()
+                handle.set_result(False)
+                return handle
+
+            return TelegramService._dispatcher.submit(bot_token, chat_id, message)
+
+    @staticmethod
+    def enqueue_update(app, handler, update):
+        """
+        Process an incoming bot update in the background, inside an application context.
+
+        handler - Function receiving the update
+        return - True when queued, False when the webhook queue is full
+        """
+        return TelegramService._webhook_pool.submit(_run_in_app_context, app, handler, update)
+
+    @staticmethod
+    def start_ingestion(app, handler):
+        """
+        Start pulling bot updates with getUpdates long polling when TELEGRAM_INGESTION_MODE is "polling".
+        In the default "webhook" mode updates arrive through the /telegram/ route and nothing is started.
+
+        handler - Function receiving each update, e.g. routes.telegrams.handle_update
+        return - True when polling was started
+        """
+        if not polling_enabled(app):
+            return False
+        TelegramService._poller.start(app, handler)
+        return True
+
+    @staticmethod
+    def stop_ingestion():
+        TelegramService._poller.stop()
+
+    @staticmethod
+    def is_duplicate_update(update_id):
+        """
+        Record an incoming update_id.
+
+        return - True when the same update_id was already received recently (a redelivery)
+        """
+        return TelegramService._update_deduplicator.seen(update_id)
+
+    @staticmethod
+    def forget_update(update_id):
+        """
+        Forget an update_id that could not be processed, so its redelivery is accepted.
+        """
+        TelegramService._update_deduplicator.forget(update_id)
+
+    @staticmethod
+    def stats():
+        """
+        Get outbound queue depth and delivery latency counters, e.g. for the /api/metrics endpoint
+        """
+        return TelegramService._dispatcher.stats()
+
+    @staticmethod
+    def inbound_stats():
+        """
+        Get webhook queue, deduplication and long polling counters, e.g. for the /api/metrics endpoint
+        """
+        stats = TelegramService._webhook_pool.stats()
+        stats["deduplication"] = TelegramService._update_deduplicator.stats()
+        stats["polling"] = TelegramService._poller.stats()
+        return stats
+
+
+def split_message(lines, limit=TELEGRAM_MESSAGE_LIMIT):
+    """
+    Pack lines into as few texts as possible, each one at most `limit` characters long.
+
+    Lines are joined with new lines and never split, except a single line longer than `limit`.
+    """
+    chunks = []
+    current = ""
+    for line in lines:
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _run_in_app_context(app, handler, update):
+    with app.app_context():
+        handler(update)
+
+
+# Deliver what is still queued when the process exits normally.
+atexit.register(TelegramService._poller.stop, 1)
+atexit.register(TelegramService._webhook_pool.stop)
+atexit.register(TelegramService._dispatcher.stop)
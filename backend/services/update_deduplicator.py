@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+import sqlite3
+import threading
+import time
+
+
+class UpdateDeduplicator:
+    """
+    Remembers recently received Telegram update_ids so redelivered updates are not processed twice.
+
+    Entries expire after `ttl_seconds`; at most `max_size` ids are kept in memory (oldest evicted first).
+    When `sqlite_path` is set, ids are stored in a small SQLite table instead, shared by every process
+    using the same file and kept across restarts.
+    """
+
+    def __init__(self, ttl_seconds=3600, max_size=10000, sqlite_path=None, clock=time.time):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.sqlite_path = sqlite_path
+        self._clock = clock
+        self._seen = OrderedDict()  # update_id -> received at
+        self._lock = threading.Lock()
+        self._duplicates = 0
+
+    def configure(self, ttl_seconds=None, max_size=None, sqlite_path=None):
+        with self._lock:
+            if ttl_seconds is not None:
+                self.ttl_seconds = float(ttl_seconds)
+            if max_size is not None:
+                self.max_size = int(max_size)
+            if sqlite_path:
+                self.sqlite_path = sqlite_path
+                self._create_table()
+
+    def seen(self, update_id):
+        """
+        Record an update_id.
+
+        return - True when the update_id was already received within the TTL (a duplicate), False otherwise
+        """
+        now = self._clock()
+        with self._lock:
+            if self.sqlite_path:
+                duplicate = self._seen_sqlite(update_id, now)
+            else:
+                duplicate = self._seen_memory(update_id, now)
+            if duplicate:
+                self._duplicates += 1
+            return duplicate
+
+    def forget(self, update_id):
+        """
+        Drop an update_id, e.g. when its processing could not be queued and Telegram must deliver it again.
+        """
+        with self._lock:
+            if self.sqlite_path:
+                with self._connect() as connection:
+                    connection.execute("DELETE FROM telegram_update WHERE update_id = ?", (update_id,))
+            else:
+                self._seen.pop(update_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "sqlite" if self.sqlite_path else "memory",
+                "size": None if self.sqlite_path else len(self._seen),
+                "duplicates": self._duplicates,
+            }
+
+    def _seen_memory(self, update_id, now):
+        expire_before = now - self.ttl_seconds
+        while self._seen:
+            if next(iter(self._seen.values())) >= expire_before:
+                break
+            self._seen.popitem(last=False)
+
+        if update_id in self._seen:
+            return True
+        self._seen[update_id] = now
+        while len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+        return False
+
+    def _seen_sqlite(self, update_id, now):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM telegram_update WHERE received_at < ?", (now - self.ttl_seconds,))
+            inserted = connection.execute(
+                "INSERT OR IGNORE INTO telegram_update (update_id, received_at) VALUES (?, ?)",
+                (update_id, now),
+            ).rowcount
+        return inserted == 0
+
+    def _create_table(self):
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS telegram_update (update_id INTEGER PRIMARY KEY, received_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # One short lived connection per call: safe across threads and forked processes
+        with closing(sqlite3.connect(self.sqlite_path, timeout=5)) as connection, connection:
+            yield connection
+
@@ -0,0 +1,125 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _Job:
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+        self.enqueued_at = time.monotonic()
+
+
+class WebhookWorkerPool:
+    """
+    Bounded queue of incoming bot updates processed by a fixed number of worker threads.
+
+    The webhook request only validates and enqueues the update, so slow commands (yfinance lookups,
+    outgoing replies) never hold a web server thread. submit() returns False when the queue is full,
+    letting the caller answer 503 so Telegram delivers the update again later.
+    With more than one worker, updates may run concurrently and out of order (e.g. /watchlist_add before the
+    /watchlist_new sent just before it), so the default is a single worker.
+    """
+
+    def __init__(self, max_queue_size=100, workers=1):
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._pid = None
+        self._processed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def configure(self, max_queue_size=None, workers=None):
+        with self._lock:
+            if self._threads:
+                return
+            if max_queue_size is not None:
+                self._queue = queue.Queue(maxsize=int(max_queue_size))
+            if workers is not None:
+                self.workers = max(1, int(workers))
+
+    def submit(self, func, *args):
+        """
+        Queue func(*args) to run on a worker thread.
+
+        return - True when queued, False when the queue is full
+        """
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait(_Job(func, args))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            logger.warning("Webhook queue is full, update rejected")
+            return False
+
+    def stats(self):
+        with self._lock:
+            started = self._processed + self._failed
+            return {
+                "queue_depth": self._queue.qsize(),
+                "workers": self.workers,
+                "processed": self._processed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_queue_wait_ms": round(self._wait_total / started * 1000, 2) if started else 0.0,
+                "max_queue_wait_ms": round(self._wait_max * 1000, 2),
+            }
+
+    def stop(self, timeout=5):
+        """
+        Let the workers finish what is already queued, then stop them.
+        """
+        with self._lock:
+            threads = [thread for thread in self._threads if thread.is_alive()]
+        for _ in threads:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                return
+        for thread in threads:
+            thread.join(timeout)
+
+    def _ensure_workers(self):
+        with self._lock:
+            # A forked process (e.g. gunicorn worker) does not inherit the parent's threads
+            if self._pid == os.getpid() and any(thread.is_alive() for thread in self._threads):
+                return
+            self._threads = [
+                threading.Thread(target=self._work, name=f"telegram-webhook-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            self._pid = os.getpid()
+            for thread in self._threads:
+                thread.start()
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            waited = time.monotonic() - job.enqueued_at
+            try:
+                job.func(*job.args)
+                failed = False
+            except Exception as exc:
+                logger.error(f"Error processing Telegram update: {exc}")
+                failed = True
+            with self._lock:
+                if failed:
+                    self._failed += 1
+                else:
+                    self._processed += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
@@ -0,0 +1,112 @@
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# Regular trading sessions by Yahoo ticker suffix: (exchange timezone, open, close), Monday to Friday.
+# Holidays and lunch breaks are not modelled: on those days the asset is polled as if the market were open.
+EXCHANGE_SESSIONS = {
+    "": ("America/New_York", time(9, 30), time(16, 0)),  # NYSE / NASDAQ, no suffix
+    ".L": ("Europe/London", time(8, 0), time(16, 30)),
+    ".MX": ("America/Mexico_City", time(8, 30), time(15, 0)),
+    ".TO": ("America/Toronto", time(9, 30), time(16, 0)),
+    ".DE": ("Europe/Berlin", time(9, 0), time(17, 30)),
+    ".PA": ("Europe/Paris", time(9, 0), time(17, 30)),
+    ".AS": ("Europe/Amsterdam", time(9, 0), time(17, 30)),
+    ".MC": ("Europe/Madrid", time(9, 0), time(17, 30)),
+    ".SA": ("America/Sao_Paulo", time(10, 0), time(17, 0)),
+    ".HK": ("Asia/Hong_Kong", time(9, 30), time(16, 0)),
+    ".T": ("Asia/Tokyo", time(9, 0), time(15, 0)),
+}
+
+MARKET_CRYPTO = "crypto"
+MARKET_FX = "fx"
+MARKET_FUTURES = "futures"
+MARKET_UNKNOWN = "unknown"
+
+# Quote currencies of Yahoo crypto pairs e.g. BTC-USD, ETH-MXN
+_CRYPTO_QUOTES = {"USD", "USDT", "USDC", "EUR", "GBP", "MXN", "BTC", "ETH"}
+# FX and futures trade around the clock on weekdays; their week and daily maintenance break follow New York time
+_NEW_YORK = ZoneInfo("America/New_York")
+# Timezone of the daily bars Yahoo returns for markets without an exchange session; crypto and unknown use UTC
+_BAR_ZONES = {MARKET_FX: ZoneInfo("Europe/London"), MARKET_FUTURES: _NEW_YORK}
+
+
+def market_of(ticker):
+    """
+    Market of a Yahoo Finance ticker, derived from its symbol.
+
+    return - MARKET_CRYPTO, MARKET_FX, MARKET_FUTURES, a suffix of EXCHANGE_SESSIONS ("" for US listings)
+    or MARKET_UNKNOWN (e.g. indices "^GSPC" or unlisted suffixes)
+    """
+    ticker = ticker.upper()
+    if ticker.endswith("=X"):
+        return MARKET_FX
+    if ticker.endswith("=F"):
+        return MARKET_FUTURES
+    if ticker.startswith("^"):
+        return MARKET_UNKNOWN
+    if "-" in ticker and ticker.rsplit("-", 1)[1] in _CRYPTO_QUOTES:
+        return MARKET_CRYPTO
+    if "." in ticker:
+        suffix = "." + ticker.rsplit(".", 1)[1]
+        return suffix if suffix in EXCHANGE_SESSIONS else MARKET_UNKNOWN
+    return ""
+
+
+def is_market_open(ticker, at=None, grace=timedelta(0)):
+    """
+    Whether the market of a ticker is trading.
+
+    ticker - Yahoo Finance ticker
+    at - Aware datetime to check (default now)
+    grace - Time the market is still considered open after it closes, so one poll captures the closing price
+    return - True while open or within `grace` after the close. Crypto and markets that cannot be told
+    from the ticker are always open
+    """
+    at = at or datetime.now(timezone.utc)
+    market = market_of(ticker)
+    if market in (MARKET_CRYPTO, MARKET_UNKNOWN):
+        return True
+    return _is_trading(market, at) or (grace > timedelta(0) and _is_trading(market, at - grace))
+
+
+def trading_date(ticker, at=None):
+    """
+    Date of the daily bar a price of the ticker belongs to: the date in its exchange timezone, as Yahoo dates daily bars.
+
+    at - Aware datetime (default now)
+    """
+    at = at or datetime.now(timezone.utc)
+    market = market_of(ticker)
+    if market in EXCHANGE_SESSIONS:
+        zone = ZoneInfo(EXCHANGE_SESSIONS[market][0])
+    else:
+        zone = _BAR_ZONES.get(market, timezone.utc)
+    return at.astimezone(zone).date()
+
+
+def _is_trading(market, at):
+    if market == MARKET_FX:
+        # Sunday 17:00 to Friday 17:00 New York time
+        local = at.astimezone(_NEW_YORK)
+        weekday, now = local.weekday(), local.time()
+        if weekday == 5:
+            return False
+        if weekday == 6:
+            return now >= time(17, 0)
+        return weekday < 4 or now < time(17, 0)
+
+    if market == MARKET_FUTURES:
+        # CME Globex: Sunday 18:00 to Friday 17:00 New York time, with a daily 17:00-18:00 break
+        local = at.astimezone(_NEW_YORK)
+        weekday, now = local.weekday(), local.time()
+        if weekday == 5:
+            return False
+        if weekday == 6:
+            return now >= time(18, 0)
+        if weekday == 4:
+            return now < time(17, 0)
+        return not time(17, 0) <= now < time(18, 0)
+
+    zone, opens, closes = EXCHANGE_SESSIONS[market]
+    local = at.astimezone(ZoneInfo(zone))
+    return local.weekday() < 5 and opens <= local.time() < closes
@@ -0,0 +1,74 @@
+import json
+
+from .market_calendar import market_of, MARKET_CRYPTO, MARKET_FX, MARKET_FUTURES
+
+TIER_CRYPTO = "crypto"
+TIER_FX = "fx"
+TIER_FUTURES = "futures"
+TIER_BOND = "bond"
+TIER_EQUITY = "equity"
+
+# Words in an asset name that identify a bond fund, e.g. "Vanguard Short-Term Treasury Bond ETF"
+_BOND_KEYWORDS = ("bond", "treasury", "trsry", "gilt", "high yield")
+
+
+def tier_intervals(app):
+    """
+    Polling tiers configured in POLLING_TIERS, a JSON object of tier name -> minutes between polls,
+    e.g. {"crypto": 1, "fx": 5, "futures": 5, "equity": 5, "bond": 30}.
+
+    return - Dictionary tier -> minutes, empty when tiers are not configured (every asset polled by one job)
+    """
+    tiers = app.config.get("POLLING_TIERS")
+    if not tiers:
+        return {}
+    if isinstance(tiers, str):
+        tiers = json.loads(tiers)
+    return {tier: float(minutes) for tier, minutes in tiers.items()}
+
+
+def tier_overrides(app):
+    """
+    Explicit tier of some tickers from POLLING_TIER_OVERRIDES, a JSON object ticker -> tier name.
+    """
+    overrides = app.config.get("POLLING_TIER_OVERRIDES") or {}
+    if isinstance(overrides, str):
+        overrides = json.loads(overrides)
+    return {ticker.upper(): tier for ticker, tier in overrides.items()}
+
+
+def classify_asset(ticker, displayed_name=""):
+    """
+    Asset class of a ticker by rule: crypto, fx and futures from the ticker suffix, bond funds by name.
+    """
+    market = market_of(ticker)
+    if market == MARKET_CRYPTO:
+        return TIER_CRYPTO
+    if market == MARKET_FX:
+        return TIER_FX
+    if market == MARKET_FUTURES:
+        return TIER_FUTURES
+    name = (displayed_name or "").lower()
+    if any(keyword in name for keyword in _BOND_KEYWORDS):
+        return TIER_BOND
+    return TIER_EQUITY
+
+
+def assign_tier(ticker, displayed_name, tiers, overrides=None):
+    """
+    Polling tier of an asset.
+
+    tiers - Configured tiers (tier -> minutes)
+    overrides - Optional explicit ticker -> tier mapping, applied first
+    return - The override or rule based tier when configured, otherwise the "equity" tier,
+    otherwise the fastest configured tier
+    """
+    tier = (overrides or {}).get(ticker.upper())
+    if tier in tiers:
+        return tier
+    tier = classify_asset(ticker, displayed_name)
+    if tier in tiers:
+        return tier
+    if TIER_EQUITY in tiers:
+        return TIER_EQUITY
+    return min(tiers, key=tiers.get)
@@ -0,0 +1,41 @@
+"""
+Background jobs without the web server.
+
+    python -m backend.worker
+
+Builds the app (database, services configuration) and runs only the scheduler jobs and Telegram long polling,
+so the job tier and the web tier (gunicorn, started with FLASK_RUN_SCHEDULER=false) can be sized independently.
+"""
+import logging
+import signal
+import threading
+
+from backend import create_app, start_background_jobs
+from backend.scheduler.leader_election import run_when_leader
+from backend.scheduler.scheduler import stop_scheduler
+from backend.services.telegram_service import TelegramService
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    app = create_app(run_scheduler=False)
+    # Debug mode only matters to the web server reloader; the worker always runs its jobs
+    app.debug = False
+
+    stopping = threading.Event()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *_: stopping.set())
+
+    # Several worker replicas on one host elect a single leader, like gunicorn workers do
+    run_when_leader(app, lambda: start_background_jobs(app))
+    logger.info("Worker started")
+
+    stopping.wait()
+    logger.info("Worker stopping")
+    stop_scheduler()
+    TelegramService.stop_ingestion()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark of FinancialDataService statistics: legacy stack/groupby path vs vectorized NumPy reductions.
+
+Runs offline on a synthetic provider dataframe shaped like yf.download output.
+Usage (from the repository root):
+    python -m benchmarks.statistics_benchmark --tickers 300 --bars 252 --repeat 5
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from backend.services.finantial_data_service import FinancialDataService
+
+
+def synthetic_history(tickers, bars, seed=42):
+    """Random walk OHLCV bars with (field, ticker) columns and a few missing values."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-01-01", periods=bars, freq="B", name="Date")
+    symbols = [f"T{i:04d}" for i in range(tickers)]
+    close = 100 + np.cumsum(rng.normal(0, 1, size=(bars, tickers)), axis=0)
+    close[rng.random(size=close.shape) < 0.01] = np.nan
+    blocks = {
+        "Close": close,
+        "High": close + rng.uniform(0, 2, size=close.shape),
+        "Low": close - rng.uniform(0, 2, size=close.shape),
+        "Open": close + rng.normal(0, 0.5, size=close.shape),
+        "Volume": rng.integers(1_000, 1_000_000, size=close.shape).astype(float),
+    }
+    columns = pd.MultiIndex.from_product([list(blocks), symbols], names=["Price", "Ticker"])
+    return pd.DataFrame(np.hstack(list(blocks.values())), index=dates, columns=columns)
+
+
+def legacy_statistics(history):
+    """Statistics as computed before vectorization: stack, strftime, groupby and a Python loop."""
+    statistics = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=FutureWarning)  # pandas legacy stack() deprecation
+        grouped = FinancialDataService._group_prices_by_ticker(history)
+    for ticker, group in grouped:
+        statistics[ticker] = {
+                "previous_price": round(group["Close"].iloc[-1], 2),
+                "minimum": round(group["Low"].min(), 2),
+                "maximum": round(group["High"].max(), 2),
+                "average": round(group["Close"].mean(), 2),
+                "volatility": round(group["Close"].std(), 2)
+            }
+    return statistics
+
+
+def best_time(func, history, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(history)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=300)
+    parser.add_argument("--bars", type=int, default=252)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    history = synthetic_history(args.tickers, args.bars)
+    legacy = best_time(legacy_statistics, history, args.repeat)
+    vectorized = best_time(FinancialDataService._statistics_from_bars, history, args.repeat)
+
+    print(f"{args.tickers} tickers x {args.bars} bars, best of {args.repeat}")
+    print(f"  legacy stack/groupby : {legacy * 1000:9.2f} ms")
+    print(f"  vectorized NumPy     : {vectorized * 1000:9.2f} ms")
+    print(f"  speedup              : {legacy / vectorized:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
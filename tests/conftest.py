@@ -21,11 +21,13 @@ def app():
     from backend.routes.prices import price_blueprint
     from backend.routes.watchlists import watchlist_blueprint
     from backend.routes.alerts import alerts_blueprint
+    from backend.routes.telegrams import telegrams_blueprint
 
     flask_app.register_blueprint(general_blueprint)
     flask_app.register_blueprint(price_blueprint)
     flask_app.register_blueprint(watchlist_blueprint)
     flask_app.register_blueprint(alerts_blueprint)
+    flask_app.register_blueprint(telegrams_blueprint)
 
     with flask_app.app_context():
         _db.create_all()
@@ -47,3 +49,73 @@ def db(app):
 @pytest.fixture(scope="function")
 def client(app):
     return app.test_client()
+
+
+class FakeClock:
+    """Manually advanced clock for time dependent services: call it for the time, `sleep` advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture(scope="function")
+def fake_clock():
+    return FakeClock()
+
+
+class FakeBotApi:
+    """Local stand-in for the Telegram Bot API: records requests and replays scripted responses."""
+
+    def __init__(self):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.requests = []  # (method, payload)
+        self.responses = {}  # method -> list of (status, body) served in order, then 200 ok
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                method = self.path.rsplit("/", 1)[-1]
+                with fake._lock:
+                    fake.requests.append((method, payload))
+                    scripted = fake.responses.get(method)
+                    status, body = scripted.pop(0) if scripted else (200, {"ok": True, "result": True})
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def sent(self, method="sendMessage"):
+        with self._lock:
+            return [payload for called, payload in self.requests if called == method]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture(scope="function")
+def bot_api():
+    fake = FakeBotApi()
+    yield fake
+    fake.close()
@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from backend.models.asset import Asset
+from backend.models.alert import Alert, ALERT_TYPE_MONTH_LOW, ALERT_TYPE_PRICE_BELOW
+from backend.models.watchlist import Watchlist
+from backend.logic_units.watchlists_units import fetch_watchlists
+
+
+@contextmanager
+def _count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _add_watchlists(db, count, assets_per_watchlist, offset=0):
+    for w in range(offset, offset + count):
+        watchlist = Watchlist(name=f"List {w}")
+        for a in range(assets_per_watchlist):
+            ticker = f"T{w}{a}"
+            asset = Asset(ticker=ticker, displayed_name=ticker, price=10.0)
+            asset.alerts.append(Alert(ticker=ticker, alert_type=ALERT_TYPE_MONTH_LOW))
+            asset.alerts.append(Alert(ticker=ticker, alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=5.0))
+            watchlist.assets.append(asset)
+        db.session.add(watchlist)
+    db.session.commit()
+    db.session.expire_all()
+
+
+def test_fetch_watchlists_query_count_is_constant(app, db):
+    _add_watchlists(db, count=1, assets_per_watchlist=1)
+    with _count_queries(db.engine) as small:
+        watchlists, _ = fetch_watchlists()
+    assert len(watchlists[0]["assets"][0]["alerts"]) == 2
+
+    _add_watchlists(db, count=5, assets_per_watchlist=4, offset=1)
+    with _count_queries(db.engine) as large:
+        watchlists, _ = fetch_watchlists()
+    assert sum(len(watchlist["assets"]) for watchlist in watchlists) == 21
+
+    assert len(large) == len(small)
@@ -0,0 +1,72 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from backend.services.telegram_service import TelegramService
+from backend.services.update_deduplicator import UpdateDeduplicator
+from backend.services.webhook_worker_pool import WebhookWorkerPool
+
+
+def _update(update_id, text="/help"):
+    return {"update_id": update_id, "message": {"chat": {"id": 1}, "text": text}}
+
+
+@pytest.fixture
+def webhook(app):
+    """Fresh webhook queue and deduplicator, with a handler that blocks until released."""
+    pool = WebhookWorkerPool(max_queue_size=1, workers=1)
+    release = threading.Event()
+    started = threading.Event()
+    handled = []
+
+    def handler(update):
+        handled.append(update["update_id"])
+        started.set()
+        release.wait(timeout=5)
+
+    with patch.object(TelegramService, "_webhook_pool", pool), \
+         patch.object(TelegramService, "_update_deduplicator", UpdateDeduplicator()), \
+         patch("backend.routes.telegrams.handle_update", handler):
+        yield started, release, handled
+        release.set()
+        pool.stop()
+
+
+def test_update_is_acknowledged_before_it_is_processed(client, webhook):
+    started, release, handled = webhook
+
+    response = client.post("/telegram/", json=_update(1))
+
+    assert response.status_code == 200
+    assert started.wait(timeout=5)
+    assert handled == [1]  # still running: the handler is blocked until released
+
+
+def test_full_queue_answers_503_and_accepts_the_redelivery(client, webhook):
+    started, release, handled = webhook
+
+    assert client.post("/telegram/", json=_update(1)).status_code == 200
+    assert started.wait(timeout=5)  # taken by the worker
+    assert client.post("/telegram/", json=_update(2)).status_code == 200  # waits in the queue
+    assert client.post("/telegram/", json=_update(3)).status_code == 503
+
+    release.set()
+    TelegramService._webhook_pool.stop()
+    # Telegram delivers update 3 again later: it was not remembered as handled
+    assert client.post("/telegram/", json=_update(3)).status_code == 200
+
+
+def test_redelivered_update_is_acknowledged_without_running_again(client, webhook):
+    started, release, handled = webhook
+    release.set()
+
+    assert client.post("/telegram/", json=_update(7)).status_code == 200
+    assert client.post("/telegram/", json=_update(7)).status_code == 200
+    TelegramService._webhook_pool.stop()
+
+    assert handled == [7]
+
+
+def test_invalid_update_is_rejected(client):
+    assert client.post("/telegram/", json=["not", "an", "update"]).status_code == 400
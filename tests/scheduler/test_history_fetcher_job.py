@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+import json
+from unittest.mock import patch
+
+from backend.models.app_state import AppState
+from backend.models.asset import Asset
+from backend.scheduler.history_fetcher_job import STATS_REFRESH_STATE_KEY, update_monthly_stats
+
+_STATISTICS = {"previous_price": 9.0, "minimum": 8.0, "maximum": 12.0, "average": 10.0}
+
+
+def _store_refresh_times(db, **hours_ago):
+    now = datetime.now(timezone.utc)
+    times = {ticker: (now - timedelta(hours=hours)).isoformat() for ticker, hours in hours_ago.items()}
+    AppState.set_value(db.session, STATS_REFRESH_STATE_KEY, json.dumps(times))
+    db.session.commit()
+
+
+def test_boot_refresh_only_fetches_stale_tickers(app, db):
+    db.session.add_all([Asset(ticker=ticker, displayed_name=ticker, price=10.0) for ticker in ("AAA", "BBB", "CCC")])
+    db.session.commit()
+    _store_refresh_times(db, AAA=1, BBB=48)
+
+    with patch("backend.scheduler.history_fetcher_job.PriceHistoryService") as history:
+        history.history_days_required.return_value = 31
+        history.month_window_days.return_value = 30
+        history.statistics_in_window.return_value = {"BBB": _STATISTICS, "CCC": _STATISTICS}
+        update_monthly_stats(app, only_stale=True)
+
+    assert history.backfill.call_args.args[0] == ["BBB", "CCC"]
+    assert history.seed_rolling_windows.call_args.args[0] == ["AAA", "BBB", "CCC"]
+    refreshed = json.loads(AppState.get_value(db.session, STATS_REFRESH_STATE_KEY))
+    assert set(refreshed) == {"AAA", "BBB", "CCC"}
+    assert db.session.get(Asset, "CCC").min_month_price == 8.0
+
+
+def test_boot_refresh_with_fresh_statistics_only_seeds_windows(app, db):
+    db.session.add(Asset(ticker="AAA", displayed_name="AAA", price=10.0))
+    db.session.commit()
+    _store_refresh_times(db, AAA=1)
+
+    with patch("backend.scheduler.history_fetcher_job.PriceHistoryService") as history:
+        update_monthly_stats(app, only_stale=True)
+
+    history.backfill.assert_not_called()
+    history.seed_rolling_windows.assert_called_once()
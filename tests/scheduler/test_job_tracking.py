@@ -0,0 +1,166 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from backend.models.asset import Asset
+from backend.models.job_run import JobRun, JOB_RUN_STATUS_SUCCESS, JOB_RUN_STATUS_PARTIAL, JOB_RUN_STATUS_FAILED, JOB_RUN_STATUS_BUDGET_EXCEEDED
+from backend.scheduler.job_tracking import JobBudget, track_job_run
+from backend.scheduler.price_updater_job import update_prices_and_alerts
+from backend.services.alert_index import AlertIndex
+from backend.services.adaptive_polling_service import AdaptivePollingService
+from backend.services.alert_service import AlertService
+from backend.services.finantial_data_service import FinancialDataService
+from backend.services.polling_schedule import PollingSchedule
+
+
+def test_job_budget_expires_after_its_seconds():
+    now = [0.0]
+    budget = JobBudget(10, clock=lambda: now[0])
+
+    assert not budget.expired()
+    now[0] = 10.0
+    assert budget.expired()
+    assert budget.exceeded
+    assert not JobBudget(None).expired()
+
+
+def test_track_job_run_records_counters_and_failures(app, db):
+    with track_job_run(app, "some_job") as tracker:
+        tracker.tickers_processed = 3
+        tracker.alerts_fired = 1
+    with track_job_run(app, "idle_job") as tracker:
+        tracker.skip()
+    with pytest.raises(RuntimeError):
+        with track_job_run(app, "broken_job"):
+            raise RuntimeError("provider down")
+
+    runs = {run.job_name: run for run in JobRun.query.all()}
+    assert set(runs) == {"some_job", "broken_job"}
+    assert (runs["some_job"].status, runs["some_job"].tickers_processed, runs["some_job"].alerts_fired) == (JOB_RUN_STATUS_SUCCESS, 3, 1)
+    assert runs["broken_job"].status == JOB_RUN_STATUS_FAILED
+    assert runs["broken_job"].error_message == "provider down"
+
+
+def test_price_job_stops_at_budget_and_records_run(app, db):
+    db.session.add_all([Asset(ticker=ticker, displayed_name=ticker, price=0.0) for ticker in ("AAA", "BBB", "CCC")])
+    db.session.commit()
+
+    def slow_prices(tickers, errors, max_age=None):
+        time.sleep(0.2)
+        return {ticker: {"original_price": 10.0, "converted_price": 180.0} for ticker in tickers}
+
+    settings = {"JOB_BUDGETS": {"last_prices_fetch": 0.1}}
+    with patch.dict(app.config, settings), \
+         patch.object(FinancialDataService, "_quote_batch_size", 1), \
+         patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch("backend.scheduler.price_updater_job.FinancialDataService.latest_prices", side_effect=slow_prices) as mock_prices:
+        update_prices_and_alerts(app)
+
+    assert mock_prices.call_count == 1
+    run = JobRun.query.one()
+    assert run.job_name == "last_prices_fetch"
+    assert run.status == JOB_RUN_STATUS_BUDGET_EXCEEDED
+    assert run.tickers_processed == 1
+    assert sorted(asset.price for asset in Asset.query.all()) == [0.0, 0.0, 10.0]
+
+
+def test_price_job_over_budget_continues_with_tickers_left_by_previous_run(app, db):
+    db.session.add_all([Asset(ticker=ticker, displayed_name=ticker, price=0.0) for ticker in ("AAA", "BBB", "CCC")])
+    db.session.commit()
+    requested = []
+
+    def slow_prices(tickers, errors, max_age=None):
+        requested.extend(tickers)
+        time.sleep(0.2)
+        return {ticker: {"original_price": 10.0, "converted_price": 180.0} for ticker in tickers}
+
+    with patch.dict(app.config, {"JOB_BUDGETS": {"last_prices_fetch": 0.1}, "MARKET_HOURS_ENABLED": False}), \
+         patch.object(FinancialDataService, "_quote_batch_size", 1), \
+         patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch("backend.scheduler.price_updater_job.FinancialDataService.latest_prices", side_effect=slow_prices):
+        for _ in range(3):
+            update_prices_and_alerts(app)
+
+    assert requested == ["AAA", "BBB", "CCC"]
+    assert [asset.price for asset in Asset.query.all()] == [10.0, 10.0, 10.0]
+
+
+def test_price_job_skips_failed_tickers_and_records_partial_run(app, db):
+    db.session.add_all([Asset(ticker=ticker, displayed_name=ticker, price=5.0) for ticker in ("AAA", "GONE")])
+    db.session.commit()
+
+    def partial_prices(tickers, errors, max_age=None):
+        errors["GONE"] = "No price data returned"
+        return {"AAA": {"original_price": 10.0, "converted_price": 180.0}}
+
+    with patch.dict(app.config, {"MARKET_HOURS_ENABLED": False}), \
+         patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch("backend.scheduler.price_updater_job.FinancialDataService.latest_prices", side_effect=partial_prices):
+        update_prices_and_alerts(app)
+
+    run = JobRun.query.one()
+    assert run.status == JOB_RUN_STATUS_PARTIAL
+    assert run.tickers_processed == 1
+    assert "GONE" in run.error_message
+    assert db.session.get(Asset, "AAA").price == 10.0
+    assert db.session.get(Asset, "GONE").price == 5.0
+
+
+def test_adaptive_price_job_backs_off_failed_tickers(app, db):
+    db.session.add_all([Asset(ticker=ticker, displayed_name=ticker, price=5.0) for ticker in ("AAA", "GONE")])
+    db.session.commit()
+    schedule = PollingSchedule(min_seconds=30, max_seconds=900)
+
+    def partial_prices(tickers, errors, max_age=None):
+        errors["GONE"] = "No price data returned"
+        return {"AAA": {"original_price": 10.0, "converted_price": 180.0}}
+
+    with patch.dict(app.config, {"MARKET_HOURS_ENABLED": False}), \
+         patch.object(AdaptivePollingService, "_enabled", True), \
+         patch.object(AdaptivePollingService, "_schedule", schedule), \
+         patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch("backend.scheduler.price_updater_job.FinancialDataService.latest_prices", side_effect=partial_prices):
+        update_prices_and_alerts(app)
+
+    assert not schedule.is_due("GONE")
+    assert schedule.stats()["at_max_interval"] == 2
+
+
+def test_price_job_requests_provider_for_quotes_still_cached(app, db):
+    db.session.add(Asset(ticker="AAA", displayed_name="AAA", price=5.0))
+    db.session.commit()
+    FinancialDataService._quote_cache.invalidate()
+    FinancialDataService._quote_cache.put_many({"AAA": 9.0})  # priced by a web request seconds ago
+
+    with patch.dict(app.config, {"MARKET_HOURS_ENABLED": False}), \
+         patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch.object(FinancialDataService, "_fetch_quotes", return_value=({"AAA": 10.0}, {})) as mock_fetch, \
+         patch.object(FinancialDataService, "exchange_rate", return_value={"exchange_rate": "USD/MXN", "rate": 18.0}):
+        update_prices_and_alerts(app)
+
+    mock_fetch.assert_called_once_with(["AAA"])
+    assert db.session.get(Asset, "AAA").price == 10.0
+    assert FinancialDataService._quote_cache.get_many(["AAA"]) == ({"AAA": 10.0}, [])
+    FinancialDataService._quote_cache.invalidate()
+
+
+def test_adaptive_polls_below_quote_cache_ttl_get_new_prices(app, db, fake_clock):
+    db.session.add(Asset(ticker="AAA", displayed_name="AAA", price=5.0))
+    db.session.commit()
+    FinancialDataService._quote_cache.invalidate()
+    schedule = PollingSchedule(min_seconds=30, max_seconds=30, clock=fake_clock)
+
+    with patch.dict(app.config, {"MARKET_HOURS_ENABLED": False}), \
+         patch.object(AdaptivePollingService, "_enabled", True), \
+         patch.object(AdaptivePollingService, "_schedule", schedule), \
+         patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch.object(FinancialDataService, "_fetch_quotes", side_effect=[({"AAA": 10.0}, {}), ({"AAA": 11.0}, {})]) as mock_fetch, \
+         patch.object(FinancialDataService, "exchange_rate", return_value={"exchange_rate": "USD/MXN", "rate": 18.0}):
+        update_prices_and_alerts(app)
+        fake_clock.now += 30  # due again, the first quote is still within QUOTE_CACHE_TTL
+        update_prices_and_alerts(app)
+
+    assert mock_fetch.call_count == 2
+    assert db.session.get(Asset, "AAA").price == 11.0
+    FinancialDataService._quote_cache.invalidate()
@@ -0,0 +1,25 @@
+import multiprocessing
+
+from backend.scheduler.leader_election import LeaderLock
+
+
+def _try_lock(path, results):
+    results.put(LeaderLock(path).try_acquire())
+
+
+def test_only_one_process_holds_the_lock_until_released(tmp_path):
+    path = str(tmp_path / "scheduler.lock")
+    leader = LeaderLock(path)
+    results = multiprocessing.Queue()
+
+    assert leader.try_acquire()
+    contender = multiprocessing.Process(target=_try_lock, args=(path, results))
+    contender.start()
+    contender.join(10)
+    assert results.get(timeout=5) is False
+
+    leader.release()
+    contender = multiprocessing.Process(target=_try_lock, args=(path, results))
+    contender.start()
+    contender.join(10)
+    assert results.get(timeout=5) is True
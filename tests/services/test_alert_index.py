@@ -0,0 +1,115 @@
+from unittest.mock import patch
+from backend.models.asset import Asset
+from backend.models.alert import Alert, ALERT_TYPE_PRICE_BELOW, ALERT_TYPE_PRICE_ABOVE, ALERT_TYPE_MONTH_LOW
+from backend.services.alert_index import AlertIndex
+from backend.services.alert_service import AlertService
+
+
+def _index():
+    index = AlertIndex()
+    index.rebuild([
+        (1, "AAPL", ALERT_TYPE_PRICE_BELOW, 90.0),
+        (2, "AAPL", ALERT_TYPE_PRICE_BELOW, 95.0),
+        (3, "AAPL", ALERT_TYPE_PRICE_ABOVE, 105.0),
+        (4, "AAPL", ALERT_TYPE_PRICE_ABOVE, 110.0),
+        (5, "AAPL", ALERT_TYPE_MONTH_LOW, None),
+        (6, "MSFT", ALERT_TYPE_PRICE_BELOW, 95.0),
+    ])
+    return index
+
+
+def test_only_thresholds_inside_the_move_are_crossed():
+    index = _index()
+    assert index.crossed("AAPL", 100.0, 92.0) == [2]
+    assert index.crossed("AAPL", 100.0, 90.0) == [1, 2]
+    assert index.crossed("AAPL", 100.0, 107.0) == [3]
+    assert index.crossed("AAPL", 94.0, 93.0) == []  # already below 95, nothing newly crossed
+    assert index.crossed("AAPL", None, 92.0) == [2]
+    assert index.statistic_alerts("AAPL") == {5: ALERT_TYPE_MONTH_LOW}
+
+
+def test_index_updates_incrementally():
+    index = _index()
+    index.add(2, "AAPL", ALERT_TYPE_PRICE_ABOVE, 101.0)
+    index.add(7, "AAPL", ALERT_TYPE_PRICE_BELOW, 99.0)
+    index.remove(3)
+
+    assert index.crossed("AAPL", 100.0, 92.0) == [7]
+    assert index.crossed("AAPL", 100.0, 107.0) == [2]
+    index.remove_ticker("AAPL")
+    assert index.crossed("AAPL", 100.0, 50.0) == []
+    assert len(index) == 1
+
+
+def test_check_moved_assets_evaluates_only_crossed_alerts(app, db):
+    asset = Asset(ticker="AAPL", displayed_name="AAPL", price=92.0, min_month_price=85.0)
+    db.session.add(asset)
+    db.session.add_all([
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=95.0),
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=80.0),
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_MONTH_LOW),
+    ])
+    db.session.commit()
+
+    with patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
+        evaluated = AlertService.check_moved_assets(app, [(asset, 100.0)])
+
+    assert evaluated == 1
+    mock_send.assert_called_once()
+
+
+def test_trigger_distance_uses_nearest_threshold_and_month_statistics(app, db):
+    asset = Asset(ticker="AAPL", displayed_name="AAPL", price=100.0, min_month_price=97.0, max_month_price=120.0)
+    db.session.add(asset)
+    db.session.add_all([
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=90.0),
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_ABOVE, price_threshold=110.0),
+    ])
+    db.session.commit()
+
+    with patch.object(AlertService, "_alert_index", AlertIndex()):
+        assert AlertService.trigger_distance(asset) == 10.0
+        db.session.add(Alert(ticker="AAPL", alert_type=ALERT_TYPE_MONTH_LOW))
+        db.session.commit()
+        AlertService.rebuild_alert_index()
+        assert AlertService.trigger_distance(asset) == 3.0
+
+
+def test_index_is_rebuilt_only_when_alerts_changed(app, db):
+    db.session.add(Asset(ticker="AAPL", displayed_name="AAPL", price=100.0))
+    db.session.add(Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=90.0))
+    db.session.commit()
+
+    with patch.object(AlertService, "_alert_index", AlertIndex()):
+        assert AlertService.refresh_alert_index()
+        assert not AlertService.refresh_alert_index()
+
+        # another process adds an alert and bumps the version
+        db.session.add(Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_ABOVE, price_threshold=110.0))
+        AlertService.mark_alerts_changed(db.session)
+        db.session.commit()
+
+        assert AlertService.refresh_alert_index()
+        assert len(AlertService._alert_index) == 2
+
+
+def test_alert_already_satisfied_when_created_fires_once(app, db):
+    asset = Asset(ticker="AAPL", displayed_name="AAPL", price=95.0)
+    db.session.add(asset)
+    db.session.commit()
+
+    with patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
+        AlertService.refresh_alert_index()
+
+        # created in another process while the price is already below the threshold
+        db.session.add(Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=100.0))
+        AlertService.mark_alerts_changed(db.session)
+        db.session.commit()
+        AlertService.refresh_alert_index()
+
+        assert AlertService.check_moved_assets(app, [(asset, 95.0)]) == 1
+        assert AlertService.check_moved_assets(app, [(asset, 95.0)]) == 0
+
+    mock_send.assert_called_once()
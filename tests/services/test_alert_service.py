@@ -1,7 +1,10 @@
 from unittest.mock import patch
+import numpy as np
 from backend.models.asset import Asset
-from backend.models.alert import Alert, ALERT_TYPE_PRICE_BELOW, ALERT_TYPE_PRICE_ABOVE, ALERT_TYPE_MONTH_LOW
-from backend.services.alert_service import AlertService
+from backend.models.alert import Alert, ALERT_TYPE_PRICE_BELOW, ALERT_TYPE_PRICE_ABOVE, ALERT_TYPE_MONTH_LOW, ALERT_TYPE_MONTH_HIGH
+from backend.models.notification import Notification, NOTIFICATION_STATUS_PENDING
+from backend.services.alert_index import AlertIndex
+from backend.services.alert_service import AlertService, evaluate_alert_rules
 
 
 def _make_asset(db, ticker="AAPL", price=100.0, min_month_price=90.0):
@@ -17,7 +20,7 @@ def test_price_below_triggers_when_price_at_threshold(app, db):
     db.session.add(alert)
     db.session.commit()
 
-    with patch("backend.services.alert_service.TelegramService.send_message") as mock_send:
+    with patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
         AlertService.check_alert(app, alert)
         mock_send.assert_called_once()
 
@@ -28,7 +31,7 @@ def test_price_below_does_not_trigger_when_price_above_threshold(app, db):
     db.session.add(alert)
     db.session.commit()
 
-    with patch("backend.services.alert_service.TelegramService.send_message") as mock_send:
+    with patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
         AlertService.check_alert(app, alert)
         mock_send.assert_not_called()
 
@@ -39,7 +42,7 @@ def test_price_above_triggers_when_price_at_threshold(app, db):
     db.session.add(alert)
     db.session.commit()
 
-    with patch("backend.services.alert_service.TelegramService.send_message") as mock_send:
+    with patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
         AlertService.check_alert(app, alert)
         mock_send.assert_called_once()
 
@@ -50,6 +53,81 @@ def test_month_minimum_triggers_when_price_at_monthly_low(app, db):
     db.session.add(alert)
     db.session.commit()
 
-    with patch("backend.services.alert_service.TelegramService.send_message") as mock_send:
+    with patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
         AlertService.check_alert(app, alert)
         mock_send.assert_called_once()
+
+
+def test_month_maximum_triggers_when_price_at_monthly_high(app, db):
+    asset = _make_asset(db, price=110.0)
+    asset.max_month_price = 110.0
+    alert = Alert(ticker=asset.ticker, alert_type=ALERT_TYPE_MONTH_HIGH)
+    db.session.add(alert)
+    db.session.commit()
+
+    with patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
+        AlertService.check_alert(app, alert)
+        mock_send.assert_called_once()
+
+
+def test_triggered_alert_is_written_to_outbox_instead_of_sent(app, db):
+    asset = _make_asset(db, price=150.0)
+    alert = Alert(ticker=asset.ticker, alert_type=ALERT_TYPE_PRICE_ABOVE, price_threshold=150.0)
+    db.session.add(alert)
+    db.session.commit()
+
+    with patch("backend.services.notification_service.TelegramService.send_message") as mock_send:
+        AlertService.check_alert(app, alert)
+        db.session.commit()
+        mock_send.assert_not_called()
+
+    notification = Notification.query.one()
+    assert notification.status == NOTIFICATION_STATUS_PENDING
+    assert notification.alert_id == alert.id
+    assert "AAPL" in notification.message
+
+
+def test_evaluate_alert_rules_computes_all_types_in_one_pass():
+    mask = evaluate_alert_rules(
+        asset_tickers=np.array(["MSFT", "AAPL"]),
+        prices=np.array([300.0, 100.0]),
+        minimums=np.array([290.0, 100.0]),
+        maximums=np.array([300.0, 120.0]),
+        alert_tickers=np.array(["AAPL", "AAPL", "MSFT", "MSFT", "AAPL", "TSLA"]),
+        alert_types=np.array([ALERT_TYPE_MONTH_LOW, ALERT_TYPE_MONTH_HIGH, ALERT_TYPE_MONTH_HIGH, ALERT_TYPE_PRICE_BELOW, ALERT_TYPE_PRICE_ABOVE, ALERT_TYPE_PRICE_BELOW]),
+        thresholds=np.array([np.nan, np.nan, np.nan, 250.0, 100.0, 1000.0]),
+    )
+    assert mask.tolist() == [True, False, True, False, True, False]
+
+
+def test_vectorized_sweep_only_loads_triggered_alerts(app, db):
+    _make_asset(db, ticker="AAPL", price=100.0, min_month_price=90.0)
+    db.session.add_all([
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=100.0),
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=50.0),
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_MONTH_LOW),
+    ])
+    db.session.commit()
+
+    with patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
+        assert AlertService.check_all_alerts_vectorized(app) == 1
+        mock_send.assert_called_once()
+
+
+def test_sweep_of_moves_only_fires_crossed_thresholds_of_moved_assets(app, db):
+    moved = _make_asset(db, ticker="AAPL", price=95.0)
+    _make_asset(db, ticker="MSFT", price=10.0)
+    db.session.add_all([
+        Alert(ticker="AAPL", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=98.0),
+        Alert(ticker="MSFT", alert_type=ALERT_TYPE_PRICE_BELOW, price_threshold=50.0),
+    ])
+    db.session.commit()
+
+    with patch.object(AlertService, "_alert_index", AlertIndex()), \
+         patch("backend.services.alert_service.NotificationService.enqueue") as mock_send:
+        AlertService.refresh_alert_index()
+        assert AlertService.check_all_alerts_vectorized(app, [(moved, 100.0)]) == 1
+        # still below the threshold on the next cycle: not crossed again
+        assert AlertService.check_all_alerts_vectorized(app, [(moved, 95.0)]) == 0
+
+    mock_send.assert_called_once()
@@ -0,0 +1,80 @@
+import threading
+
+from backend.services.fetch_executor import FetchExecutor
+
+
+def test_failed_chunk_only_fails_its_own_tickers():
+    executor = FetchExecutor(max_concurrency=2, call_timeout=5)
+
+    def fetch(chunk):
+        if "DELISTED" in chunk:
+            raise ValueError("no data")
+        return {ticker: 1.0 for ticker in chunk}
+
+    results, errors = executor.map_chunks(fetch, [["AAPL", "MSFT"], ["DELISTED"], ["GOOGL"]])
+
+    assert results == {"AAPL": 1.0, "MSFT": 1.0, "GOOGL": 1.0}
+    assert errors == {"DELISTED": "no data"}
+    assert executor.stats()["failed"] == 1
+
+
+def test_chunks_run_concurrently_up_to_the_limit():
+    executor = FetchExecutor(max_concurrency=2, call_timeout=5)
+    running = [0]
+    peak = [0]
+    lock = threading.Lock()
+    both_started = threading.Barrier(2, timeout=5)
+
+    def fetch(chunk):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        if chunk[0] in ("A", "B"):
+            both_started.wait()
+        with lock:
+            running[0] -= 1
+        return {chunk[0]: 1.0}
+
+    results, errors = executor.map_chunks(fetch, [["A"], ["B"], ["C"], ["D"]])
+
+    assert set(results) == {"A", "B", "C", "D"}
+    assert errors == {}
+    assert peak[0] == 2
+
+
+def test_stalled_chunk_times_out_without_blocking_the_others():
+    executor = FetchExecutor(max_concurrency=2, call_timeout=0.2)
+    release = threading.Event()
+
+    def fetch(chunk):
+        if chunk == ["SLOW"]:
+            release.wait(timeout=5)
+        return {chunk[0]: 1.0}
+
+    results, errors = executor.map_chunks(fetch, [["SLOW"], ["FAST"]])
+    release.set()
+
+    assert results == {"FAST": 1.0}
+    assert errors["SLOW"].startswith("timed out")
+    assert executor.stats()["timed_out"] == 1
+
+
+def test_chunks_queued_behind_an_abandoned_call_fail_by_their_deadline():
+    executor = FetchExecutor(max_concurrency=1, call_timeout=0.2)
+    release = threading.Event()
+    fetched = []
+
+    def fetch(chunk):
+        fetched.append(chunk[0])
+        if chunk == ["SLOW"]:
+            release.wait(timeout=5)
+        return {chunk[0]: 1.0}
+
+    executor.map_chunks(fetch, [["SLOW"]])  # abandoned, still holds the only thread
+    results, errors = executor.map_chunks(fetch, [["NEXT"]])
+    release.set()
+
+    assert results == {}
+    assert errors["NEXT"] == "timed out waiting for a busy provider"
+    executor.map_chunks(fetch, [["LAST"]])
+    assert fetched == ["SLOW", "LAST"]  # the cancelled chunk never ran
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from backend.services.finantial_data_service import FinancialDataService
+
+
+def _bulk_download_frame(closes):
+    """Build a frame shaped like yf.download output: (field, ticker) columns, one row per day."""
+    dates = pd.date_range("2026-01-05", periods=len(next(iter(closes.values()))), freq="D", name="Date")
+    columns = pd.MultiIndex.from_product([["Close", "High", "Low", "Open", "Volume"], list(closes)], names=["Price", "Ticker"])
+    frame = pd.DataFrame(index=dates, columns=columns, dtype=float)
+    for ticker, values in closes.items():
+        for field in ["Close", "High", "Low", "Open"]:
+            frame[(field, ticker)] = values
+        frame[("Volume", ticker)] = 1000.0
+    return frame
+
+
+def test_fetch_quotes_downloads_in_chunks_and_keeps_last_close():
+    frames = {
+        ("AAPL", "MSFT"): _bulk_download_frame({"AAPL": [10.0, 11.0, 12.0], "MSFT": [20.0, 21.0, np.nan]}),
+        ("VAPU.L",): _bulk_download_frame({"VAPU.L": [30.0, 31.0, 32.0]}),
+    }
+    with patch.object(FinancialDataService, "_quote_batch_size", 2), \
+         patch("backend.services.finantial_data_service.yf.download", side_effect=lambda chunk, **kwargs: frames[tuple(chunk)]) as mock_download:
+        quotes, errors = FinancialDataService._fetch_quotes(["AAPL", "MSFT", "VAPU.L"])
+
+    assert mock_download.call_count == 2
+    assert quotes == {"AAPL": 12.0, "MSFT": 21.0, "VAPU.L": 32.0}
+    assert errors == {}
+
+
+def test_latest_prices_are_served_unconverted_without_exchange_rate():
+    FinancialDataService._quote_cache.invalidate()
+    with patch.object(FinancialDataService, "_fetch_quotes", return_value=({"AAPL": 100.0}, {})), \
+         patch.object(FinancialDataService, "exchange_rate", side_effect=ConnectionError("provider down")):
+        prices = FinancialDataService.latest_prices(["AAPL"])
+
+    assert prices == {"AAPL": {"original_price": 100.0, "converted_price": None}}
+    FinancialDataService._quote_cache.invalidate()
+
+
+class _SlowTicker:
+    """Stands in for yf.Ticker inside the real yf.download, which collects results in yfinance.shared."""
+
+    delays = {"MSFT": 0.3}
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def history(self, **kwargs):
+        time.sleep(self.delays.get(self.ticker, 0.01))
+        dates = pd.date_range("2026-01-05", periods=2, freq="D", name="Date")
+        price = float(len(self.ticker))
+        return pd.DataFrame({"Open": price, "High": price, "Low": price, "Close": price, "Adj Close": price, "Volume": 1.0}, index=dates)
+
+
+def test_overlapping_downloads_keep_their_own_tickers():
+    results = {}
+
+    def fetch(name, tickers):
+        results[name] = FinancialDataService._fetch_quotes(tickers)
+
+    with patch("yfinance.multi.Ticker", _SlowTicker):
+        first = threading.Thread(target=fetch, args=("first", ["AAPL", "MSFT"]))
+        first.start()
+        time.sleep(0.1)  # AAPL is in yfinance.shared, MSFT still downloading
+        second = threading.Thread(target=fetch, args=("second", ["GOOGL", "META"]))
+        second.start()
+        first.join(timeout=10)
+        second.join(timeout=10)
+
+    assert results["first"] == ({"AAPL": 4.0, "MSFT": 4.0}, {})
+    assert results["second"] == ({"GOOGL": 5.0, "META": 4.0}, {})
+
+def test_vectorized_statistics_match_legacy_groupby():
+    from benchmarks.statistics_benchmark import legacy_statistics, synthetic_history
+
+    history = synthetic_history(tickers=12, bars=40, seed=3)
+    for field in ["Close", "High", "Low", "Open"]:
+        history[(field, "T0005")] = np.nan  # ticker without data is left out by both paths
+
+    vectorized = FinancialDataService._statistics_from_bars(history)
+    legacy = legacy_statistics(history)
+
+    assert vectorized.keys() == legacy.keys()
+    for ticker, expected in legacy.items():
+        assert vectorized[ticker] == pytest.approx(expected)
+
+
+def test_download_waits_for_the_lock_at_most_the_call_timeout():
+    # e.g. held by a download abandoned after its timeout, still waiting on the provider
+    FinancialDataService._download_lock.acquire()
+    try:
+        with patch.object(FinancialDataService._fetch_executor, "call_timeout", 0.1), \
+             patch("backend.services.finantial_data_service.yf.download") as mock_download:
+            with pytest.raises(TimeoutError):
+                FinancialDataService.historical_bars(["AAPL"], start="2026-01-05")
+        mock_download.assert_not_called()
+    finally:
+        FinancialDataService._download_lock.release()
@@ -0,0 +1,72 @@
+import threading
+import pytest
+from backend.services.fx_rate_cache import FxRateCache
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = FxRateCache(ttl_seconds=60)
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(timeout=2)
+        return {"exchange_rate": "USD/MXN", "rate": 17.5}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("USD/MXN", slow_fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result["rate"] == 17.5 for result in results)
+
+
+def test_last_known_rate_is_served_as_stale_when_refresh_fails():
+    cache = FxRateCache(ttl_seconds=0)
+    cache.get("USD/MXN", lambda: {"exchange_rate": "USD/MXN", "rate": 17.5})
+
+    def failing_fetch():
+        raise ConnectionError("provider down")
+
+    result = cache.get("USD/MXN", failing_fetch)
+    assert result == {"exchange_rate": "USD/MXN", "rate": 17.5, "stale": True}
+
+    with pytest.raises(ConnectionError):
+        cache.get("USD/EUR", failing_fetch)
+
+
+def test_failed_refresh_is_not_retried_before_retry_after(fake_clock):
+    cache = FxRateCache(ttl_seconds=10, retry_after_seconds=30, clock=fake_clock)
+    cache.get("USD/MXN", lambda: {"exchange_rate": "USD/MXN", "rate": 17.5})
+    calls = []
+
+    def failing_fetch():
+        calls.append(1)
+        raise ConnectionError("provider down")
+
+    fake_clock.now = 10.0
+    assert cache.get("USD/MXN", failing_fetch)["stale"] is True
+    fake_clock.now = 39.0
+    assert cache.get("USD/MXN", failing_fetch) == {"exchange_rate": "USD/MXN", "rate": 17.5, "stale": True}
+    assert len(calls) == 1
+
+    fake_clock.now = 40.0
+    assert cache.get("USD/MXN", lambda: {"exchange_rate": "USD/MXN", "rate": 18.0}) == {"exchange_rate": "USD/MXN", "rate": 18.0, "stale": False}
+
+
+def test_unknown_rate_failure_is_raised_again_without_fetching():
+    cache = FxRateCache(retry_after_seconds=30)
+    calls = []
+
+    def failing_fetch():
+        calls.append(1)
+        raise ConnectionError("provider down")
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            cache.get("USD/MXN", failing_fetch)
+    assert len(calls) == 1
@@ -0,0 +1,70 @@
+from concurrent.futures import Future
+from unittest.mock import patch
+
+from backend.models.notification import Notification, NOTIFICATION_STATUS_PENDING, NOTIFICATION_STATUS_DELIVERED, NOTIFICATION_STATUS_FAILED
+from backend.services.notification_service import NotificationService, render_notifications
+
+
+def _resolved(value):
+    handle = Future()
+    handle.set_result(value)
+    return handle
+
+
+def test_render_notifications_packs_digest_and_keeps_ids():
+    rows = [(1, "a" * 40), (2, "b" * 40), (3, "c" * 40)]
+
+    batches = render_notifications(rows, digest=True, limit=100)
+
+    assert [ids for ids, _ in batches] == [[1], [2, 3]]
+    assert batches[0][1] == "3 alert(s) triggered:\n" + "a" * 40
+    assert all(len(text) <= 100 for _, text in batches)
+    assert render_notifications(rows, digest=False, limit=100) == [([1], "a" * 40), ([2], "b" * 40), ([3], "c" * 40)]
+
+
+def test_drain_marks_delivered_and_retries_failed_rows(app, db):
+    NotificationService.enqueue("first", alert_id=1)
+    NotificationService.enqueue("second", alert_id=2)
+    db.session.commit()
+
+    with patch.object(NotificationService, "_digest_enabled", False), \
+         patch("backend.services.notification_service.TelegramService.send_message",
+               side_effect=lambda app, text: _resolved(text == "first")):
+        assert NotificationService.drain(app) == 1
+
+    statuses = {n.message: (n.status, n.attempts) for n in Notification.query.all()}
+    assert statuses == {"first": (NOTIFICATION_STATUS_DELIVERED, 1), "second": (NOTIFICATION_STATUS_PENDING, 1)}
+
+
+def test_drain_gives_up_after_max_attempts(app, db):
+    NotificationService.enqueue("never delivered")
+    db.session.commit()
+
+    with patch.object(NotificationService, "_max_attempts", 2), \
+         patch("backend.services.notification_service.TelegramService.send_message", return_value=_resolved(False)) as mock_send:
+        NotificationService.drain(app)
+        NotificationService.drain(app)
+        NotificationService.drain(app)
+
+    assert mock_send.call_count == 2
+    assert Notification.query.one().status == NOTIFICATION_STATUS_FAILED
+
+
+def test_slow_send_is_not_resent_and_recorded_once_accepted(app, db):
+    NotificationService.enqueue("slow")
+    db.session.commit()
+    handle = Future()
+
+    with patch.object(NotificationService, "_send_timeout", 0.05), \
+         patch("backend.services.notification_service.TelegramService.send_message", return_value=handle) as mock_send:
+        assert NotificationService.drain(app) == 0
+        assert NotificationService.drain(app) == 0  # still in flight: not sent a second time
+        assert mock_send.call_count == 1
+        assert Notification.query.one().attempts == 0
+
+        handle.set_result(True)  # Telegram finally accepts it
+
+    db.session.expire_all()
+    notification = Notification.query.one()
+    assert (notification.status, notification.attempts) == (NOTIFICATION_STATUS_DELIVERED, 1)
+    assert NotificationService.stats()["in_flight"] == 0
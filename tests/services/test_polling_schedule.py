@@ -0,0 +1,27 @@
+from backend.services.polling_schedule import PollingSchedule
+
+
+def test_interval_shrinks_as_price_approaches_trigger():
+    schedule = PollingSchedule(min_seconds=30, max_seconds=930, near_percent=1.0, far_percent=10.0)
+
+    assert schedule.interval_for(None) == 930
+    assert schedule.interval_for(25.0) == 930
+    assert schedule.interval_for(0.5) == 30
+    assert schedule.interval_for(5.5) == 480
+    assert schedule.interval_for(25.0, max_seconds=300) == 300
+
+
+def test_planned_tickers_become_due_after_their_interval(fake_clock):
+    schedule = PollingSchedule(min_seconds=30, max_seconds=900, clock=fake_clock)
+
+    assert schedule.is_due("AAPL")
+    schedule.plan("AAPL", None)
+    schedule.plan("BTC-USD", 0.2)
+    fake_clock.now = 20
+    assert schedule.is_due("BTC-USD")
+    assert not schedule.is_due("AAPL")
+    fake_clock.now = 890
+    assert schedule.is_due("AAPL")
+    stats = schedule.stats()
+    assert stats["tracked"] == 2
+    assert stats["at_min_interval"] == 1
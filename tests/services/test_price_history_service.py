@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pandas as pd
+from backend.models.price_bar import PriceBar
+from backend.services.price_history_service import PriceHistoryService, _bars_from_frame
+from backend.services.rolling_statistics import RollingStatisticsEngine, parse_window
+from backend.utils.market_calendar import trading_date
+
+
+def _daily_frame(ticker, start, closes):
+    dates = pd.date_range(start, periods=len(closes), freq="D", name="Date")
+    columns = pd.MultiIndex.from_product([["Close", "High", "Low", "Open", "Volume"], [ticker]], names=["Price", "Ticker"])
+    frame = pd.DataFrame(index=dates, columns=columns, dtype=float)
+    frame[("Close", ticker)] = closes
+    frame[("High", ticker)] = [close + 1 for close in closes]
+    frame[("Low", ticker)] = [close - 1 for close in closes]
+    frame[("Open", ticker)] = closes
+    frame[("Volume", ticker)] = 1000.0
+    return frame
+
+
+def test_backfill_only_requests_bars_after_last_stored_one(app, db):
+    today = datetime.now(timezone.utc).date()
+    first_day = today - timedelta(days=4)
+    with patch("backend.services.price_history_service.FinancialDataService.historical_bars",
+               return_value=_daily_frame("AAPL", first_day, [10.0, 11.0, 12.0, 13.0, 14.0])) as mock_bars:
+        assert PriceHistoryService.backfill(["AAPL"], lookback_days=31) == 5
+        db.session.commit()
+        assert mock_bars.call_args.kwargs["start"] == today - timedelta(days=31)
+
+    # Second run starts at the last stored bar, re-fetching it in case it was still in progress.
+    with patch("backend.services.price_history_service.FinancialDataService.historical_bars",
+               return_value=_daily_frame("AAPL", today, [15.0])) as mock_bars:
+        assert PriceHistoryService.backfill(["AAPL"], lookback_days=31) == 1
+        db.session.commit()
+        assert mock_bars.call_args.kwargs["start"] == today
+
+    assert PriceBar.query.filter_by(ticker="AAPL").count() == 5
+    statistics = PriceHistoryService.statistics_in_window(["AAPL"], days=30)
+    assert statistics["AAPL"] == {"previous_price": 15.0, "minimum": 9.0, "maximum": 16.0, "average": 12.2}
+
+
+def test_rolling_endpoint_seeds_windows_from_stored_bars(app, db, client):
+    today = datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+    db.session.add_all([
+        PriceBar(ticker="VWO", interval="1d", timestamp=today - timedelta(days=days), open=close, high=close + 1, low=close - 1, close=close)
+        for days, close in ((2, 40.0), (1, 42.0))
+    ])
+    db.session.commit()
+
+    # A process that never ran the history job has no windows in memory
+    with patch.object(PriceHistoryService, "_rolling_engine", RollingStatisticsEngine()):
+        response = client.get("/api/prices/rolling?tickers=VWO")
+
+    assert response.status_code == 200
+    assert response.get_json()["VWO"]["30d"]["minimum"] == 39.0
+
+
+def test_tick_extends_stored_bar_of_its_trading_date(app, db):
+    engine = RollingStatisticsEngine({"30d": parse_window("30d")})
+    for ticker, zone in (("AAPL", "America/New_York"), ("VAPU.L", "Europe/London")):
+        # Yahoo dates daily bars at midnight of the exchange, today's bar being still in progress
+        frame = _daily_frame(ticker, trading_date(ticker) - timedelta(days=1), [100.0, 98.0])
+        frame.index = frame.index.tz_localize(zone)
+        db.session.add_all(_bars_from_frame(frame, [ticker], "1d"))
+        db.session.commit()
+
+        with patch.object(PriceHistoryService, "_rolling_engine", engine):
+            PriceHistoryService.seed_rolling_windows([ticker])
+            statistics = PriceHistoryService.record_tick(ticker, 80.0)
+
+        assert statistics["bars"] == 2
+        assert statistics["minimum"] == 80.0
+        assert statistics["average"] == 90.0
+
+
+def test_default_windows_keep_a_month_of_history(app):
+    with patch.object(PriceHistoryService, "_rolling_engine", RollingStatisticsEngine()), \
+         patch.object(PriceHistoryService, "_month_window", "30d"), \
+         patch.dict(app.config, {"ROLLING_WINDOWS": None}):
+        app.config.pop("ROLLING_WINDOWS")
+        PriceHistoryService.configure(app)
+        assert PriceHistoryService.history_days_required() == 31
+
+        app.config["ROLLING_WINDOWS"] = "30d,52w"
+        PriceHistoryService.configure(app)
+        assert PriceHistoryService.history_days_required() == 365
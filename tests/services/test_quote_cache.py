@@ -0,0 +1,51 @@
+from unittest.mock import patch
+from backend.services.quote_cache import QuoteCache
+from backend.services.finantial_data_service import FinancialDataService
+
+
+def test_entries_expire_after_ttl(fake_clock):
+    cache = QuoteCache(ttl_seconds=10, max_size=10, clock=fake_clock)
+    cache.put_many({"AAPL": 100.0})
+
+    fake_clock.now = 9.0
+    assert cache.get_many(["AAPL"]) == ({"AAPL": 100.0}, [])
+
+    fake_clock.now = 10.0
+    assert cache.get_many(["AAPL"]) == ({}, ["AAPL"])
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_max_age_below_ttl_skips_older_entries_without_evicting_them(fake_clock):
+    cache = QuoteCache(ttl_seconds=60, max_size=10, clock=fake_clock)
+    cache.put_many({"AAPL": 100.0})
+
+    fake_clock.now = 30.0
+    assert cache.get_many(["AAPL"], max_age=20) == ({}, ["AAPL"])
+    assert cache.get_many(["AAPL"], max_age=0) == ({}, ["AAPL"])
+    assert cache.get_many(["AAPL"]) == ({"AAPL": 100.0}, [])
+
+
+def test_least_recently_used_ticker_is_evicted():
+    cache = QuoteCache(ttl_seconds=60, max_size=2)
+    cache.put_many({"AAPL": 1.0, "MSFT": 2.0})
+    cache.get_many(["AAPL"])
+    cache.put_many({"GOOGL": 3.0})
+
+    found, missing = cache.get_many(["AAPL", "MSFT", "GOOGL"])
+    assert found == {"AAPL": 1.0, "GOOGL": 3.0}
+    assert missing == ["MSFT"]
+
+
+def test_latest_prices_fetches_only_missing_tickers():
+    FinancialDataService._quote_cache.invalidate()
+    FinancialDataService._quote_cache.put_many({"AAPL": 100.0})
+
+    with patch.object(FinancialDataService, "_fetch_quotes", return_value=({"MSFT": 200.0}, {})) as mock_fetch, \
+         patch.object(FinancialDataService, "exchange_rate", return_value={"exchange_rate": "USD/MXN", "rate": 2.0}):
+        prices = FinancialDataService.latest_prices(["AAPL", "MSFT"])
+
+    mock_fetch.assert_called_once_with(["MSFT"])
+    assert prices["AAPL"] == {"original_price": 100.0, "converted_price": 200.0}
+    assert prices["MSFT"] == {"original_price": 200.0, "converted_price": 400.0}
+    FinancialDataService._quote_cache.invalidate()
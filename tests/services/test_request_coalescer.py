@@ -0,0 +1,60 @@
+import threading
+from unittest.mock import patch
+from backend.services.request_coalescer import RequestCoalescer, _InFlightCall
+
+
+def test_identical_concurrent_calls_are_merged():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+    followers_waiting = threading.Event()
+    calls = []
+
+    class CountingEvent(threading.Event):
+        """Done event of the in-flight call, signalling once all three followers wait on it."""
+
+        waiters = 0
+        lock = threading.Lock()
+
+        def wait(self, timeout=None):
+            with CountingEvent.lock:
+                CountingEvent.waiters += 1
+                if CountingEvent.waiters == 3:
+                    followers_waiting.set()
+            return super().wait(timeout)
+
+    class CountedCall(_InFlightCall):
+        def __init__(self):
+            super().__init__()
+            self.done = CountingEvent()
+
+    def slow_history():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=2)
+        return {"AAPL": [1, 2, 3]}
+
+    results = []
+    with patch("backend.services.request_coalescer._InFlightCall", CountedCall):
+        leader = threading.Thread(target=lambda: results.append(coalescer.run(("history", "AAPL"), slow_history)))
+        leader.start()
+        assert started.wait(timeout=2)
+        followers = [threading.Thread(target=lambda: results.append(coalescer.run(("history", "AAPL"), slow_history))) for _ in range(3)]
+        for follower in followers:
+            follower.start()
+        # Let followers register as waiters before the leader finishes.
+        assert followers_waiting.wait(timeout=2)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(timeout=2)
+
+    assert len(calls) == 1
+    assert results == [{"AAPL": [1, 2, 3]}] * 4
+    assert coalescer.stats() == {"calls": 4, "executed": 1, "merged": 3, "in_flight": 0}
+
+
+def test_different_keys_are_not_merged():
+    coalescer = RequestCoalescer()
+    assert coalescer.run("a", lambda: 1) == 1
+    assert coalescer.run("b", lambda: 2) == 2
+    assert coalescer.stats()["merged"] == 0
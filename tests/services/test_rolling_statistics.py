@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+import random
+from backend.services.rolling_statistics import RollingStatisticsEngine, RollingWindow, parse_window
+
+
+def test_rolling_window_matches_full_recomputation():
+    rng = random.Random(7)
+    window = RollingWindow(timedelta(days=10))
+    start = datetime(2026, 1, 1)
+    bars = []
+    for day in range(60):
+        close = rng.uniform(50, 150)
+        bar = (start + timedelta(days=day), close - rng.uniform(0, 5), close + rng.uniform(0, 5), close)
+        bars.append(bar)
+        window.push(*bar)
+        window.expire(bar[0])
+
+        in_window = [b for b in bars if b[0] >= bar[0] - timedelta(days=10)]
+        snapshot = window.snapshot()
+        assert snapshot["minimum"] == round(min(b[1] for b in in_window), 2)
+        assert snapshot["maximum"] == round(max(b[2] for b in in_window), 2)
+        assert snapshot["average"] == round(sum(b[3] for b in in_window) / len(in_window), 2)
+
+
+def test_ticks_update_current_bar_and_old_extremes_expire():
+    now = datetime(2026, 3, 31, 15, 0)
+    engine = RollingStatisticsEngine({"30d": parse_window("30d")}, clock=lambda: now)
+    engine.seed("AAPL", [
+        (datetime(2026, 2, 20), 80.0, 90.0, 85.0),  # expires: older than 30 days
+        (datetime(2026, 3, 20), 95.0, 105.0, 100.0),
+        (datetime(2026, 3, 31), 99.0, 101.0, 100.0),
+    ])
+
+    assert engine.snapshot("AAPL")["30d"]["minimum"] == 95.0
+    engine.push_tick("AAPL", 93.0)
+    statistics = engine.snapshot("AAPL")["30d"]
+    assert statistics["minimum"] == 93.0
+    assert statistics["maximum"] == 105.0
+    assert statistics["bars"] == 2
+    assert statistics["average"] == 96.5
+    assert engine.push_tick("MSFT", 10.0) is False
+
+
+def test_parse_window_accepts_days_and_weeks():
+    assert parse_window("90d") == timedelta(days=90)
+    assert parse_window("52w") == timedelta(weeks=52)
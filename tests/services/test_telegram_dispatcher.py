@@ -0,0 +1,46 @@
+from backend.services.rate_limiter import TokenBucket
+from backend.services.telegram_dispatcher import TelegramDispatcher
+
+
+def test_submit_returns_handle_and_worker_delivers(bot_api):
+    dispatcher = TelegramDispatcher(api_base_url=bot_api.base_url, timeout=5)
+
+    handles = [dispatcher.submit("token", "chat", f"message {i}") for i in range(3)]
+
+    assert all(handle.result(timeout=5) for handle in handles)
+    assert [payload["text"] for payload in bot_api.sent()] == ["message 0", "message 1", "message 2"]
+    stats = dispatcher.stats()
+    assert stats["sent"] == 3
+    assert stats["queue_depth"] == 0
+    dispatcher.stop()
+
+
+def test_rejected_message_resolves_handle_false(bot_api):
+    bot_api.responses["sendMessage"] = [(400, {"ok": False, "description": "Bad Request: chat not found"})]
+    dispatcher = TelegramDispatcher(api_base_url=bot_api.base_url, timeout=5)
+
+    assert dispatcher.submit("token", "chat", "hello").result(timeout=5) is False
+    assert dispatcher.stats()["failed"] == 1
+    dispatcher.stop()
+
+
+def test_429_is_retried_after_retry_after(bot_api):
+    bot_api.responses["sendMessage"] = [
+        (429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 7}}),
+        (502, {"ok": False}),
+    ]
+    waits = []
+    dispatcher = TelegramDispatcher(api_base_url=bot_api.base_url, timeout=5, retry_backoff=0.5, sleep=waits.append)
+
+    assert dispatcher.submit("token", "chat", "hello").result(timeout=5) is True
+    assert waits == [7.0, 1.0]
+    assert len(bot_api.sent()) == 3
+    assert dispatcher.stats()["retried"] == 2
+    dispatcher.stop()
+
+
+def test_per_chat_bucket_throttles_bursts(fake_clock):
+    bucket = TokenBucket(rate=1, capacity=2, clock=fake_clock, sleep=fake_clock.sleep)
+
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 1.0, 1.0]
+    assert fake_clock.now == 2.0
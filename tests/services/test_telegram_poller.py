@@ -0,0 +1,68 @@
+from backend.models.app_state import AppState
+from backend.services.telegram_poller import OFFSET_STATE_KEY, TelegramPoller
+
+
+def _update(update_id, text):
+    return {"update_id": update_id, "message": {"text": text, "entities": [{"type": "bot_command"}]}}
+
+
+def test_poll_once_processes_batch_and_persists_offset(app, db, bot_api):
+    bot_api.responses["getUpdates"] = [
+        (200, {"ok": True, "result": [_update(10, "/help"), _update(11, "/alerts")]}),
+        (200, {"ok": True, "result": []}),
+    ]
+    poller = TelegramPoller(api_base_url=bot_api.base_url, poll_timeout=0)
+    handled = []
+
+    assert poller.poll_once(app, handled.append) == 2
+    assert [update["update_id"] for update in handled] == [10, 11]
+    assert AppState.get_value(db.session, OFFSET_STATE_KEY) == "12"
+
+    assert poller.poll_once(app, handled.append) == 0
+    assert len(bot_api.sent("deleteWebhook")) == 1
+    first_poll, second_poll = bot_api.sent("getUpdates")
+    assert "offset" not in first_poll
+    assert second_poll["offset"] == 12
+
+
+def test_restarted_poller_resumes_from_stored_offset(app, db, bot_api):
+    AppState.set_value(db.session, OFFSET_STATE_KEY, 57)
+    db.session.commit()
+    bot_api.responses["getUpdates"] = [(200, {"ok": True, "result": []})]
+
+    TelegramPoller(api_base_url=bot_api.base_url, poll_timeout=0).poll_once(app, lambda update: None)
+
+    assert bot_api.sent("getUpdates")[0]["offset"] == 57
+
+
+def test_failing_update_does_not_block_the_batch(app, db, bot_api):
+    bot_api.responses["getUpdates"] = [(200, {"ok": True, "result": [_update(1, "/boom"), _update(2, "/help")]})]
+    handled = []
+
+    def handler(update):
+        if update["update_id"] == 1:
+            raise RuntimeError("boom")
+        handled.append(update["update_id"])
+
+    TelegramPoller(api_base_url=bot_api.base_url, poll_timeout=0).poll_once(app, handler)
+
+    assert handled == [2]
+    assert AppState.get_value(db.session, OFFSET_STATE_KEY) == "3"
+
+
+def test_crash_in_a_batch_resumes_after_the_last_processed_update(app, db, bot_api):
+    bot_api.responses["getUpdates"] = [(200, {"ok": True, "result": [_update(20, "/watchlist_new Tech"), _update(21, "/watchlist_add 1 HOOD")]})]
+    handled = []
+
+    def handler(update):
+        if update["update_id"] == 21:
+            raise SystemExit("process killed")
+        handled.append(update["update_id"])
+
+    try:
+        TelegramPoller(api_base_url=bot_api.base_url, poll_timeout=0).poll_once(app, handler)
+    except SystemExit:
+        pass
+
+    assert handled == [20]
+    assert AppState.get_value(db.session, OFFSET_STATE_KEY) == "21"
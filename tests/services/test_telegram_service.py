@@ -0,0 +1,13 @@
+from backend.services.telegram_service import split_message
+
+
+def test_split_message_packs_lines_up_to_limit():
+    lines = ["a" * 4, "b" * 4, "c" * 4]
+
+    assert split_message(lines, limit=9) == ["aaaa\nbbbb", "cccc"]
+    assert split_message(lines, limit=14) == ["aaaa\nbbbb\ncccc"]
+
+
+def test_split_message_cuts_lines_longer_than_limit():
+    assert split_message(["ab", "x" * 7], limit=3) == ["ab", "xxx", "xxx", "x"]
+
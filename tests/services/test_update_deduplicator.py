@@ -0,0 +1,34 @@
+from backend.services.update_deduplicator import UpdateDeduplicator
+
+
+def test_repeated_update_id_is_duplicate_until_it_expires(fake_clock):
+    deduplicator = UpdateDeduplicator(ttl_seconds=60, clock=fake_clock)
+
+    assert deduplicator.seen(1) is False
+    assert deduplicator.seen(1) is True
+    fake_clock.now += 61
+    assert deduplicator.seen(1) is False
+    assert deduplicator.stats()["duplicates"] == 1
+
+
+def test_memory_store_is_bounded(fake_clock):
+    deduplicator = UpdateDeduplicator(max_size=2, clock=fake_clock)
+
+    for update_id in (1, 2, 3):
+        deduplicator.seen(update_id)
+
+    assert deduplicator.stats()["size"] == 2
+    assert deduplicator.seen(1) is False
+
+
+def test_sqlite_store_is_shared_and_forget_allows_redelivery(tmp_path, fake_clock):
+    path = str(tmp_path / "updates.db")
+    first = UpdateDeduplicator(clock=fake_clock)
+    first.configure(sqlite_path=path)
+    second = UpdateDeduplicator(clock=fake_clock)
+    second.configure(sqlite_path=path)
+
+    assert first.seen(42) is False
+    assert second.seen(42) is True
+    second.forget(42)
+    assert first.seen(42) is False
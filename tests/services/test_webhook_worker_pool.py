@@ -0,0 +1,42 @@
+import threading
+
+from backend.services.webhook_worker_pool import WebhookWorkerPool
+
+
+def test_submitted_jobs_run_on_workers():
+    pool = WebhookWorkerPool(max_queue_size=10, workers=2)
+    done = threading.Event()
+    results = []
+
+    assert pool.submit(results.append, "update 1")
+    assert pool.submit(lambda value: (results.append(value), done.set()), "update 2")
+
+    assert done.wait(timeout=5)
+    pool.stop()
+    assert sorted(results) == ["update 1", "update 2"]
+    stats = pool.stats()
+    assert stats["processed"] == 2
+    assert stats["queue_depth"] == 0
+
+
+def test_full_queue_rejects_updates_and_failures_are_counted():
+    pool = WebhookWorkerPool(max_queue_size=1, workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(_):
+        started.set()
+        release.wait(timeout=5)
+        raise RuntimeError("boom")
+
+    assert pool.submit(blocking, None)
+    assert started.wait(timeout=5)
+    assert pool.submit(blocking, None)
+    assert pool.submit(blocking, None) is False
+
+    release.set()
+    pool.stop()
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["failed"] == 2
+    assert stats["max_queue_wait_ms"] >= 0.0
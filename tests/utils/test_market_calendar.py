@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+from backend.utils.market_calendar import MARKET_CRYPTO, MARKET_FUTURES, MARKET_FX, MARKET_UNKNOWN, is_market_open, market_of, trading_date
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_market_of_uses_ticker_suffix():
+    assert market_of("AAPL") == ""
+    assert market_of("BRK-B") == ""
+    assert market_of("VAPU.L") == ".L"
+    assert market_of("NAFTRACISHRS.MX") == ".MX"
+    assert market_of("BTC-USD") == MARKET_CRYPTO
+    assert market_of("MXN=X") == MARKET_FX
+    assert market_of("GC=F") == MARKET_FUTURES
+    assert market_of("^GSPC") == MARKET_UNKNOWN
+
+
+def test_equity_sessions_follow_exchange_local_time():
+    # Wednesday 2024-07-10, New York is UTC-4 and London UTC+1
+    assert is_market_open("AAPL", _utc(2024, 7, 10, 14, 0))
+    assert not is_market_open("AAPL", _utc(2024, 7, 10, 21, 0))
+    assert is_market_open("VAPU.L", _utc(2024, 7, 10, 9, 0))
+    assert not is_market_open("VAPU.L", _utc(2024, 7, 10, 16, 0))
+    # Saturday
+    assert not is_market_open("AAPL", _utc(2024, 7, 13, 15, 0))
+
+
+def test_grace_keeps_market_open_right_after_close():
+    just_after_close = _utc(2024, 7, 10, 20, 10)  # 16:10 in New York
+
+    assert not is_market_open("AAPL", just_after_close)
+    assert is_market_open("AAPL", just_after_close, grace=timedelta(minutes=15))
+    assert not is_market_open("AAPL", just_after_close + timedelta(minutes=15), grace=timedelta(minutes=15))
+
+
+def test_crypto_fx_and_futures_hours():
+    saturday = _utc(2024, 7, 13, 15, 0)
+    assert is_market_open("BTC-USD", saturday)
+    assert not is_market_open("MXN=X", saturday)
+    assert not is_market_open("GC=F", saturday)
+    # Sunday 17:30 New York: FX reopened, futures not yet
+    assert is_market_open("MXN=X", _utc(2024, 7, 14, 21, 30))
+    assert not is_market_open("GC=F", _utc(2024, 7, 14, 21, 30))
+    # Wednesday 17:30 New York: futures daily break
+    assert not is_market_open("GC=F", _utc(2024, 7, 10, 21, 30))
+    assert is_market_open("MXN=X", _utc(2024, 7, 10, 21, 30))
+
+
+def test_trading_date_is_the_exchange_local_date():
+    # Wednesday 2024-07-10 23:30 UTC is still the 10th in New York and already the 11th in London
+    at = _utc(2024, 7, 10, 23, 30)
+    assert str(trading_date("AAPL", at)) == "2024-07-10"
+    assert str(trading_date("VAPU.L", at)) == "2024-07-11"
+    assert str(trading_date("BTC-USD", at)) == "2024-07-10"
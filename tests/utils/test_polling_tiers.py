@@ -0,0 +1,29 @@
+from backend.utils.polling_tiers import assign_tier, classify_asset, tier_intervals
+
+
+def test_classify_asset_by_suffix_and_name():
+    assert classify_asset("BTC-USD") == "crypto"
+    assert classify_asset("MXN=X") == "fx"
+    assert classify_asset("GC=F") == "futures"
+    assert classify_asset("VDST.L", "Vanguard Short-Term Treasury Bond ETF") == "bond"
+    assert classify_asset("CBU7.L", "iShares USD TRSRY ETF") == "bond"
+    assert classify_asset("AAPL", "Apple Inc.") == "equity"
+
+
+def test_assign_tier_prefers_overrides_and_falls_back_to_equity():
+    tiers = {"crypto": 1, "equity": 5, "bond": 30}
+
+    assert assign_tier("BTC-USD", "Bitcoin USD", tiers) == "crypto"
+    assert assign_tier("GC=F", "Gold Futures", tiers) == "equity"
+    assert assign_tier("AAPL", "Apple Inc.", tiers, {"AAPL": "crypto"}) == "crypto"
+    assert assign_tier("AAPL", "Apple Inc.", tiers, {"AAPL": "missing"}) == "equity"
+    assert assign_tier("AAPL", "Apple Inc.", {"crypto": 1, "bond": 30}) == "crypto"
+
+
+def test_tier_intervals_accepts_json_config(app):
+    app.config["POLLING_TIERS"] = '{"crypto": 1, "equity": 5}'
+    try:
+        assert tier_intervals(app) == {"crypto": 1.0, "equity": 5.0}
+    finally:
+        del app.config["POLLING_TIERS"]
+    assert tier_intervals(app) == {}